@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Benchmarks for the pubstats module.
+
+The benchmarks run on a large fake dataset made from the fake data
+included with the package. With a scale of n, the key and the
+publications are repeated n times, each copy with its own author
+names.
+
+Examples
+--------
+1. Compare the terminal report with the PrettyTable based rendering,
+using 10 copies of the fake data:
+>>> python benchmark.py display 10
+
+2. Compare the xhtml2pdf and reportlab PDF backends, using 2 copies of
+the fake data:
+>>> python benchmark.py pdf 2
+
+3. Compare the peak memory use of the terminal report with and without
+a memory budget, using 20 copies of the fake data:
+>>> python benchmark.py memory 20
+"""
+
+from pubstats import PubStats
+from pubstats.display import Display
+from pubstats.pipeline import BACKENDS
+from prettytable import PrettyTable
+from tests.corpus import fake_corpus, peak_rss
+import io
+import os
+import sys
+import tempfile
+import textwrap
+import time
+
+class PrettyTableDisplay(Display):
+    """The terminal report as it was rendered with PrettyTable."""
+
+    def _block_pub(self, k):
+        if self.authors[k].has_attr('pubs_author'):
+            table = PrettyTable([' 1 ', ' 2 ', ' 3 ', ' 4 ', ' 5 ', 'bib', 'n auth', 'scrim', 'non-scrim'])
+            table.hrules = True
+            self.print_string += '\n  Publications\n'
+            for p in self.authors[k].pubs_author:
+                row = [''] * 9
+                if self.authors[k].pub_is_in('pubs_multi_author', p):
+                    row[0] = 'X'
+                if self.authors[k].pub_is_in('pubs_multi_institute', p):
+                    row[1] = 'X'
+                if self.authors[k].pub_is_in('pubs_multidisciplinary', p):
+                    row[2] = 'X'
+                if self.authors[k].pub_is_in('pubs_multi_institute_single_discipline', p):
+                    row[3] = 'X'
+                if self.authors[k].pub_is_in('pubs_multi_discipline_single_institute', p):
+                    row[4] = 'X'
+                row[5] = textwrap.fill(self._formatted_bib(self.data[p]), width=70)
+                row[6] = len(self.data[p]['author'])
+                row[7] = self.data[p]['matched_authors']
+                row[8] = row[6] - row[7]
+                table.add_row(row)
+            self.print_string += "%s\n" % (table.get_string())
+            self.print_string += "  1: multiple SCRiM authors\n"
+            self.print_string += "  2: multiple institutes\n"
+            self.print_string += "  3: multiple disciplines\n"
+            self.print_string += "  4: multiple institutes; single discipline\n"
+            self.print_string += "  5: multiple disciplines; single institute\n\n"
+
+    def _bibliography(self):
+        print_string = '\nBibliography\n'
+        table = PrettyTable(['n', 'bib'])
+        table.header = False
+        table.border = False
+        table.align = 'l'
+        for i, d in enumerate(self.data):
+            table.add_row([i + 1, textwrap.fill(self._formatted_bib(d), width=70)])
+        print_string += "%s\n\n" % (table.get_string())
+        return print_string
+
+def _timed(func, *args, **kwargs):
+    """Returns the result of the call and its time in seconds."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def display(scale):
+    """Times the terminal report against the PrettyTable rendering."""
+    with tempfile.TemporaryDirectory() as directory:
+        rep = PubStats(*fake_corpus(directory, scale))
+    print('{} authors, {} publications'.format(len(rep.authors), len(rep.formatted)))
+    old = io.StringIO()
+    new = io.StringIO()
+    _, t_old = _timed(PrettyTableDisplay, rep.authors, rep.formatted, rep.translate, out=old)
+    _, t_new = _timed(Display, rep.authors, rep.formatted, rep.translate, out=new)
+    print('PrettyTable: {:.3f} s'.format(t_old))
+    print('text_table:  {:.3f} s ({:.1f}x)'.format(t_new, t_old / t_new))
+    print('identical output: {}'.format(old.getvalue() == new.getvalue()))
+
+def pdf(scale):
+    """Times the PDF backends."""
+    with tempfile.TemporaryDirectory() as directory:
+        rep = PubStats(*fake_corpus(directory, scale))
+        print('{} authors, {} publications'.format(len(rep.authors), len(rep.formatted)))
+        # The 'html' backend writes a directory instead of a PDF.
+        for name in sorted(n for n in BACKENDS if n != 'html'):
+            filename = os.path.join(directory, '{}.pdf'.format(name))
+            _, t = _timed(BACKENDS[name], rep.authors, rep.formatted, rep.translate, filename)
+            print('{:<10} {:.3f} s, {:.0f} kB'.format(name + ':', t, os.path.getsize(filename) / 1024))
+
+def memory(scale):
+    """Measures peak memory use with and without a memory budget."""
+    with tempfile.TemporaryDirectory() as directory:
+        key_file, data_file = fake_corpus(directory, scale)
+        print('data file: {:.1f} MiB'.format(os.path.getsize(data_file) / (1 << 20)))
+        base = peak_rss('-', '-')
+        print('imports only:     {:.1f} MiB'.format(base))
+        for budget in [None, 64, 4]:
+            peak, t = _timed(peak_rss, key_file, data_file, budget)
+            label = 'budget {} MiB:'.format(budget) if budget else 'no budget:'
+            print('{:<17} {:.1f} MiB (+{:.1f}), {:.2f} s'.format(label, peak, peak - base, t))
+
+if __name__ == '__main__':
+    benchmarks = {'display': display, 'pdf': pdf, 'memory': memory}
+    if len(sys.argv) < 2 or sys.argv[1] not in benchmarks:
+        print('Usage: python benchmark.py {} [scale]'.format('|'.join(sorted(benchmarks))))
+    else:
+        benchmarks[sys.argv[1]](int(sys.argv[2]) if len(sys.argv) > 2 else 10)
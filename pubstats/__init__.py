@@ -36,16 +36,33 @@ Methods
 -------
 save(key_file='./data/key.csv',
     data_file='./data/paperpile.json',
-    tags=None)
+    tags=None, year_from=None, year_to=None, parallel=False,
+    backend='xhtml2pdf', dedup=False, cache_dir=None, groups=False,
+    cube=False)
     Save the data and report to a PDF and 2 CSV files.
 display(key_file='./data/key.csv',
     data_file='./data/paperpile.json',
-    tags=None)
+    tags=None, year_from=None, year_to=None, summary=False, pager=False,
+    dedup=False)
     Prints report to the screen.
+convert(data_file, db_file)
+    Converts a PaperPile export to an indexed pubstats database.
+batch(manifest_file, workers=None)
+    Saves several reports described by a manifest from one parse.
+serve(key_file, data_file, tags=None, host='127.0.0.1', port=8000,
+    socket_path=None)
+    Serves a report to local JSON queries, reloading changed files.
+annotations(directory, personnel_file, output_dir='.', workers=None)
+    Tabulates brat annotations of interview transcripts by personnel
+    category.
+diff(old, new, filename=None, fmt='text')
+    Writes the changes between 2 reports.
 
 Classes
 -------
-PubStats(key_file, data_file, tags=None)
+PubStats(key_file, data_file, tags=None, year_from=None, year_to=None,
+    institutions=None, memory_budget=None, dedup=False, authors=None,
+    lazy=False)
     The class representation of this Package.
 
 Notes
@@ -59,15 +76,34 @@ See: PaperPile https://paperpile.com/app
 from .key_reader import key_reader
 from .paperpile_reader import paperpile_reader
 from .author import Author
-from .format_data import format_data
+from .format_data import format_data, name_index
 from .meta import Meta
 from .helpers import Helpers
 from .display import Display
 from .csv_write import csv1, csv2
 from .save import Save
+from .pipeline import save_report
+from .pubdb import PubDB, convert, is_pubdb
+from .batch import batch
+from .columnar import columnar_write, _STATS
+from .sqlite_store import sqlite_write, sqlite_verify
+from .service import serve, query
+from .lowmem import iter_publications, project, SpilledData
+from .publication import Publication, report_fields
+from .duplicates import dedup
+from .annotations import annotations
+from .bibliography import formatter
+from .network import networks, network_write
+from .credit import credit, CREDITS
+from .rollup import rollups
+from .cube import cubes, load_cubes
+from .readers import read_publications
+from .diff import snapshot, compare, diff_write, FORMATS as _DIFF_FORMATS
 import json
 import inspect
 import os
+import bisect
+import copy
 
 __author__ = "Randy Miller"
 __copyright__ = "Copyright (C) 2018 Penn State"
@@ -78,7 +114,7 @@ __email__ =  "rsm5139@psu.edu"
 __status__ = "Development"
 __url__ = "https://github.com/scrim-network/pubStats"
 
-__all__ = ["save", "display"]
+__all__ = ["save", "display", "convert", "batch", "serve", "annotations"]
 
 _dir = os.path.dirname(os.path.realpath(__file__))
 _key_file = "{}{}".format(_dir, "/data/key.csv")
@@ -87,7 +123,7 @@ _data_file = "{}{}".format(_dir, "/data/paperpileExample.json")
 #_key_file = "{}{}".format(_dir, "/data/key2.csv")
 #_data_file = "{}{}".format(_dir, "/data/paperpile_March_2020.json")
 
-def save(key_file=_key_file, data_file=_data_file, tags=None):
+def save(key_file=_key_file, data_file=_data_file, tags=None, year_from=None, year_to=None, parallel=False, backend='xhtml2pdf', dedup=False, cache_dir=None, groups=False, cube=False):
     """Saves report as PDF and 2 CSV files.
 
     If no arguments are provided for key_file and data_file, report
@@ -110,12 +146,40 @@ def save(key_file=_key_file, data_file=_data_file, tags=None):
         provided, all publications will be included. If `tags` is
         provided, only the publications with tag are included. (default
         is None)
+    year_from : int, optional
+        First publication year to include in the report. (default is
+        None, which means no lower bound)
+    year_to : int, optional
+        Last publication year to include in the report. (default is
+        None, which means no upper bound)
+    parallel : bool, optional
+        Render the PDF in a separate process while the CSV files are
+        written. (default is False)
+    backend : str, optional
+        'xhtml2pdf' renders the PDF from HTML; 'reportlab' draws it
+        directly, which is faster for large reports; 'html' writes a
+        browsable HTML report instead of the PDF. (default is
+        xhtml2pdf)
+    dedup : bool, optional
+        Merge duplicate publications, and list them in
+        pubstats_dedup.csv. (default is False)
+    cache_dir : str, optional
+        Keep the rendered sections of the PDF in this directory, and
+        only render the changed ones on the next run. xhtml2pdf backend
+        only. (default is None)
+    groups : bool, optional
+        Also save the statistics of groups of key authors to
+        pubstats_groups.csv. (default is False)
+    cube : bool, optional
+        Also save the publication counts by year and pair of
+        institutions or disciplines to pubstats_cube.npz. (default is
+        False)
     """
 
-    rep = PubStats(key_file, data_file, tags=tags)
-    rep.save()
+    rep = PubStats(key_file, data_file, tags=tags, year_from=year_from, year_to=year_to, dedup=dedup)
+    rep.save(parallel=parallel, backend=backend, cache_dir=cache_dir, groups=groups, cube=cube)
 
-def display(key_file=_key_file, data_file=_data_file, tags=None):
+def display(key_file=_key_file, data_file=_data_file, tags=None, year_from=None, year_to=None, summary=False, pager=False, dedup=False):
     """Displays report to standard out.
 
     If no arguments are provided for key_file and data_file, report
@@ -138,10 +202,49 @@ def display(key_file=_key_file, data_file=_data_file, tags=None):
         provided, all publications will be included. If `tags` is
         provided, only the publications with tag are included. (default
         is None)
+    year_from : int, optional
+        First publication year to include in the report. (default is
+        None, which means no lower bound)
+    year_to : int, optional
+        Last publication year to include in the report. (default is
+        None, which means no upper bound)
+    summary : bool, optional
+        Only display the author statistics, without the publication
+        tables and bibliography. (default is False)
+    pager : bool, optional
+        Display the report through $PAGER when writing to a terminal.
+        (default is False)
+    dedup : bool, optional
+        Merge duplicate publications. (default is False)
     """
 
-    rep = PubStats(key_file, data_file, tags=tags)
-    rep.display()
+    rep = PubStats(key_file, data_file, tags=tags, year_from=year_from, year_to=year_to, dedup=dedup)
+    rep.display(summary=summary, pager=pager)
+
+def diff(old, new, filename=None, fmt='text'):
+    """Writes the changes between 2 reports.
+
+    Parameters
+    ----------
+    old : str or (str, str)
+        The earlier report: an SQLite store written by `PubStats.store`,
+        or its key file and data file.
+    new : str or (str, str)
+        The later report, as `old`.
+    filename : str, optional
+        The file to write. (default is None, which means standard out)
+    fmt : str, optional
+        'text', 'csv' or 'json'. (default is text)
+    """
+
+    # Checked before the reports are read.
+    if fmt not in _DIFF_FORMATS:
+        raise ValueError('Unknown diff format: {}'.format(fmt))
+    reports = []
+    for state in (old, new):
+        key_file, data_file = (state, state) if isinstance(state, str) else state
+        reports.append(PubStats(key_file, data_file))
+    diff_write(reports[1].diff(reports[0]), filename=filename, fmt=fmt)
 
 class PubStats():
     """The class implementation of the pubstats module.
@@ -153,6 +256,14 @@ class PubStats():
         Filename for the database.
     tags : list of str
         The list of tags to include in the report.
+    year_from : int or None
+        First publication year included in the report.
+    year_to : int or None
+        Last publication year included in the report.
+    institutions : list of str or None
+        Institutions of the key authors included in the report.
+    author_keys : list of str or None
+        Keys of the key authors included in the report.
     authors : dict of str: Author
         Contains the Author objects with information and statistics
         regarding key authors, i.e. authors from `key_file`. Dictionary
@@ -164,14 +275,55 @@ class PubStats():
         'firstlast' author names to their key values in the `authors`
         attribute. This helps prevent authors with the same name from
         overwriting each other.
+    matched : list of dict
+        All publications with at least one key author, before the year
+        window is applied.
+    duplicates : list
+        The groups of duplicate publications that were merged, see
+        `duplicates.find_duplicates`. Empty unless `dedup` is set.
+    formatted : list of dict
+        The publications included in the report.
     Methods
     -------
-    save()
+    save(output_dir='.', parallel=False, backend='xhtml2pdf',
+        cache_dir=None, groups=False, cube=False)
         Save the data and report to a PDF and 2 CSV files.
-    display()
+    export(output_dir='.', fmt=None)
+        Save the statistics as typed binary tables.
+    store(filename='pubstats.sqlite')
+        Save the report to an indexed SQLite store.
+    network(level='author')
+        Returns the co-authorship network of the report.
+    rollups(groupings=('role', 'institution', 'department',
+        'discipline'))
+        Returns the statistics of groups of key authors.
+    cube(level='institution')
+        Returns the publication counts by year and pair of
+        institutions or disciplines.
+    save_network(output_dir='.', levels=('author', 'institution'),
+        samples=256)
+        Save the co-authorship networks as CSV and GraphML.
+    display(summary=False, pager=False)
         Prints report to the screen.
+    subset(tags=None, institutions=None, year_from=None, year_to=None,
+        authors=None)
+        Returns a report for a subset of the data, reusing the parsed
+        and matched data.
+    window(year_from=None, year_to=None)
+        Returns a report for a different year window, reusing the
+        parsed and matched data.
+    reload(key=True, data=True)
+        Re-reads the key and/or data file and recomputes the report.
+    author_stats(key)
+        Returns the statistics of one key author.
+    author_publications(key)
+        Returns the publications of one key author.
+    author_bibliography(key, fmt='text')
+        Returns the formatted references of one key author.
     """
-    def __init__(self, key_file, data_file, tags=None):
+    # Publication fields used by the indices.
+    FIELDS = ('author', 'published', 'labelsNamed')
+    def __init__(self, key_file, data_file, tags=None, year_from=None, year_to=None, institutions=None, memory_budget=None, dedup=False, authors=None, lazy=False):
         """
         Parameters
         ----------
@@ -179,39 +331,433 @@ class PubStats():
             Filename for the author key file. File must be CSV with
             specific header values. See this package's README for more
             information.
-        data_file : str
+        data_file : str or list of str
             Filename for the publication database. File must be able to
-            be imported by the json package. For more information on
-            database format, see this package's README file.
+            be imported by the json package, or be a database created by
+            `convert`, or an SQLite store written by `store`. For more information on database format, see this
+            package's README file. BibTeX, RIS and CSL-JSON files are read
+            too, see `readers`, and a list of files is read as one.
         tags : list of str, optional
             A list of tags to include in the report. Tags are represented
             in the database's 'LabelsNamed' field. If `tags` argument is not
             provided, all publications will be included. If `tags` is
             provided, only the publications with tag are included. (default
             is None)
+        year_from : int, optional
+            First publication year to include, using the database's
+            'published' 'year' field. (default is None, which means no
+            lower bound)
+        year_to : int, optional
+            Last publication year to include. (default is None, which
+            means no upper bound)
+        institutions : list of str, optional
+            Only include key authors from these institutions, and the
+            publications they authored. (default is None, which means
+            all institutions)
+        memory_budget : float, optional
+            Stream the publications instead of loading them, keeping
+            the matched ones in a temporary file and about this many MiB
+            of buffers in memory. See `lowmem`. (default is None, which
+            loads everything)
+        dedup : bool, optional
+            Merge duplicate publications before computing the
+            statistics. See `duplicates`. With a `memory_budget`, only
+            publications with key authors are compared. (default is
+            False)
+        authors : list of str, optional
+            Only compute the statistics of these key authors (keys of
+            the `authors` attribute), from their publications only.
+            Co-authors from the whole key are still counted. From a
+            database created by `convert`, only these publications are
+            read, through its author index, and subsets are limited to
+            these authors. (default is None, which means all key
+            authors)
+        lazy : bool, optional
+            Don't compute the statistics of the whole report until a
+            report is saved or displayed; `author_stats` and the other
+            per-author methods only compute the statistics of the
+            author asked for. (default is False)
+
+        Notes
+        -----
+        When either year bound is given, publications without a valid
+        year are left out of the report.
         """
         self.key_file = key_file
         self.data_file = data_file
         self.tags = tags
+        self.institutions = institutions
+        self.year_from = year_from
+        self.year_to = year_to
+        self.memory_budget = memory_budget
+        self.dedup = dedup
+        self.duplicates = []
+        self.author_keys = authors
+        self.lazy = lazy
+        # Name keys of the authors whose publications were read, when
+        # only those were read from a database.
+        self._names_read = None
         self.authors = {}
         self.translate = {}
-        self.key_data = key_reader(self.key_file, return_dict=True)
         #key_data = key_reader(key_file, return_dict=True)
-        self.data = paperpile_reader(self.data_file, tags=self.tags)
+        self.reload()
+    def reload(self, key=True, data=True):
+        """Re-reads the input files and recomputes the report.
+
+        The file that is not re-read keeps its parsed version, so a
+        changed key doesn't require parsing the publications again.
+        With a `memory_budget` the publications are always streamed
+        again, since they aren't kept.
+
+        Parameters
+        ----------
+        key : bool, optional
+            Re-read `key_file`. (default is True)
+        data : bool, optional
+            Re-read `data_file`. (default is True)
+        """
+        if key:
+            self.key_data = key_reader(self.key_file, return_dict=True)
+        self.authors = {}
+        self.translate = {}
         self._init_authors()
-        self.formatted = format_data(self.data, self.translate)
+        names = None
+        if self.author_keys is not None and not isinstance(self.data_file, (list, tuple)) and is_pubdb(self.data_file):
+            # Only the publications of the selected authors are decoded.
+            names = sorted(n for n, k in self.translate.items() if k in self.author_keys)
+        if self.memory_budget is None and (data or names != self._names_read):
+            self.data = paperpile_reader(self.data_file, tags=self.tags, authors=names)
+            self._names_read = names
+            if self.dedup:
+                self.data = self._dedup(self.data, [])
+            self._names = name_index(self.data)
+        if self.memory_budget is None:
+            self.matched = format_data(self.data, self.translate, self._names)
+        else:
+            self.data = None
+            self.matched = self._stream()
+            if self.dedup:
+                self.matched = self._dedup(self.matched, SpilledData(cache_size=self.matched.cache_size))
+        self._init_index()
+        self._report()
+    def subset(self, tags=None, institutions=None, year_from=None, year_to=None, authors=None):
+        """Returns the report for a subset of the data.
+
+        The returned ``PubStats`` shares the parsed publications, the
+        author matching and the indices with this one; only the
+        statistics are recomputed.
+
+        Parameters
+        ----------
+        tags : list of str, optional
+            Only include publications with any of these tags. (default
+            is None, which keeps the tags of this report)
+        institutions : list of str, optional
+            Only include key authors from these institutions, and the
+            publications they authored. (default is None, which means
+            all institutions)
+        year_from : int, optional
+            First publication year to include. (default is None)
+        year_to : int, optional
+            Last publication year to include. (default is None)
+        authors : list of str, optional
+            Only include these key authors, and their publications.
+            (default is None, which means all key authors)
+
+        Returns
+        -------
+        PubStats
+            The report for the subset.
+
+        Raises
+        ------
+        ValueError
+            If this report only read the publications of its authors
+            from a database, and `authors` isn't a part of them.
+        """
+        if self._names_read is not None and (authors is None or not set(authors) <= set(self.author_keys)):
+            raise ValueError('Only the publications of {} were read from {}'.format(
+                ', '.join(self.author_keys), self.data_file))
+        rep = copy.copy(self)
+        if tags is not None:
+            rep.tags = tags
+        rep.institutions = institutions
+        rep.author_keys = authors
+        rep.year_from = year_from
+        rep.year_to = year_to
+        rep._report()
+        return rep
+    def window(self, year_from=None, year_to=None):
+        """Returns the report for another year window.
+
+        Tags, institutions and authors of this report are kept. See
+        `subset`.
+
+        Parameters
+        ----------
+        year_from : int, optional
+            First publication year to include. (default is None)
+        year_to : int, optional
+            Last publication year to include. (default is None)
+
+        Returns
+        -------
+        PubStats
+            The report restricted to the window.
+        """
+        return self.subset(tags=self.tags, institutions=self.institutions, year_from=year_from, year_to=year_to, authors=self.author_keys)
+    def save(self, output_dir='.', parallel=False, backend='xhtml2pdf', cache_dir=None, groups=False, cube=False):
+        """Saves report as PDF and 2 CSV files.
+
+        With `dedup` set, the merged publications are listed in
+        pubstats_dedup.csv as well.
+
+        Parameters
+        ----------
+        output_dir : str, optional
+            Directory the files are written to. (default is the current
+            directory)
+        parallel : bool, optional
+            Render the PDF in a separate process while the CSV files are
+            written. (default is False)
+        backend : str, optional
+            'xhtml2pdf', 'reportlab' or 'html'. (default is xhtml2pdf)
+        cache_dir : str, optional
+            Directory of the cache of rendered PDF sections, see
+            ``Save``. (default is None)
+        groups : bool, optional
+            Also save the statistics of groups of key authors to
+            pubstats_groups.csv, see `rollups`. (default is False)
+        cube : bool, optional
+            Also save the publication counts by year and pair of
+            institutions or disciplines to pubstats_cube.npz, see
+            `cube`. (default is False)
+        """
+        self._meta()
+        save_report(self.authors, self.formatted, self.translate, output_dir, parallel=parallel, backend=backend,
+                    cache_dir=cache_dir, groups=groups, cube=cube, roster=self._roster,
+                    roster_translator=self._roster_translate,
+                    duplicates=(self._merged, self.duplicates) if self.dedup else None)
+    def export(self, output_dir='.', fmt=None):
+        """Saves the statistics as typed Parquet, Feather or NPZ tables.
+
+        Parameters
+        ----------
+        output_dir : str, optional
+            Directory the files are written to. (default is the current
+            directory)
+        fmt : str, optional
+            'parquet', 'feather' or 'npz'. (default is None, which is
+            'parquet' when pyarrow is installed and 'npz' otherwise)
+
+        Returns
+        -------
+        list of str
+            Names of the files written.
+        """
+        self._meta()
+        return columnar_write(self.authors, self.formatted, self.translate, output_dir, fmt=fmt)
+    def store(self, filename='pubstats.sqlite'):
+        """Saves the report to an SQLite store.
+
+        The store holds the key, the key authors, the publications of
+        the report, the authorship links, the tags and the statistics,
+        and can be passed back to ``PubStats`` as both `key_file` and
+        `data_file`. See `sqlite_store` for the tables. Co-authors left
+        out with `authors` are not stored, so `sqlite_verify` can't
+        recompute the statistics of such a report.
+
+        Parameters
+        ----------
+        filename : str, optional
+            Name of the database file. (default is pubstats.sqlite)
+        """
         self._meta()
-    def save(self):
-        """Saves report as PDF and 2 CSV files."""
-        csv_write.csv1(self.authors, self.formatted)
-        csv_write.csv2(self.authors, self.formatted, self.translate)
-        Save(self.authors, self.formatted, self.translate)
-    def display(self):
-        """Displays report to standard out."""
-        Display(self.authors, self.formatted, self.translate)
-    def _init_authors(self):
+        sqlite_write(self.authors, self.formatted, self.translate, filename, key_data=self.key_data)
+    def rollups(self, groupings=('role', 'institution', 'department', 'discipline')):
+        """Returns the statistics of the groups of key authors.
+
+        Parameters
+        ----------
+        groupings : tuple of str, optional
+            Any of 'role', 'institution', 'department' and
+            'discipline'. (default is all of them)
+
+        Returns
+        -------
+        dict of str: dict of str: dict
+            For every grouping, the statistics of every group. See
+            `rollup` for the columns.
+        """
+        self._meta()
+        # Publications are multi-institute or multi-discipline by all the
+        # key authors, as in the author statistics.
+        return rollups(self.authors, self.formatted, self.translate, groupings, roster=self._roster,
+                       roster_translator=self._roster_translate)
+    def cube(self, level='institution'):
+        """Returns the publication counts by year and pair of
+        institutions or disciplines.
+
+        The cube is built once per report; the tables of other years
+        and institutions are then sums over it. See `cube.Cube`.
+
+        Parameters
+        ----------
+        level : str, optional
+            'institution' or 'discipline'. (default is institution)
+
+        Returns
+        -------
+        Cube
+            The cube of the report's publications.
+        """
+        if level not in self._cubes:
+            self._cubes.update(cubes(self.authors, self.formatted, self.translate, (level,)))
+        return self._cubes[level]
+    def diff(self, old):
+        """Returns the changes since an earlier report.
+
+        Authors are matched by key, and publications by DOI, or else by
+        title and first author. See `diff.compare`.
+
+        Parameters
+        ----------
+        old : PubStats
+            The earlier report.
+
+        Returns
+        -------
+        dict
+            The changed authors, the added and removed publications and
+            the changed collaborations between institutions.
+        """
+        return compare(snapshot(old), snapshot(self))
+    def network(self, level='author'):
+        """Returns the co-authorship network of the report.
+
+        Co-authors left out with `authors` are still nodes, joined to
+        the selected authors.
+
+        Parameters
+        ----------
+        level : str, optional
+            'author', 'institution' or 'discipline'. (default is
+            author)
+
+        Returns
+        -------
+        Network
+            See `network.Network`.
+        """
+        return networks(self._roster, self.formatted, self._roster_translate, (level,))[level]
+    def save_network(self, output_dir='.', levels=('author', 'institution'), samples=256):
+        """Saves the co-authorship networks as CSV and GraphML.
+
+        Parameters
+        ----------
+        output_dir : str, optional
+            Directory the files are written to. (default is the current
+            directory)
+        levels : tuple of str, optional
+            'author', 'institution' and/or 'discipline'. (default is
+            author and institution)
+        samples : int or None, optional
+            Number of source nodes for the betweenness estimate.
+            (default is 256; None computes it exactly)
+
+        Returns
+        -------
+        list of str
+            Names of the files written.
+        """
+        return network_write(self._roster, self.formatted, self._roster_translate, output_dir, levels, samples)
+    def display(self, summary=False, pager=False):
+        """Displays report to standard out.
+
+        Parameters
+        ----------
+        summary : bool, optional
+            Only display the author statistics. (default is False)
+        pager : bool, optional
+            Display the report through $PAGER when writing to a
+            terminal. (default is False)
+        """
+        self._meta()
+        Display(self.authors, self.formatted, self.translate, summary=summary, pager=pager)
+    def author_stats(self, key):
+        """Returns the statistics of a key author.
+
+        With `lazy` set, only the author's publications are looked at,
+        the first time the author is asked for.
+
+        Parameters
+        ----------
+        key : str
+            Key of the author in the `authors` attribute.
+
+        Returns
+        -------
+        dict
+            The author's information, the statistic counts and credits
+            (named as in `export`) and the numbers of the author's publications
+            in the report.
+
+        Raises
+        ------
+        KeyError
+            If `key` is not an author of the report.
+        """
+        author = self._author(key)
+        stats = {'key': key, 'first': author.fi, 'last': author.last,
+                 'role': author.role, 'institution': author.inst,
+                 'discipline': author.disc, 'department': author.dept}
+        for column, attr in _STATS:
+            stats[column] = author.get_len(attr)
+        stats['cuca'] = author.cuca
+        for name, _ in CREDITS:
+            stats[name] = getattr(author, name)
+        stats['publications'] = [p + 1 for p in getattr(author, 'pubs_author', [])]
+        return stats
+    def author_publications(self, key):
+        """Returns the publications of a key author.
+
+        Parameters
+        ----------
+        key : str
+            Key of the author in the `authors` attribute.
+
+        Returns
+        -------
+        list of dict
+            The author's publications, in report order.
+        """
+        return [self.formatted[p] for p in getattr(self._author(key), 'pubs_author', [])]
+    def author_bibliography(self, key, fmt='text'):
+        """Returns the formatted references of a key author.
+
+        Parameters
+        ----------
+        key : str
+            Key of the author in the `authors` attribute.
+        fmt : str, optional
+            'text' for the format of `display`, 'html' for the format
+            of `save`. (default is text)
+
+        Returns
+        -------
+        list of str
+            The references of the author's publications, in report
+            order.
+        """
+        if (key, fmt) not in self._bib_cache:
+            bib = formatter(fmt, self.translate)
+            self._bib_cache[key, fmt] = [bib.format(d) for d in self.author_publications(key)]
+        return self._bib_cache[key, fmt]
+    def _init_authors(self, institutions=None):
         """Creates the author data."""
         for i in self.key_data:
+            if institutions is not None and i.get('institution') not in institutions:
+                continue
             key_formatted = Helpers.key_from_name(i.get('first'), i.get('last'))
             new_author = Author(i.get('first'), i.get('last'), i.get('role'), i.get('institution'), i.get('field'), i.get('department'), i.get('alias'))
             #key_formatted = Helpers.key_from_name(i.get('\ufefffirst'), i.get('last'))
@@ -224,9 +770,179 @@ class PubStats():
                 self.translate[key_formatted] = key_formatted
             if self.translate[key_formatted] not in self.authors:
                 self.authors[self.translate[key_formatted]] = new_author
+    def _init_index(self):
+        """Creates the year, tag and author indices over the matched data.
+
+        `_pub_keys` holds the matched author keys of each publication,
+        in author order, so subsets don't have to match names again.
+        `_key_pos` holds the publications of each author key.
+        """
+        index = []
+        self._tag_pos = {}
+        self._pub_keys = []
+        self._key_pos = {}
+        for i, d in enumerate(self.matched):
+            try:
+                index.append((int(d['published']['year']), i))
+            except (KeyError, TypeError, ValueError):
+                pass
+            for tag in d.get('labelsNamed', []):
+                self._tag_pos.setdefault(tag, set()).add(i)
+            keys = []
+            for a in d['author']:
+                key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), self.translate)
+                if key:
+                    keys.append(key)
+            self._pub_keys.append(keys)
+            for key in set(keys):
+                self._key_pos.setdefault(key, []).append(i)
+        index.sort()
+        self._years = [y for y, i in index]
+        self._year_pos = [i for y, i in index]
+    def _report(self):
+        """Selects the report data and computes its statistics."""
+        self.authors = {}
+        self.translate = {}
+        self._init_authors(self.institutions)
+        # Every key author of the report's institutions, since the other
+        # authors of a publication are counted as co-authors.
+        self._roster = self.authors
+        self._roster_translate = self.translate
+        self.formatted = self._select()
+        # New dicts, since subsets share the attributes of this report.
+        self._author_cache = {}
+        self._bib_cache = {}
+        self._cubes = {}
+        self._computed = False
+        if self.author_keys is not None:
+            # The other key authors were needed to count co-authors, but
+            # only have the statistics of the selected publications.
+            self.authors = {k: self.authors[k] for k in self.author_keys if k in self.authors}
+            self.translate = {n: k for n, k in self.translate.items() if k in self.authors}
+        if not self.lazy:
+            self._meta()
+    def _select(self):
+        """Returns the matched data within the tags, institutions,
+        authors and year window of the report."""
+        if self.author_keys is not None:
+            # Only the publications of the selected authors.
+            wanted = set()
+            for k in self.author_keys:
+                wanted.update(self._key_pos.get(k, ()))
+            positions = sorted(wanted)
+        else:
+            positions = range(len(self.matched))
+        if self.year_from is not None or self.year_to is not None:
+            lo = 0
+            hi = len(self._years)
+            if self.year_from is not None:
+                lo = bisect.bisect_left(self._years, int(self.year_from))
+            if self.year_to is not None:
+                hi = bisect.bisect_right(self._years, int(self.year_to))
+            # Keep the database order within the window.
+            if self.author_keys is None:
+                positions = sorted(self._year_pos[lo:hi])
+            else:
+                window = set(self._year_pos[lo:hi])
+                positions = [i for i in positions if i in window]
+        if self.tags is not None:
+            tagged = set()
+            for tag in self.tags:
+                tagged.update(self._tag_pos.get(tag, ()))
+            positions = [i for i in positions if i in tagged]
+        spilled = isinstance(self.matched, SpilledData)
+        # Sorted positions in `matched` of the report's publications.
+        self._positions = positions
+        if self.institutions is None:
+            if spilled:
+                return self.matched.select(positions)
+            return [self.matched[i] for i in positions]
+        # Publications are copied here, since the number of matched
+        # authors depends on the institutions.
+        selected = []
+        counts = []
+        kept = []
+        for i in positions:
+            n = sum(1 for k in self._pub_keys[i] if k in self.authors)
+            if n and spilled:
+                selected.append(i)
+                counts.append(n)
+            elif n:
+                d = dict(self.matched[i])
+                d['matched_authors'] = n
+                selected.append(d)
+                kept.append(i)
+        if spilled:
+            self._positions = selected
+            return self.matched.select(selected, counts)
+        self._positions = kept
+        return selected
+    def _dedup(self, data, out):
+        """Merges the duplicates in `data` into `out`, keeping the
+        merged publications for the dedup report."""
+        out, self.duplicates = dedup(data, out)
+        self._merged = {i: data[i] for members, _ in self.duplicates for i in members}
+        return out
+    def _stream(self):
+        """Streams the publications with key authors into a temporary
+        file, within `memory_budget`."""
+        budget = int(self.memory_budget * (1 << 20))
+        matched = SpilledData(cache_size=budget // 4)
+        fields = report_fields()
+        for d in iter_publications(self.data_file, tags=self.tags, chunk_size=max(budget // 8, 1 << 16)):
+            for pub in format_data([d], self.translate):
+                minimal = project(pub, fields)
+                minimal['matched_authors'] = pub['matched_authors']
+                matched.append(minimal)
+        return matched
     def _meta(self):
         """Does the statistics calculations for the report."""
-        for item in inspect.getmembers(Meta, predicate=inspect.isfunction):
-            if item[0][0:4] == "pubs":
-                for i, d in enumerate(self.formatted):
-                    eval("Meta."+item[0]+"(d, self.authors, i, self.translate)")
+        if self._computed:
+            return
+        self._computed = True
+        stats = _meta_stats()
+        # One pass over the publications, which may be read from disk.
+        for i, d in enumerate(self.formatted):
+            for stat in stats:
+                stat(d, self._roster, i, self._roster_translate)
+        credit(self._roster, self.formatted, self._roster_translate)
+    def _author(self, key):
+        """Returns the Author `key` with its statistics, computing them
+        from the author's publications only if the report's aren't."""
+        if key not in self.authors:
+            raise KeyError(key)
+        if self._computed:
+            return self.authors[key]
+        if key not in self._author_cache:
+            # Positions of the author's publications in `formatted`.
+            pubs = []
+            for p in self._key_pos.get(key, ()):
+                i = bisect.bisect_left(self._positions, p)
+                if i < len(self._positions) and self._positions[i] == p:
+                    pubs.append(i)
+            authors = _Unscored(self._roster)
+            stats = _meta_stats()
+            pubs = sorted(set(pubs))
+            for i in pubs:
+                d = self.formatted[i]
+                for stat in stats:
+                    stat(d, authors, i, self._roster_translate)
+            credit(authors, [self.formatted[i] for i in pubs], self._roster_translate)
+            self._author_cache[key] = authors[key]
+        return self._author_cache[key]
+
+def _meta_stats():
+    """Returns the statistics functions of ``Meta``."""
+    return [item[1] for item in inspect.getmembers(Meta, predicate=inspect.isfunction) if item[0][0:4] == "pubs"]
+
+class _Unscored(dict):
+    """Copies of the key authors without statistics, made on first use."""
+
+    def __init__(self, roster):
+        super().__init__()
+        self.roster = roster
+
+    def __missing__(self, key):
+        a = self.roster[key]
+        self[key] = Author(a.fi, a.last, a.role, a.inst, a.disc, a.dept, a.alias, a.ID)
+        return self[key]
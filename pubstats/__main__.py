@@ -49,20 +49,22 @@ considered a tag for filtering data.
 import pubstats
 import sys
 
+# The data is parsed once for both the display and the saved report.
 # With no user arguments provided, display and save report with faked
 # data.
 if len(sys.argv) == 1:
-    pubstats.display()
-    pubstats.save()
+    rep = pubstats.PubStats(pubstats._key_file, pubstats._data_file)
 # If 2 arguments are passed, use them as the names of the key file and
 # data file.
 elif len(sys.argv) == 3:
-    pubstats.display(key_file=sys.argv[1], data_file=sys.argv[2])
-    pubstats.save(key_file=sys.argv[1], data_file=sys.argv[2])
+    rep = pubstats.PubStats(sys.argv[1], sys.argv[2])
 # If 3 or more arguments are passed, use the remaining arguments as the
 # desired tags for the report.
 elif len(sys.argv) > 3:
-    pubstats.display(key_file=sys.argv[1], data_file=sys.argv[2], tags=sys.argv[3:])
-    pubstats.save(key_file=sys.argv[1], data_file=sys.argv[2], tags=sys.argv[3:])
+    rep = pubstats.PubStats(sys.argv[1], sys.argv[2], tags=sys.argv[3:])
 else:
+    rep = None
     print('Incorrent number of arguments.')
+if rep is not None:
+    rep.display()
+    rep.save(parallel=True)
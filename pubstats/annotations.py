@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tabulates brat annotations of interview transcripts.
+
+The Python version of summarization/code/annotations.R. Every '.ann'
+file in a directory (one per transcript) is read line by line, keeping
+the labels of the text-bound annotations ('T' lines) and the attribute
+annotations ('A' lines) with their targets. For each transcript, a
+presence table records which attributes are coded on top of which
+entities, with an extra 'any' row and column for the attributes and
+entities found anywhere in the transcript. The tables are summed over
+all transcripts, and over each personnel category.
+
+Transcripts are joined to the personnel file by their code: 'ue_a.ann'
+is the transcript of the person with code 'a'. The personnel 'Role'
+column gives the category, by default faculty for roles 1 and 2 and
+postdoc for role 3, as in the R script.
+
+Files
+-----
+annotations_<category>.csv
+    The summed presence table of a category ('all' for every
+    transcript): the number of transcripts with each attribute on each
+    entity.
+annotations_summary.csv
+    For each attribute, the number of transcripts in each category
+    and the fraction of the category's transcripts containing it (the
+    values plotted in Figure 1).
+"""
+
+from .csv_write import _file_write
+from .key_reader import key_reader
+import concurrent.futures
+import numpy
+import os
+
+__all__ = ['annotations', 'tabulate', 'read_ann', 'ENTITIES', 'ATTRIBUTES', 'CATEGORIES']
+
+# Code labels of the QDA codebook, from annotations.R.
+ENTITIES = ('motivation', 'design', 'collaboration', 'research', 'mentoring', 'exposure', 'infrastructure', 'code')
+ATTRIBUTES = ('uncertainty', 'values', 'decision', 'skill_sets', 'disciplines', 'new_topic', 'stakeholders', 'sustained')
+CATEGORIES = {'faculty': ('1', '2'), 'postdoc': ('3',)}
+
+def read_ann(filename, entities=ENTITIES, attributes=ATTRIBUTES):
+    """Returns the presence table of a brat '.ann' file.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the '.ann' file.
+    entities : tuple of str, optional
+        Entity labels, the columns of the table. (default is `ENTITIES`)
+    attributes : tuple of str, optional
+        Attribute labels, the rows of the table. (default is
+        `ATTRIBUTES`)
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean table of len(attributes) + 1 rows and len(entities) + 1
+        columns. Cell [i, j] is True when attribute i is coded on
+        entity j; the last row and column mark the entities and
+        attributes found in the file.
+    """
+
+    entity_pos = {e: n for n, e in enumerate(entities)}
+    attribute_pos = {a: n for n, a in enumerate(attributes)}
+    presence = numpy.zeros((len(attributes) + 1, len(entities) + 1), dtype=bool)
+    labels = {}
+    targets = []
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            # ID, label and first argument; the text of 'T' lines is
+            # ignored.
+            fields = line.split(None, 3)
+            if len(fields) < 2 or fields[0].startswith('#'):
+                continue
+            labels.setdefault(fields[0], fields[1])
+            if fields[1] in entity_pos:
+                presence[-1, entity_pos[fields[1]]] = True
+            elif fields[1] in attribute_pos:
+                presence[attribute_pos[fields[1]], -1] = True
+                if len(fields) > 2:
+                    targets.append((fields[1], fields[2]))
+    # Targets are resolved at the end, since brat doesn't require them
+    # to come first.
+    for attribute, target in targets:
+        entity = labels.get(target)
+        if entity in entity_pos:
+            presence[attribute_pos[attribute], entity_pos[entity]] = True
+    return presence
+
+def tabulate(directory, personnel_file, entities=ENTITIES, attributes=ATTRIBUTES, categories=CATEGORIES, workers=None):
+    """Sums the presence tables of a directory of '.ann' files.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the '.ann' files.
+    personnel_file : str
+        CSV file with the 'code' and 'Role' of every interviewee.
+    entities : tuple of str, optional
+        Entity labels. (default is `ENTITIES`)
+    attributes : tuple of str, optional
+        Attribute labels. (default is `ATTRIBUTES`)
+    categories : dict of str: tuple of str, optional
+        The roles of each personnel category. (default is `CATEGORIES`)
+    workers : int, optional
+        Number of processes reading the files. (default is None, which
+        uses one per CPU)
+
+    Returns
+    -------
+    dict of str: (int, numpy.ndarray)
+        The number of transcripts and the summed presence table of
+        'all' and of every category.
+    """
+
+    names = sorted(n for n in os.listdir(directory) if n.endswith('.ann'))
+    files = [os.path.join(directory, n) for n in names]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        tables = list(executor.map(read_ann, files, [entities] * len(files), [attributes] * len(files),
+                                   chunksize=max(1, len(files) // (4 * (workers or os.cpu_count() or 1)))))
+    roles = {row.get('code'): row.get('Role') for row in key_reader(personnel_file, return_dict=True)}
+    empty = numpy.zeros((len(attributes) + 1, len(entities) + 1), dtype=int)
+    totals = {'all': (len(tables), sum(tables, empty))}
+    for category, members in categories.items():
+        selected = [t for n, t in zip(names, tables) if roles.get(_code(n)) in members]
+        totals[category] = (len(selected), sum(selected, empty))
+    return totals
+
+def annotations(directory, personnel_file, output_dir='.', workers=None, **kwargs):
+    """Tabulates a directory of '.ann' files and saves the tables.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the '.ann' files.
+    personnel_file : str
+        CSV file with the 'code' and 'Role' of every interviewee.
+    output_dir : str, optional
+        Directory the tables are written to. (default is the current
+        directory)
+    workers : int, optional
+        Number of processes reading the files. (default is None, which
+        uses one per CPU)
+    **kwargs
+        `entities`, `attributes` and `categories`, see `tabulate`.
+
+    Returns
+    -------
+    dict of str: (int, numpy.ndarray)
+        The tables, see `tabulate`.
+    """
+
+    entities = kwargs.get('entities', ENTITIES)
+    attributes = kwargs.get('attributes', ATTRIBUTES)
+    totals = tabulate(directory, personnel_file, workers=workers, **kwargs)
+    for category, (n, table) in totals.items():
+        output_data = [['attribute'] + list(entities) + ['any']]
+        for label, row in zip(list(attributes) + ['any'], table):
+            output_data.append([label] + [int(v) for v in row])
+        _file_write(os.path.join(output_dir, 'annotations_{}.csv'.format(category)), output_data)
+    head = ['attribute']
+    for category, (n, _) in totals.items():
+        head += ['{} (n={})'.format(category, n), '{} fraction'.format(category)]
+    output_data = [head]
+    for i, label in enumerate(attributes):
+        row = [label]
+        for n, table in totals.values():
+            row += [int(table[i, -1]), table[i, -1] / n if n else 0]
+        output_data.append(row)
+    _file_write(os.path.join(output_dir, 'annotations_summary.csv'), output_data)
+    return totals
+
+def _code(name):
+    """Personnel code of a transcript file name, 'ue_a.ann' -> 'a'."""
+    return os.path.splitext(name)[0].split('_')[-1]
@@ -48,6 +48,8 @@ class Author():
         Unique ID.
     cuca : int
         Cross-unit co-authorship.
+    fractional, harmonic, first_last : float
+        Authorship credits, see `credit`.
     pubs_<str> : list of int
         Related to statiscs. Lists publication indices related to each
         statistic. Created by Meta class.
@@ -92,7 +94,7 @@ class Author():
         self.last = last
         try:
             self.role = int(role)
-        except ValueError:
+        except (TypeError, ValueError):
             self.role = None
         self.inst = inst
         self.disc = disc
@@ -100,6 +102,9 @@ class Author():
         self.alias = alias
         self.ID = ID
         self.cuca = 0
+        self.fractional = 0.0
+        self.harmonic = 0.0
+        self.first_last = 0.0
 
     def new_pub_list(self, name):
         """Initializes a new attribute.
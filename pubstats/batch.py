@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Generates several reports from one parsed corpus.
+
+The manifest is a JSON file listing the input files and the reports:
+
+```
+{
+  "key_file": "key.csv",
+  "data_file": "paperpile.json",
+  "reports": [
+    {"name": "overall"},
+    {"name": "thrust1", "tags": ["label1"]},
+    {"name": "psu", "institutions": ["Penn State"],
+     "year_from": 2015, "year_to": 2019, "output_dir": "reports/psu"}
+  ]
+}
+```
+
+Relative paths are relative to the manifest; "data_file" can be a list
+of files. A report is written to `output_dir`, which defaults to its
+`name`. The PDF backend can be set
+with "backend", for all reports or per report. With "dedup": true,
+duplicate publications are merged before any report is made, and are
+listed in every report's pubstats_dedup.csv.
+"""
+
+from .pipeline import save_report
+import concurrent.futures
+import json
+import os
+
+__all__ = ['batch']
+
+# The parsed corpus, in the worker processes.
+_rep = None
+
+def batch(manifest_file, workers=None):
+    """Saves every report in the manifest.
+
+    The publications are parsed and matched to authors once; every
+    report is a subset of that data, whose statistics are computed and
+    saved by the workers.
+
+    Parameters
+    ----------
+    manifest_file : str
+        Filename of the JSON manifest.
+    workers : int, optional
+        Number of processes used to compute and write the reports.
+        (default is None, which does them one after another in this
+        process)
+
+    Returns
+    -------
+    list of str
+        The output directories, in manifest order.
+
+    Raises
+    ------
+    ValueError
+        If a report has neither a "name" nor an "output_dir".
+    """
+
+    from . import PubStats
+
+    with open(manifest_file, encoding='utf-8') as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(manifest_file))
+
+    jobs = []
+    for i, spec in enumerate(manifest['reports']):
+        output_dir = spec.get('output_dir') or spec.get('name')
+        if not output_dir:
+            raise ValueError('Report {} of {} has neither a name nor an output_dir'.format(i + 1, manifest_file))
+        backend = spec.get('backend', manifest.get('backend', 'xhtml2pdf'))
+        jobs.append((spec, os.path.join(base, output_dir), backend))
+
+    data_file = manifest['data_file']
+    if isinstance(data_file, list):
+        data_file = [os.path.join(base, f) for f in data_file]
+    else:
+        data_file = os.path.join(base, data_file)
+    # Lazy, the statistics of the whole corpus aren't needed.
+    rep = PubStats(os.path.join(base, manifest['key_file']), data_file,
+                   tags=manifest.get('tags'),
+                   dedup=manifest.get('dedup', False),
+                   lazy=True)
+
+    if workers is None or workers < 2:
+        for spec, output_dir, backend in jobs:
+            _save(spec, output_dir, backend, rep)
+    else:
+        # The corpus is passed to every worker once, not with every
+        # report.
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                    initargs=(rep,)) as executor:
+            for future in [executor.submit(_save, *job) for job in jobs]:
+                future.result()
+    return [output_dir for spec, output_dir, backend in jobs]
+
+def _init_worker(rep):
+    """Keeps the corpus in a worker process."""
+    global _rep
+    _rep = rep
+
+def _save(spec, output_dir, backend, rep=None):
+    """Computes and saves the report of a manifest entry."""
+    if rep is None:
+        rep = _rep
+    sub = rep.subset(tags=spec.get('tags'),
+                     institutions=spec.get('institutions'),
+                     year_from=spec.get('year_from'),
+                     year_to=spec.get('year_to'))
+    sub._meta()
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    # The duplicates are merged in the whole corpus, so every report
+    # lists them, as `PubStats.save` does.
+    save_report(sub.authors, sub.formatted, sub.translate, output_dir, backend=backend,
+                duplicates=(rep._merged, rep.duplicates) if rep.dedup else None)
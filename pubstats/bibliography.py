@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Reference formats of the reports, without rendering a report.
+
+'text' is the format of the terminal report, 'html' the format of the
+PDF and HTML reports, with the key authors highlighted.
+"""
+
+from .display import Display
+from .save import Save
+
+__all__ = ['formatter', 'FORMATS']
+
+class TextBibliography(Display):
+
+    def __init__(self, key=None):
+        """Formats references like ``Display``."""
+        self.key = key
+
+    def format(self, pub):
+        """Returns the reference of `pub`."""
+        return self._formatted_bib(pub)
+
+class HTMLBibliography(Save):
+
+    def __init__(self, key=None):
+        """Formats references like ``Save``, highlighting the authors
+        in `key`."""
+        self.key = key if key is not None else {}
+
+    def format(self, pub):
+        """Returns the reference of `pub`."""
+        return Save._fix_characters(self._formatted_bib(pub))
+
+FORMATS = {'text': TextBibliography, 'html': HTMLBibliography}
+
+def formatter(fmt='text', key=None):
+    """Returns a reference formatter.
+
+    Parameters
+    ----------
+    fmt : str, optional
+        'text' or 'html'. (default is text)
+    key : dict of str: str, optional
+        Dictionay of formatted names to unique keys for authors, used to
+        highlight key authors in 'html'. (default is None)
+
+    Returns
+    -------
+    TextBibliography or HTMLBibliography
+        An object whose `format` method formats a publication.
+    """
+
+    if fmt not in FORMATS:
+        raise ValueError('Unknown reference format: {}'.format(fmt))
+    return FORMATS[fmt](key)
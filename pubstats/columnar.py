@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Typed binary export of the statistics.
+
+Two tables are written, with the same content as the CSV files but with
+proper types:
+
+authors
+    One row per key author: 'key', 'first', 'last', 'institution',
+    'discipline', 'department', 'role' (0 when missing), the statistic
+    counts of pubstats1.csv, 'cuca' and the credits.
+incidence
+    The sparse version of pubstats2.csv, one row per publication and
+    matched author, institution or discipline: 'pub' (1-based, as in
+    the reports), 'kind' ('author', 'institution' or 'discipline') and
+    'name'.
+
+With pyarrow installed the tables are written as Parquet (or Feather)
+files 'pubstats_authors' and 'pubstats_incidence'. Without it they are
+written to 'pubstats.npz', with the columns of each table stored as
+'authors_<column>' and 'incidence_<column>' arrays; there, 'kind' is an
+int8 code into 'incidence_kinds' and 'name' an int32 code into
+'incidence_names'.
+"""
+
+from .credit import CREDITS
+from .helpers import Helpers
+import numpy
+import os
+import pandas
+
+__all__ = ['columnar_write']
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+_STATS = [('total', 'pubs_author'), ('lead', 'pubs_lead'),
+          ('multi_author', 'pubs_multi_author'),
+          ('multi_institute', 'pubs_multi_institute'),
+          ('multi_discipline', 'pubs_multidisciplinary'),
+          ('multi_institute_single_discipline', 'pubs_multi_institute_single_discipline'),
+          ('multi_discipline_single_institute', 'pubs_multi_discipline_single_institute')]
+_KINDS = ['author', 'institution', 'discipline']
+
+def columnar_write(authors, data, translator, output_dir='.', fmt=None):
+    """Saves the author statistics and incidence tables.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    output_dir : str, optional
+        Directory the files are written to. (default is the current
+        directory)
+    fmt : str, optional
+        'parquet', 'feather' or 'npz'. (default is None, which is
+        'parquet' when pyarrow is installed and 'npz' otherwise)
+
+    Returns
+    -------
+    list of str
+        Names of the files written.
+    """
+
+    if fmt is None:
+        fmt = 'parquet' if pyarrow is not None else 'npz'
+    if fmt not in ('parquet', 'feather', 'npz'):
+        raise ValueError('Unknown format: {}'.format(fmt))
+    if fmt != 'npz' and pyarrow is None:
+        raise ImportError('pyarrow is required for {} output.'.format(fmt))
+
+    stats = _author_table(authors)
+    pub, kind, name, names = _incidence(authors, data, translator)
+
+    if fmt == 'npz':
+        filename = os.path.join(output_dir, 'pubstats.npz')
+        arrays = {'authors_' + k: v for k, v in stats.items()}
+        arrays.update({'incidence_pub': pub, 'incidence_kind': kind,
+                       'incidence_name': name,
+                       'incidence_kinds': numpy.array(_KINDS),
+                       'incidence_names': numpy.array(names, dtype=str)})
+        numpy.savez_compressed(filename, **arrays)
+        return [filename]
+
+    tables = {'authors': pandas.DataFrame(stats),
+              'incidence': pandas.DataFrame({
+                  'pub': pub,
+                  'kind': pandas.Categorical.from_codes(kind, _KINDS),
+                  'name': pandas.Categorical.from_codes(name, names)})}
+    filenames = []
+    for table, df in tables.items():
+        filename = os.path.join(output_dir, 'pubstats_{}.{}'.format(table, fmt))
+        if fmt == 'parquet':
+            df.to_parquet(filename, index=False)
+        else:
+            df.to_feather(filename)
+        filenames.append(filename)
+    return filenames
+
+def _author_table(authors):
+    """Returns the columns of the author statistics table."""
+    keys = list(authors.keys())
+    columns = {'key': numpy.array(keys, dtype=str)}
+    for column, attr in [('first', 'fi'), ('last', 'last'), ('institution', 'inst'),
+                         ('discipline', 'disc'), ('department', 'dept')]:
+        columns[column] = numpy.array([getattr(authors[k], attr) or '' for k in keys], dtype=str)
+    columns['role'] = numpy.array([authors[k].role or 0 for k in keys], dtype=numpy.int16)
+    for column, attr in _STATS:
+        columns[column] = numpy.array([authors[k].get_len(attr) for k in keys], dtype=numpy.int32)
+    columns['cuca'] = numpy.array([authors[k].cuca for k in keys], dtype=numpy.int32)
+    for column, _ in CREDITS:
+        columns[column] = numpy.array([getattr(authors[k], column) for k in keys], dtype=numpy.float64)
+    return columns
+
+def _incidence(authors, data, translator):
+    """Returns the incidence table as pub, kind code and name code
+    arrays, and the list of names."""
+    codes = {}
+    names = []
+
+    def _code(value):
+        if value not in codes:
+            codes[value] = len(names)
+            names.append(value)
+        return codes[value]
+
+    pub = []
+    kind = []
+    name = []
+    for index, d in enumerate(data):
+        seen = set()
+        for a in d['author']:
+            key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), translator)
+            if not key:
+                continue
+            # No institution or discipline is '', as in the author table.
+            for k, value in enumerate([key, authors[key].inst or '', authors[key].disc or '']):
+                if (k, value) not in seen:
+                    seen.add((k, value))
+                    pub.append(index + 1)
+                    kind.append(k)
+                    name.append(_code(value))
+    return (numpy.array(pub, dtype=numpy.int32),
+            numpy.array(kind, dtype=numpy.int8),
+            numpy.array(name, dtype=numpy.int32),
+            names)
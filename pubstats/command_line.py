@@ -29,6 +29,19 @@ display()
     Displays report to standard out.
 save()
     Saves report as PDF and 2 CSV files.
+convert()
+    Converts a PaperPile export to a pubstats database.
+batch()
+    Saves every report in a manifest.
+serve()
+    Serves a report to local JSON queries.
+annotations()
+    Tabulates brat annotations by personnel category.
+cube()
+    Prints or saves the publication counts by pair of institutions or
+    disciplines.
+diff()
+    Prints or saves the changes between 2 reports.
 
 Examples
 --------
@@ -52,37 +65,229 @@ the key and data files:
 3. Save the report using the above files, but only include 'tag1' and
 'tag2' in the report:
 >>> pubstats-save 'key.csv' 'data.json' 'tag1' 'tag2'
+
+4. Convert 'data.json' to the indexed database 'data.psdb', which can
+then be used in place of 'data.json':
+>>> pubstats-convert 'data.json' 'data.psdb'
+
+5. Save every report in 'reports.json', using 4 processes:
+>>> pubstats-batch 'reports.json' 4
+
+6. Display only the author statistics of the fake data, through the
+pager:
+>>> pubstats-display --summary --pager
+
+7. Serve the report of 'key.csv' and 'data.json' on port 8080:
+>>> pubstats-serve 'key.csv' 'data.json' --port 8080
+
+8. Save the report with duplicate publications merged, listing them in
+'pubstats_dedup.csv':
+>>> pubstats-save --dedup 'key.csv' 'data.json'
+
+9. Tabulate the brat annotations in 'brat_files' by the personnel
+categories of 'personnel_blinded.csv', writing the tables to 'outputs'
+with 4 processes:
+>>> pubstats-annotations 'brat_files' 'personnel_blinded.csv' 'outputs' 4
+
+10. Save the publications coauthored across each pair of disciplines
+from 2015 to 2019 to 'rainbows.csv', from the cube saved with the
+report by 'pubstats-save --cube' (the key and data files can be given
+instead):
+>>> pubstats-cube 'pubstats_cube.npz' --level discipline --from 2015 --to 2019 --output 'rainbows.csv'
+
+11. Save the report, re-rendering only the sections of the PDF that
+changed since the last run with the same cache directory:
+>>> pubstats-save --cache '.pubstats_cache' 'key.csv' 'data.json'
+
+12. Save the report with the statistics of groups of key authors in
+'pubstats_groups.csv':
+>>> pubstats-save --groups 'key.csv' 'data.json'
+
+13. Save the changes between last week's and this week's SQLite stores
+as CSV (the key file and the 2 data files, or both key and data files,
+can be given instead):
+>>> pubstats-diff 'week1.sqlite' 'week2.sqlite' --format csv --output 'changes.csv'
+
+14. Save the report as paginated HTML pages instead of a PDF ('--backend
+reportlab' draws the PDF with reportlab instead of xhtml2pdf):
+>>> pubstats-save --backend html 'key.csv' 'data.json'
 """
 
+from pubstats.pipeline import BACKENDS
+import csv
 import pubstats
 import sys
 
 def display():
+    # '--summary', '--pager' and '--dedup' can be given anywhere on the
+    # command-line.
+    summary = '--summary' in sys.argv
+    pager = '--pager' in sys.argv
+    dedup = '--dedup' in sys.argv
+    argv = [a for a in sys.argv if a not in ('--summary', '--pager', '--dedup')]
     # With no user arguments provided, display report with faked data.
-    if len(sys.argv) == 1:
-        pubstats.display()
+    if len(argv) == 1:
+        pubstats.display(summary=summary, pager=pager, dedup=dedup)
     # If 2 arguments are passed, use them as the names of the key file and
     # data file.
-    elif len(sys.argv) == 3:
-        pubstats.display(key_file=sys.argv[1], data_file=sys.argv[2])
+    elif len(argv) == 3:
+        pubstats.display(key_file=argv[1], data_file=argv[2], summary=summary, pager=pager, dedup=dedup)
     # If 3 or more arguments are passed, use the remaining arguments as the
     # desired tags for the report.
-    elif len(sys.argv) > 3:
-        pubstats.display(key_file=sys.argv[1], data_file=sys.argv[2], tags=sys.argv[3:])
+    elif len(argv) > 3:
+        pubstats.display(key_file=argv[1], data_file=argv[2], tags=argv[3:], summary=summary, pager=pager, dedup=dedup)
     else:
         print('Incorrent number of arguments.')
 
 def save():
+    # '--dedup', '--groups', '--cube', '--cache DIR' and '--backend NAME'
+    # can be given anywhere on the command-line.
+    dedup = '--dedup' in sys.argv
+    groups = '--groups' in sys.argv
+    cube = '--cube' in sys.argv
+    argv = [a for a in sys.argv if a not in ('--dedup', '--groups', '--cube')]
+    options = {'dedup': dedup, 'groups': groups, 'cube': cube}
+    for option, name in [('--cache', 'cache_dir'), ('--backend', 'backend')]:
+        if option in argv:
+            i = argv.index(option)
+            if i + 1 >= len(argv):
+                print('Missing value for {}.'.format(option))
+                return
+            options[name] = argv[i + 1]
+            del argv[i:i + 2]
+    if options.get('backend', 'xhtml2pdf') not in BACKENDS:
+        print('Unknown PDF backend: {} (one of {}).'.format(options['backend'], ', '.join(sorted(BACKENDS))))
+        return
+    if 'cache_dir' in options and options.get('backend', 'xhtml2pdf') != 'xhtml2pdf':
+        print('--cache is only used by the xhtml2pdf backend.')
+        return
     # With no user arguments provided, save report with faked data.
-    if len(sys.argv) == 1:
-        pubstats.save()
+    if len(argv) == 1:
+        pubstats.save(**options)
     # If 2 arguments are passed, use them as the names of the key file and
     # data file.
-    elif len(sys.argv) == 3:
-        pubstats.save(key_file=sys.argv[1], data_file=sys.argv[2])
+    elif len(argv) == 3:
+        pubstats.save(key_file=argv[1], data_file=argv[2], **options)
     # If 3 or more arguments are passed, use the remaining arguments as the
     # desired tags for the report.
-    elif len(sys.argv) > 3:
-        pubstats.save(key_file=sys.argv[1], data_file=sys.argv[2], tags=sys.argv[3:])
+    elif len(argv) > 3:
+        pubstats.save(key_file=argv[1], data_file=argv[2], tags=argv[3:], **options)
+    else:
+        print('Incorrent number of arguments.')
+
+def convert():
+    # Both the PaperPile export and the database file are required.
+    if len(sys.argv) == 3:
+        pubstats.convert(sys.argv[1], sys.argv[2])
+    else:
+        print('Incorrent number of arguments.')
+
+def batch():
+    # The manifest is required; the number of processes is optional.
+    if len(sys.argv) == 2:
+        pubstats.batch(sys.argv[1])
+    elif len(sys.argv) == 3:
+        pubstats.batch(sys.argv[1], workers=int(sys.argv[2]))
+    else:
+        print('Incorrent number of arguments.')
+
+def serve():
+    # '--port N' and '--socket PATH' can be given anywhere after the files.
+    argv = list(sys.argv)
+    options = {}
+    for option, name, kind in [('--port', 'port', int), ('--socket', 'socket_path', str)]:
+        if option in argv:
+            i = argv.index(option)
+            if i + 1 >= len(argv):
+                print('Missing value for {}.'.format(option))
+                return
+            options[name] = kind(argv[i + 1])
+            del argv[i:i + 2]
+    # The key file and data file are required; any further arguments are
+    # tags.
+    if len(argv) == 3:
+        pubstats.serve(argv[1], argv[2], **options)
+    elif len(argv) > 3:
+        pubstats.serve(argv[1], argv[2], tags=argv[3:], **options)
+    else:
+        print('Incorrent number of arguments.')
+
+def annotations():
+    # The directory and personnel file are required; the output directory
+    # and number of processes are optional.
+    if len(sys.argv) == 3:
+        pubstats.annotations(sys.argv[1], sys.argv[2])
+    elif len(sys.argv) == 4:
+        pubstats.annotations(sys.argv[1], sys.argv[2], output_dir=sys.argv[3])
+    elif len(sys.argv) == 5:
+        pubstats.annotations(sys.argv[1], sys.argv[2], output_dir=sys.argv[3], workers=int(sys.argv[4]))
+    else:
+        print('Incorrent number of arguments.')
+
+def cube():
+    # '--level', '--from', '--to', '--names' (comma separated) and
+    # '--output' can be given anywhere after the files.
+    argv = list(sys.argv)
+    options = {}
+    for option, name, kind in [('--level', 'level', str), ('--from', 'year_from', int), ('--to', 'year_to', int),
+                               ('--names', 'names', lambda v: v.split(',')), ('--output', 'output', str)]:
+        if option in argv:
+            i = argv.index(option)
+            if i + 1 >= len(argv):
+                print('Missing value for {}.'.format(option))
+                return
+            options[name] = kind(argv[i + 1])
+            del argv[i:i + 2]
+    level = options.pop('level', 'institution')
+    output = options.pop('output', None)
+    # Either a saved cube, or the key file and data file.
+    if len(argv) == 2:
+        cubes = pubstats.load_cubes(argv[1])
+        if level not in cubes:
+            print('No {} cube in {}.'.format(level, argv[1]))
+            return
+        data_cube = cubes[level]
+    elif len(argv) == 3:
+        try:
+            data_cube = pubstats.PubStats(argv[1], argv[2], lazy=True).cube(level)
+        except ValueError as err:
+            print(err)
+            return
+    else:
+        print('Incorrent number of arguments.')
+        return
+    try:
+        # Checks the names before anything is written.
+        names, table = data_cube.rainbow(**options)
+    except ValueError as err:
+        print(err)
+        return
+    if output:
+        data_cube.write_csv(output, **options)
+        return
+    writer = csv.writer(sys.stdout)
+    writer.writerow([level] + names)
+    for name, row in zip(names, table.tolist()):
+        writer.writerow([name] + row)
+
+def diff():
+    # '--format' and '--output' can be given anywhere after the files.
+    argv = list(sys.argv)
+    options = {}
+    for option, name in [('--format', 'fmt'), ('--output', 'filename')]:
+        if option in argv:
+            i = argv.index(option)
+            if i + 1 >= len(argv):
+                print('Missing value for {}.'.format(option))
+                return
+            options[name] = argv[i + 1]
+            del argv[i:i + 2]
+    # 2 stores, a key file and 2 data files, or 2 key and data files.
+    if len(argv) == 3:
+        pubstats.diff(argv[1], argv[2], **options)
+    elif len(argv) == 4:
+        pubstats.diff((argv[1], argv[2]), (argv[1], argv[3]), **options)
+    elif len(argv) == 5:
+        pubstats.diff((argv[1], argv[2]), (argv[3], argv[4]), **options)
     else:
         print('Incorrent number of arguments.')
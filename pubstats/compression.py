@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compressed key and data files.
+
+Key and data files can be compressed with gzip or Zstandard (which
+needs the zstandard package). They are decompressed while they are
+parsed, so the uncompressed file is never written to disk. Compression
+is recognized by the first bytes of the file, or else by a '.gz' or
+'.zst' extension; the format of the content is given by the rest of the
+name ('paperpile.json.gz' is JSON).
+"""
+
+import gzip
+import io
+import os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+__all__ = ['open_data', 'compression', 'base_name']
+
+_MAGIC = [(b'\x1f\x8b', 'gzip'), (b'\x28\xb5\x2f\xfd', 'zstd')]
+_EXTENSIONS = {'.gz': 'gzip', '.gzip': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+
+def compression(filename):
+    """Returns the compression of a file.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file to test.
+
+    Returns
+    -------
+    str
+        'gzip', 'zstd', or None if the file isn't compressed.
+    """
+
+    try:
+        with open(filename, 'rb') as f:
+            head = f.read(4)
+    except (IOError, OSError):
+        head = b''
+    for magic, kind in _MAGIC:
+        if head.startswith(magic):
+            return kind
+    if head:
+        return None
+    return _EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+def base_name(filename):
+    """Returns `filename` without its compression extension."""
+    name, ext = os.path.splitext(filename)
+    return name if ext.lower() in _EXTENSIONS else filename
+
+def open_data(filename, mode='rt', encoding='utf-8'):
+    """Opens a file for reading, decompressing it as it is read.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file, compressed or not.
+    mode : str, optional
+        'rt' for text or 'rb' for bytes. (default is 'rt')
+    encoding : str, optional
+        The encoding of a text file. (default is utf-8)
+
+    Returns
+    -------
+    file
+        The open file, of the uncompressed content.
+    """
+
+    kind = compression(filename)
+    if kind is None:
+        if 'b' in mode:
+            return open(filename, 'rb')
+        return open(filename, encoding=encoding)
+    if kind == 'gzip':
+        f = gzip.open(filename, 'rb')
+    else:
+        if zstandard is None:
+            raise ImportError('zstandard is required to read {}.'.format(filename))
+        f = zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb'), read_across_frames=True, closefd=True)
+    if 'b' in mode:
+        return f
+    return io.TextIOWrapper(f, encoding=encoding)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Authorship credit.
+
+The other statistics count a publication once for each of its key
+authors. Here every publication has a credit of 1, shared among all of
+its n authors (key authors or not) by their position k = 1 ... n:
+
+fractional
+    1 / n to every author.
+harmonic
+    (1 / k) / (1 + 1/2 + ... + 1/n), more for the first authors.
+first_last
+    The first and last authors count double: 2 / (n + 2) each, and
+    1 / (n + 2) to the others (1 for a single author).
+
+An author's credit is the sum over their publications. An author listed
+twice on a publication gets the credit of both positions.
+
+The positions of the key authors are collected in one pass over the
+author lists, and the credits of all of them are computed together with
+numpy.
+"""
+
+from .helpers import Helpers
+import numpy
+
+__all__ = ['credit', 'CREDITS']
+
+# Author attribute and report label of every credit.
+CREDITS = [('fractional', 'fractional credit:'),
+           ('harmonic', 'harmonic credit:'),
+           ('first_last', 'first/last author credit:')]
+
+def credit(authors, data, translator):
+    """Computes the authorship credits of the key authors.
+
+    Sets the `fractional`, `harmonic` and `first_last` attributes of
+    the authors with publications in `data`.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    """
+
+    codes = {}
+    keys = []
+    author_code = []
+    position = []
+    n_authors = []
+    for d in data:
+        n = len(d['author'])
+        for k, a in enumerate(d['author']):
+            key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), translator)
+            if key is None:
+                continue
+            if key not in codes:
+                codes[key] = len(keys)
+                keys.append(key)
+            author_code.append(codes[key])
+            position.append(k)
+            n_authors.append(n)
+    if not keys:
+        return
+    code = numpy.array(author_code, dtype=numpy.intp)
+    k = numpy.array(position, dtype=numpy.float64) + 1
+    n = numpy.array(n_authors, dtype=numpy.intp)
+    harmonic_sums = numpy.cumsum(1 / numpy.arange(1, n.max() + 1, dtype=numpy.float64))
+    first_last = numpy.where((k == 1) | (k == n), 2.0, 1.0) / (n + numpy.minimum(n, 2))
+    shares = {'fractional': 1 / n,
+              'harmonic': (1 / k) / harmonic_sums[n - 1],
+              'first_last': first_last}
+    for name, share in shares.items():
+        totals = numpy.bincount(code, weights=share, minlength=len(keys))
+        for key, total in zip(keys, totals.tolist()):
+            setattr(authors[key], name, total)
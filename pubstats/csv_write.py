@@ -22,7 +22,7 @@ import csv
 
 __all__ = ['csv1', 'csv2']
 
-def csv1(authors, data):
+def csv1(authors, data, filename='pubstats1.csv'):
     """Saves first CSV file.
 
     The first CSV file contains the statistic counts for each author.
@@ -33,12 +33,15 @@ def csv1(authors, data):
         The dictionary of Author objects created in PubStats.
     data : list of dict
         The publication data created in PubStats
+    filename : str, optional
+        The name of the file to write (default is pubstats1.csv).
     """
 
     data_head = ['first', 'last', 'total', 'lead', 'multi_author',
                  'multi_institute', 'multi_discipline',
                  'multi_institute_single_discipline',
-                 'multi_discipline_single_institute', 'cuca', 'pubs']
+                 'multi_discipline_single_institute', 'cuca', 'pubs',
+                 'fractional', 'harmonic', 'first_last']
     # Final data to be written to file is contained in output_data
     output_data = [data_head]
     # Looping through all the author data
@@ -56,10 +59,14 @@ def csv1(authors, data):
         if authors[i].has_attr('pubs_author'):
             authored_pubs = authors[i].pubs_author
         row.append([x + 1 for x in authored_pubs])
+        # The credits come after the original columns, so readers of
+        # the columns by position are unaffected.
+        for j in ['fractional', 'harmonic', 'first_last']:
+            row.append(round(getattr(authors[i], j), 4))
         output_data.append(row)
-    _file_write('pubstats1.csv', output_data)
+    _file_write(filename, output_data)
 
-def csv2(authors, data, translator):
+def csv2(authors, data, translator, filename='pubstats2.csv'):
     """Saves second CSV file.
 
     The second CSV file contains the publications information.
@@ -70,6 +77,10 @@ def csv2(authors, data, translator):
         The dictionary of Author objects created in PubStats.
     data : list of dict
         The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    filename : str, optional
+        The name of the file to write (default is pubstats2.csv).
     """
 
     # Final data to be written to file is contained in output_data.
@@ -115,7 +126,7 @@ def csv2(authors, data, translator):
         row.extend(matched_inst)
         row.extend(matched_disc)
         output_data.append(row)
-    _file_write('pubstats2.csv', output_data)
+    _file_write(filename, output_data)
 
 def _file_write(filename, data):
     """Writes data to the file
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Publication counts by year and pair of institutions or disciplines.
+
+A cube holds, for every publication year y and institutions i and j,
+the number of publications from year y with authors from both i and j;
+the diagonal (i = i) is the number of publications with an author from
+i. Summed over years, it is the "rainbow" table of
+summarization/code/count_inst.R. The same cube is kept for disciplines.
+
+The cubes are built in one pass over the publications, so the table of
+any range of years and any set of institutions is a sum over an array
+instead of a new report. Publications without a valid year are kept
+apart, and only counted when no year bound is given, as in the reports.
+
+Files
+-----
+pubstats_cube.npz
+    Written by `save` with `cube`, with the arrays '<level>_names',
+    '<level>_years', '<level>_counts' and '<level>_undated' of each
+    level. Read with `load_cubes`.
+"""
+
+from .csv_write import _file_write
+from .helpers import Helpers
+import numpy
+
+__all__ = ['Cube', 'cubes', 'cube_write', 'load_cubes', 'LEVELS']
+
+# Author attribute of every level.
+LEVELS = {'institution': 'inst', 'discipline': 'disc'}
+
+class Cube():
+
+    def __init__(self, level, names, years, counts, undated):
+        """Publication counts by year and pair of groups.
+
+        Parameters
+        ----------
+        level : str
+            'institution' or 'discipline'.
+        names : list of str
+            The institutions or disciplines.
+        years : numpy.ndarray
+            The publication years, ascending.
+        counts : numpy.ndarray
+            Counts of shape (len(years), len(names), len(names)).
+        undated : numpy.ndarray
+            Counts of the publications without a year, of shape
+            (len(names), len(names)).
+        """
+        self.level = level
+        self.names = list(names)
+        self.years = numpy.asarray(years)
+        self.counts = counts
+        self.undated = undated
+
+    def slice(self, year_from=None, year_to=None, names=None):
+        """Returns the counts of a range of years.
+
+        Parameters
+        ----------
+        year_from : int, optional
+            First year to include. (default is None, which means no
+            lower bound)
+        year_to : int, optional
+            Last year to include. (default is None, which means no upper
+            bound)
+        names : list of str, optional
+            The institutions or disciplines to include, in this order.
+            (default is None, which means all of them)
+
+        Returns
+        -------
+        numpy.ndarray
+            The number of publications with authors from both of every
+            pair of `names`, one row and column per name.
+
+        Raises
+        ------
+        ValueError
+            If a name isn't an institution or discipline of the cube.
+        """
+        if names is not None:
+            index = {n: i for i, n in enumerate(self.names)}
+            for n in names:
+                if n not in index:
+                    raise ValueError('Unknown {}: {}'.format(self.level, n))
+        lo = 0
+        hi = len(self.years)
+        if year_from is not None:
+            lo = numpy.searchsorted(self.years, int(year_from), side='left')
+        if year_to is not None:
+            hi = numpy.searchsorted(self.years, int(year_to), side='right')
+        table = self.counts[lo:hi].sum(axis=0)
+        if year_from is None and year_to is None:
+            table = table + self.undated
+        if names is not None:
+            rows = [index[n] for n in names]
+            table = table[numpy.ix_(rows, rows)]
+        return table
+
+    def totals(self, year_from=None, year_to=None):
+        """Returns the number of publications of every institution or
+        discipline in a range of years, see `slice`."""
+        return dict(zip(self.names, numpy.diagonal(self.slice(year_from, year_to)).tolist()))
+
+    def rainbow(self, year_from=None, year_to=None, names=None):
+        """Returns the table of `slice` ordered like count_inst.R, by
+        decreasing number of publications.
+
+        Returns
+        -------
+        (list of str, numpy.ndarray)
+            The ordered names and the table.
+        """
+        names = list(names) if names is not None else list(self.names)
+        table = self.slice(year_from, year_to, names)
+        order = sorted(range(len(names)), key=lambda i: -table[i, i])
+        return [names[i] for i in order], table[numpy.ix_(order, order)]
+
+    def write_csv(self, filename, year_from=None, year_to=None, names=None):
+        """Saves the table of `rainbow` as CSV."""
+        names, table = self.rainbow(year_from, year_to, names)
+        output_data = [[self.level] + names]
+        for name, row in zip(names, table.tolist()):
+            output_data.append([name] + row)
+        _file_write(filename, output_data)
+
+def cubes(authors, data, translator, levels=tuple(LEVELS)):
+    """Builds the cubes of the key authors' publications.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    levels : tuple of str, optional
+        'institution' and/or 'discipline'. (default is both)
+
+    Returns
+    -------
+    dict of str: Cube
+        The cube of every level.
+    """
+
+    for level in levels:
+        if level not in LEVELS:
+            raise ValueError('Unknown cube level: {}'.format(level))
+    # Group code of every author, for every level, in key order.
+    names = {level: {} for level in levels}
+    codes = {level: {} for level in levels}
+    for key, author in authors.items():
+        for level in levels:
+            value = getattr(author, LEVELS[level])
+            value = '' if value is None else value
+            codes[level][key] = names[level].setdefault(value, len(names[level]))
+    pub_years = []
+    pub_groups = {level: [] for level in levels}
+    for d in data:
+        try:
+            year = int(d['published']['year'])
+        except (KeyError, TypeError, ValueError):
+            year = None
+        keys = set()
+        for a in d['author']:
+            key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), translator)
+            if key in authors:
+                keys.add(key)
+        if not keys:
+            continue
+        pub_years.append(year)
+        for level in levels:
+            pub_groups[level].append(sorted(set(codes[level][k] for k in keys)))
+    years = sorted(set(y for y in pub_years if y is not None))
+    # The last layer holds the publications without a year.
+    layer = {y: i for i, y in enumerate(years)}
+    layers = numpy.array([layer.get(y, len(years)) for y in pub_years], dtype=numpy.intp)
+    result = {}
+    for level in levels:
+        n = len(names[level])
+        # Flat (layer, i, j) index of every pair of groups of every
+        # publication.
+        lengths = numpy.array([len(g) ** 2 for g in pub_groups[level]], dtype=numpy.intp)
+        first = numpy.array([i for g in pub_groups[level] for i in g for _ in g], dtype=numpy.intp)
+        second = numpy.array([j for g in pub_groups[level] for _ in g for j in g], dtype=numpy.intp)
+        flat = (numpy.repeat(layers, lengths) * n + first) * n + second
+        counts = numpy.bincount(flat, minlength=(len(years) + 1) * n * n).astype(numpy.int32)
+        counts = counts.reshape(len(years) + 1, n, n)
+        result[level] = Cube(level, list(names[level]), numpy.array(years, dtype=numpy.int32),
+                             counts[:-1], counts[-1])
+    return result
+
+def cube_write(authors, data, translator, filename='pubstats_cube.npz'):
+    """Saves the cubes of every level to a NumPy '.npz' file.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    filename : str, optional
+        The name of the file to write (default is pubstats_cube.npz).
+    """
+
+    arrays = {}
+    for level, cube in cubes(authors, data, translator).items():
+        arrays[level + '_names'] = numpy.array(cube.names, dtype=str)
+        arrays[level + '_years'] = cube.years
+        arrays[level + '_counts'] = cube.counts
+        arrays[level + '_undated'] = cube.undated
+    numpy.savez_compressed(filename, **arrays)
+
+def load_cubes(filename):
+    """Reads the cubes saved by `cube_write`.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the '.npz' file.
+
+    Returns
+    -------
+    dict of str: Cube
+        The cube of every level.
+    """
+
+    with numpy.load(filename) as f:
+        return {level: Cube(level, f[level + '_names'].tolist(), f[level + '_years'],
+                            f[level + '_counts'], f[level + '_undated'])
+                for level in LEVELS if level + '_names' in f.files}
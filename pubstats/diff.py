@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Differences between 2 reports.
+
+A report is reduced to a snapshot: the statistics of every key author,
+the publications by identity and the number of publications shared by
+every pair of institutions. 2 snapshots are joined on the author keys,
+the publication identities and the institution pairs in dicts, so the
+diff takes time linear in the size of the reports.
+
+The identity of a publication is its DOI, or else its normalized title
+and first author (as for duplicates), so publications are matched
+across exports even though their numbers in the reports change.
+Publications with the same identity in one report are taken as one.
+
+Changes
+-------
+authors
+    Every author added, removed or with changed statistics, institution,
+    discipline, department or role, with the old and new values and the
+    publications added to and removed from their list.
+added, removed
+    The publications only in the new or only in the old report.
+collaborations
+    The pairs of institutions whose number of shared publications
+    changed; 'old' is 0 for new collaborations.
+"""
+
+from .columnar import _STATS
+from .credit import CREDITS
+from .csv_write import _file_write
+from .duplicates import normalize_doi, normalize_title
+from .helpers import Helpers
+import csv
+import json
+import sys
+
+__all__ = ['snapshot', 'compare', 'diff_write', 'publication_id', 'FORMATS']
+
+FORMATS = ('text', 'csv', 'json')
+# Compared author statistics, and author attributes.
+_COLUMNS = [column for column, _ in _STATS] + ['cuca'] + [name for name, _ in CREDITS]
+_ATTRIBUTES = ['role', 'institution', 'discipline', 'department']
+# Credits are rounded as in pubstats1.csv.
+_DIGITS = 4
+
+def publication_id(pub):
+    """Returns the identity of a publication, used to match it across
+    reports: 'doi:' and its DOI, or 'title:' and its normalized title
+    and first author."""
+    doi = normalize_doi(pub.get('doi'))
+    if doi:
+        return 'doi:' + doi
+    authors = pub.get('author') or [{}]
+    last = (authors[0].get('last') or '').lower()
+    return 'title:{}|{}'.format(normalize_title(pub.get('title') or ''), last)
+
+def snapshot(rep):
+    """Reduces a report to what `compare` compares.
+
+    Parameters
+    ----------
+    rep : PubStats
+        The report.
+
+    Returns
+    -------
+    dict
+        'authors', the statistics of every key author, with their
+        publications as identities; 'publications', the identity,
+        number, year, title, DOI and key authors of every publication;
+        'collaborations', the number of publications of every pair of
+        institutions, as 'institution|institution'.
+    """
+
+    ids = []
+    publications = {}
+    collaborations = {}
+    for i, d in enumerate(rep.formatted):
+        pub_id = publication_id(d)
+        ids.append(pub_id)
+        keys = []
+        for a in d['author']:
+            key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), rep.translate)
+            if key in rep.authors and key not in keys:
+                keys.append(key)
+        if pub_id in publications:
+            continue
+        publications[pub_id] = {'id': pub_id, 'number': i + 1, 'year': (d.get('published') or {}).get('year'),
+                                'title': d.get('title'), 'doi': d.get('doi'), 'authors': keys}
+        insts = sorted(set(rep.authors[k].inst for k in keys if rep.authors[k].inst))
+        for x in range(len(insts)):
+            for y in range(x + 1, len(insts)):
+                pair = '{}|{}'.format(insts[x], insts[y])
+                collaborations[pair] = collaborations.get(pair, 0) + 1
+    authors = {}
+    for key in rep.authors:
+        stats = rep.author_stats(key)
+        stats['publications'] = sorted(set(ids[p - 1] for p in stats['publications']))
+        for name, _ in CREDITS:
+            stats[name] = round(stats[name], _DIGITS)
+        authors[key] = stats
+    return {'authors': authors, 'publications': publications, 'collaborations': collaborations}
+
+def compare(old, new):
+    """Compares 2 snapshots.
+
+    Parameters
+    ----------
+    old : dict
+        The snapshot of the earlier report, see `snapshot`.
+    new : dict
+        The snapshot of the later report.
+
+    Returns
+    -------
+    dict
+        'authors', the changes of every changed author by key;
+        'added' and 'removed', the publications only in `new` or only
+        in `old`; 'collaborations', the changed pairs of institutions.
+    """
+
+    authors = {}
+    for key in list(old['authors']) + [k for k in new['authors'] if k not in old['authors']]:
+        before = old['authors'].get(key)
+        after = new['authors'].get(key)
+        info = after or before
+        change = {'first': info['first'], 'last': info['last'], 'change': 'changed', 'old': {}, 'new': {},
+                  'delta': {}, 'added': [], 'removed': []}
+        if before is None or after is None:
+            change['change'] = 'added' if before is None else 'removed'
+        for column in _ATTRIBUTES + _COLUMNS:
+            a = before[column] if before is not None else None
+            b = after[column] if after is not None else None
+            if a == b:
+                continue
+            change['old'][column] = a
+            change['new'][column] = b
+            if column in _COLUMNS:
+                change['delta'][column] = round((b or 0) - (a or 0), _DIGITS)
+        a = set(before['publications']) if before is not None else set()
+        b = set(after['publications']) if after is not None else set()
+        change['added'] = sorted(b - a)
+        change['removed'] = sorted(a - b)
+        if change['change'] != 'changed' or change['old'] or change['added'] or change['removed']:
+            authors[key] = change
+    added = [p for i, p in new['publications'].items() if i not in old['publications']]
+    removed = [p for i, p in old['publications'].items() if i not in new['publications']]
+    collaborations = []
+    for pair in list(old['collaborations']) + [p for p in new['collaborations'] if p not in old['collaborations']]:
+        a = old['collaborations'].get(pair, 0)
+        b = new['collaborations'].get(pair, 0)
+        if a != b:
+            collaborations.append({'institutions': pair.split('|'), 'old': a, 'new': b})
+    return {'authors': authors, 'added': added, 'removed': removed, 'collaborations': collaborations}
+
+def diff_write(changes, filename=None, fmt='text'):
+    """Writes the result of `compare`.
+
+    Parameters
+    ----------
+    changes : dict
+        The result of `compare`.
+    filename : str, optional
+        The file to write. (default is None, which means standard out)
+    fmt : str, optional
+        'text' for a summary, 'csv' for one row per changed value,
+        'json' for `changes` itself. (default is text)
+    """
+
+    if fmt not in FORMATS:
+        raise ValueError('Unknown diff format: {}'.format(fmt))
+    if fmt == 'csv':
+        rows = _rows(changes)
+        if filename is None:
+            csv.writer(sys.stdout).writerows(rows)
+        else:
+            _file_write(filename, rows)
+        return
+    if fmt == 'json':
+        text = json.dumps(changes, indent=2, ensure_ascii=False) + '\n'
+    else:
+        text = ''.join(line + '\n' for line in _lines(changes))
+    if filename is None:
+        sys.stdout.write(text)
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+def _rows(changes):
+    """Rows of the CSV format: kind, change, id, name, field, old, new
+    and delta."""
+    rows = [['kind', 'change', 'id', 'name', 'field', 'old', 'new', 'delta']]
+    for key, change in changes['authors'].items():
+        name = _name(change)
+        for column in _ATTRIBUTES + _COLUMNS:
+            if column in change['old']:
+                rows.append(['author', change['change'], key, name, column, _value(change['old'][column]),
+                             _value(change['new'][column]), change['delta'].get(column, '')])
+        for kind in ('added', 'removed'):
+            for pub_id in change[kind]:
+                rows.append(['author', change['change'], key, name, 'publication', '' if kind == 'added' else pub_id,
+                             pub_id if kind == 'added' else '', 1 if kind == 'added' else -1])
+    for kind in ('added', 'removed'):
+        for pub in changes[kind]:
+            authors = ';'.join(pub['authors'])
+            rows.append(['publication', kind, pub['id'], pub['title'] or '', 'authors',
+                         '' if kind == 'added' else authors, authors if kind == 'added' else '', ''])
+    for collaboration in changes['collaborations']:
+        rows.append(['collaboration', 'added' if collaboration['old'] == 0 else 'changed',
+                     '|'.join(collaboration['institutions']), ' / '.join(collaboration['institutions']),
+                     'publications', collaboration['old'], collaboration['new'],
+                     collaboration['new'] - collaboration['old']])
+    return rows
+
+def _lines(changes):
+    """Lines of the text format."""
+    lines = ['Authors: {} changed'.format(len(changes['authors']))]
+    for key, change in changes['authors'].items():
+        line = '  {} ({})'.format(_name(change), key)
+        if change['change'] != 'changed':
+            line += ' ' + change['change']
+        values = []
+        for column in _ATTRIBUTES + _COLUMNS:
+            if column in change['old']:
+                value = '{} {} -> {}'.format(column, _value(change['old'][column]), _value(change['new'][column]))
+                if column in change['delta']:
+                    value += ' ({:+g})'.format(change['delta'][column])
+                values.append(value)
+        if values:
+            line += ': ' + ', '.join(values)
+        if change['added']:
+            line += '; {} new publications'.format(len(change['added']))
+        if change['removed']:
+            line += '; {} publications removed'.format(len(change['removed']))
+        lines.append(line)
+    for kind in ('added', 'removed'):
+        lines.append('')
+        lines.append('Publications {}: {}'.format(kind, len(changes[kind])))
+        for pub in changes[kind]:
+            lines.append('  {} {} [{}]'.format(pub['year'] or '----', pub['title'] or pub['id'], ', '.join(pub['authors'])))
+    lines.append('')
+    lines.append('Collaborations: {} changed'.format(len(changes['collaborations'])))
+    for collaboration in changes['collaborations']:
+        line = '  {}: {} -> {}'.format(' / '.join(collaboration['institutions']), collaboration['old'],
+                                       collaboration['new'])
+        if collaboration['old'] == 0:
+            line += ' (new)'
+        lines.append(line)
+    return lines
+
+def _name(change):
+    """'Last, First' of an author."""
+    return '{}, {}'.format(change['last'], change['first']) if change['first'] else change['last']
+
+def _value(value):
+    """A value as written in the text and CSV formats."""
+    return '' if value is None else value
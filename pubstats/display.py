@@ -17,35 +17,97 @@
 # You should have received a copy of the GNU General Public License
 # along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
 
+from .credit import CREDITS
 from .helpers import Helpers
-from prettytable import PrettyTable
+from .lowmem import SpilledData, Selection
+from .text_table import pub_table, bib_table
 import textwrap
 import inspect
+import os
+import subprocess
+import sys
 
 class Display():
 
-    def __init__(self, authors, data, key):
-        """Prints report to terminal window"""
+    # Publication fields used by the report.
+    FIELDS = ('author', 'title', 'journal', 'journalfull', 'volume', 'issue', 'pages', 'doi', 'published')
+
+    def __init__(self, authors, data, key, out=None, summary=False, pager=False):
+        """Prints report to terminal window
+
+        Each author's part of the report is written to `out` (default
+        is standard out) as soon as it is ready. With `summary` set,
+        only the author statistics are written, without publication
+        tables or bibliography. With `pager` set and `out` being a
+        terminal, the report is piped into $PAGER (default is less).
+        """
         self.authors = authors
         self.data = data
         self.key = key
-        self.print_string = ''
+        self.out = out if out is not None else sys.stdout
+        self.summary = summary
+        # Wrapped bibliography lines and their width, by publication.
+        # Not kept for publications read from disk, to bound memory.
+        self._wrapped = {}
+        self._cache_wrapped = not isinstance(data, (SpilledData, Selection))
+        if pager and self.out.isatty():
+            self._page()
+        else:
+            for part in self.blocks():
+                self.out.write(part)
+                self.out.flush()
+
+    def blocks(self):
+        """Generates the report one author at a time.
+
+        Yields
+        ------
+        str
+            The report for the next author, and finally the
+            bibliography.
+        """
+        blocks = [item[0] for item in inspect.getmembers(Display) if item[0][0:6] == '_block']
+        if self.summary:
+            blocks.remove('_block_pub')
         for i in self.authors.keys():
-            for item in inspect.getmembers(Display):
-                if item[0][0:6] == '_block':
-                    eval('self.'+item[0]+'(i)')
-        self.print_string += '\nBibliography\n'
-        table = PrettyTable(['n', 'bib'])
-        table.header = False
-        table.border = False
-        table.align = 'l'
-        for i, d in enumerate(self.data):
-            row = [''] * 2
-            row[0] = i + 1
-            row[1] = textwrap.fill(self._formatted_bib(d), width=70)
-            table.add_row(row)
-        self.print_string += "%s\n" % (table.get_string())
-        print(self.print_string)
+            self.print_string = ''
+            for block in blocks:
+                getattr(self, block)(i)
+            yield self.print_string
+        if not self.summary:
+            yield self._bibliography()
+
+    def _bibliography(self):
+        """Bibliography of all publications."""
+        rows = []
+        for i in range(len(self.data)):
+            lines, width = self._wrapped_bib(i)
+            rows.append((i + 1, lines, width))
+        return '\nBibliography\n%s\n\n' % (bib_table(rows))
+
+    def _wrapped_bib(self, p):
+        """Returns the wrapped reference of publication `p` and its
+        width, formatting it only the first time."""
+        if p in self._wrapped:
+            return self._wrapped[p]
+        lines = textwrap.wrap(self._formatted_bib(self.data[p]), width=70)
+        wrapped = (lines, max([len(line) for line in lines] or [0]))
+        if self._cache_wrapped:
+            self._wrapped[p] = wrapped
+        return wrapped
+
+    def _page(self):
+        """Writes the report to the pager as it is generated."""
+        pager = subprocess.Popen(os.environ.get('PAGER', 'less'), shell=True, stdin=subprocess.PIPE, universal_newlines=True)
+        try:
+            for part in self.blocks():
+                pager.stdin.write(part)
+                pager.stdin.flush()
+            pager.stdin.close()
+        except BrokenPipeError:
+            # The pager was closed before the end of the report.
+            pass
+        pager.wait()
 
     def _block_head(self, k):
         """Header---Author Name"""
@@ -71,15 +133,16 @@ class Display():
             self.print_string += "  multiple disciplines; single institute: %d\n" % (self.authors[k].get_len('pubs_multi_discipline_single_institute'))
         if self.authors[k].has_attr('pubs_author'):
             self.print_string += "  cross-unit co-authorship: %d\n" % (getattr(self.authors[k], 'cuca'))
+            for name, label in CREDITS:
+                self.print_string += "  %s %.2f\n" % (label, getattr(self.authors[k], name))
 
     def _block_pub(self, k):
         """Author Publications Part"""
         if self.authors[k].has_attr('pubs_author'):
-            table = PrettyTable([' 1 ', ' 2 ', ' 3 ', ' 4 ', ' 5 ', 'bib', 'n auth', 'scrim', 'non-scrim'])
-            table.hrules = True
+            rows = []
             self.print_string += '\n  Publications\n'
             for p in self.authors[k].pubs_author:
-                row = [''] * 9
+                row = [''] * 5
                 if self.authors[k].pub_is_in('pubs_multi_author', p):
                     row[0] = 'X'
                 if self.authors[k].pub_is_in('pubs_multi_institute', p):
@@ -90,12 +153,11 @@ class Display():
                     row[3] = 'X'
                 if self.authors[k].pub_is_in('pubs_multi_discipline_single_institute', p):
                     row[4] = 'X'
-                row[5] = textwrap.fill(self._formatted_bib(self.data[p]), width=70)
-                row[6] = len(self.data[p]['author'])
-                row[7] = self.data[p]['matched_authors']
-                row[8] = row[6] - row[7]
-                table.add_row(row)
-            self.print_string += "%s\n" % (table.get_string())
+                lines, width = self._wrapped_bib(p)
+                n_auth = len(self.data[p]['author'])
+                scrim = self.data[p]['matched_authors']
+                rows.append((row, lines, width, n_auth, scrim, n_auth - scrim))
+            self.print_string += "%s\n" % (pub_table(rows))
             self.print_string += "  1: multiple SCRiM authors\n"
             self.print_string += "  2: multiple institutes\n"
             self.print_string += "  3: multiple disciplines\n"
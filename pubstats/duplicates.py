@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Merges duplicate publications.
+
+Publications are duplicates when they share any of:
+
+doi
+    The DOI, ignoring case and a 'https://doi.org/' prefix.
+title
+    A hash of the normalized title (lower case, accents, punctuation
+    and spacing removed) together with the first author's last name.
+dup_sha1
+    PaperPile's duplicate hash.
+duplicates
+    PaperPile's list of the '_id' of duplicate entries.
+
+Each publication's keys are looked up in one hash table, and
+publications sharing a key are joined with union-find, so duplicates
+are found in a single pass without comparing publications pairwise.
+Duplicates are chained: if A and B share a DOI and B and C a title, all
+3 are merged.
+
+A group of duplicates is merged into the publication with the most
+fields, at the position of the group's first publication. Fields
+missing from it are taken from the other publications, and the tags of
+all of them are combined.
+"""
+
+from .csv_write import _file_write
+import hashlib
+import re
+import unicodedata
+
+__all__ = ['dedup', 'find_duplicates', 'dedup_report']
+
+# Publication fields used to find and merge duplicates.
+FIELDS = ('_id', 'doi', 'title', 'author', 'published', 'labelsNamed', 'dup_sha1', 'duplicates')
+
+def find_duplicates(data):
+    """Finds the groups of duplicate publications.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        The publications.
+
+    Returns
+    -------
+    list of (list of int, list of str)
+        For every group of duplicates, the positions of its publications
+        in ascending order, and the keys they matched on.
+    """
+
+    owner = {}
+    parent = []
+    links = []
+
+    def _find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, pub in enumerate(data):
+        parent.append(i)
+        for key in _keys(pub):
+            if key not in owner:
+                owner[key] = i
+                continue
+            a = _find(owner[key])
+            b = _find(i)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+            links.append((i, key[0]))
+
+    groups = {}
+    for i in range(len(parent)):
+        groups.setdefault(_find(i), []).append(i)
+    reasons = {}
+    for i, kind in links:
+        root = _find(i)
+        if kind not in reasons.setdefault(root, []):
+            reasons[root].append(kind)
+    return [(members, reasons[root]) for root, members in sorted(groups.items()) if len(members) > 1]
+
+def dedup(data, out=None):
+    """Merges duplicate publications.
+
+    Parameters
+    ----------
+    data : list of dict
+        The publications. Only read, with 2 passes.
+    out : list, optional
+        Where the publications are appended, duplicates merged. (default
+        is None, which means a new list)
+
+    Returns
+    -------
+    (list of dict, list)
+        `out` and the groups of duplicates from `find_duplicates`.
+    """
+
+    groups = find_duplicates(data)
+    first = {}
+    merged = set()
+    for members, _ in groups:
+        first[members[0]] = members
+        merged.update(members[1:])
+    if out is None:
+        out = []
+    for i in range(len(data)):
+        if i in first:
+            out.append(_merge([data[j] for j in first[i]]))
+        elif i not in merged:
+            out.append(data[i])
+    return out, groups
+
+def dedup_report(data, groups, filename='pubstats_dedup.csv'):
+    """Saves the list of merged publications as CSV.
+
+    Parameters
+    ----------
+    data : list of dict
+        The publications before merging.
+    groups : list
+        The groups of duplicates, as returned by `dedup`.
+    filename : str, optional
+        The name of the file to write (default is pubstats_dedup.csv).
+    """
+
+    output_data = [['group', 'position', 'kept', 'matched_on', 'doi', 'year', 'title']]
+    for n, (members, reasons) in enumerate(groups):
+        pubs = [data[i] for i in members]
+        kept = _representative(pubs)
+        for k, (i, pub) in enumerate(zip(members, pubs)):
+            output_data.append([n + 1, i + 1, int(k == kept), ' '.join(reasons),
+                                pub.get('doi', ''), (pub.get('published') or {}).get('year', ''),
+                                pub.get('title', '')])
+    _file_write(filename, output_data)
+
+def normalize_doi(doi):
+    """Returns a DOI in lowercase without a 'https://doi.org/' or 'doi:'
+    prefix, or None when there is none."""
+    if not doi:
+        return None
+    return re.sub(r'^(https?://(dx\.)?doi\.org/|doi:\s*)', '', doi.strip().lower()) or None
+
+def normalize_title(title):
+    """Returns a title in lowercase without accents, punctuation and
+    repeated spaces."""
+    text = unicodedata.normalize('NFKD', title)
+    text = ''.join(c for c in text if c.isalnum() or c.isspace()).lower()
+    return ' '.join(text.split())
+
+def _keys(pub):
+    """Yields the duplicate keys of a publication."""
+    doi = normalize_doi(pub.get('doi'))
+    if doi:
+        yield ('doi', doi)
+    title = pub.get('title')
+    if title:
+        authors = pub.get('author') or [{}]
+        last = (authors[0].get('last') or '').lower()
+        text = '{}\0{}'.format(normalize_title(title), last)
+        yield ('title', hashlib.sha1(text.encode('utf-8')).digest())
+    if pub.get('dup_sha1'):
+        yield ('dup_sha1', pub['dup_sha1'])
+    # An entry and the entries listing it as a duplicate share its id.
+    if pub.get('_id'):
+        yield ('duplicates', pub['_id'])
+    for other in pub.get('duplicates') or []:
+        other = other.get('_id') if isinstance(other, dict) else other
+        # Entries without an id would all share one key.
+        if other:
+            yield ('duplicates', other)
+
+def _representative(pubs):
+    """Index of the publication a group is merged into."""
+    sizes = [len(p.keys()) for p in pubs]
+    return sizes.index(max(sizes))
+
+def _merge(pubs):
+    """Returns the group `pubs` merged into one publication."""
+    kept = pubs[_representative(pubs)]
+    merged = dict(kept)
+    tags = []
+    for pub in pubs:
+        for k in pub.keys():
+            if k not in merged:
+                merged[k] = pub[k]
+        for tag in pub.get('labelsNamed') or []:
+            if tag not in tags:
+                tags.append(tag)
+    if tags:
+        merged['labelsNamed'] = tags
+    # Same record type as the publications.
+    return type(kept)(merged)
@@ -18,11 +18,12 @@
 # along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
 
 from .helpers import Helpers
+import collections
 import json
 
-__all__ = ["format_data"]
+__all__ = ["format_data", "name_index"]
 
-def format_data(data, translator):
+def format_data(data, translator, index=None):
     """Formats publication data.
 
     Completes and actions needed to format the publications data.
@@ -33,6 +34,10 @@ def format_data(data, translator):
         Publications data from PubStats
     translator : dict of str: str
         Dictionay of formatted names to unique keys for authors.
+    index : dict of str: list of int, optional
+        The `name_index` of `data`. With it, only the publications of
+        the names in `translator` are looked at. (default is None,
+        which scans every publication)
 
     Returns
     -------
@@ -40,6 +45,16 @@ def format_data(data, translator):
         List of formatted publication data.
     """
 
+    if index is not None:
+        counts = collections.Counter()
+        for name in translator:
+            counts.update(index.get(name, ()))
+        formatted = []
+        for i in sorted(counts):
+            data[i]['matched_authors'] = counts[i]
+            formatted.append(data[i])
+        return formatted
+
     formatted = []
     for d in data:
         if 'author' in d:
@@ -48,6 +63,31 @@ def format_data(data, translator):
                 formatted.append(d)
     return formatted
 
+def name_index(data):
+    """Returns the inverted index of author names.
+
+    Parameters
+    ----------
+    data
+        Publications data from PubStats
+
+    Returns
+    -------
+    dict of str: list of int
+        For every author name formatted by ``Helpers.key_from_name``,
+        the positions of its publications in `data`, in ascending order.
+        A position is repeated when the name is listed more than once
+        on a publication.
+    """
+
+    index = {}
+    for i, d in enumerate(data):
+        for a in d.get('author') or ():
+            key = Helpers.key_from_name(a.get('first'), a.get('last'))
+            if key is not None:
+                index.setdefault(key, []).append(i)
+    return index
+
 def _author_in_authors(authors, translator):
     """Returns number of matched authors."""
 
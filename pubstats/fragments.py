@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Content-addressed cache of rendered report fragments.
+
+Every fragment is stored in a file named by the SHA-256 hash of
+everything it is rendered from, so a fragment whose inputs didn't
+change is read back instead of rendered, and a changed one gets a new
+name. Nothing is ever invalidated; the cache directory can be deleted
+at any time.
+
+`Save` keeps the HTML of every author section and bibliography entry,
+and the PDF pages of every section, see `Save`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+__all__ = ['FragmentCache']
+
+class FragmentCache():
+
+    def __init__(self, directory, salt=''):
+        """Opens a cache directory, creating it if needed.
+
+        Parameters
+        ----------
+        directory : str
+            The cache directory.
+        salt : str, optional
+            Added to every key, e.g. a version of the rendering code, so
+            fragments of other versions are not used. (default is '')
+
+        Attributes
+        ----------
+        hits : int
+            Number of fragments read from the cache.
+        misses : int
+            Number of fragments rendered.
+        """
+        self.directory = directory
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, *inputs):
+        """Returns the key of a fragment rendered from `inputs`, which
+        must be JSON serializable (other objects are used as str)."""
+        h = hashlib.sha256(self.salt.encode('utf-8'))
+        h.update(json.dumps(inputs, sort_keys=True, default=str).encode('utf-8'))
+        return h.hexdigest()
+
+    def get(self, key):
+        """Returns the fragment `key` as bytes, or None."""
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, value):
+        """Stores the bytes `value` as fragment `key`."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written under a temporary name first, so concurrent runs never
+        # read a partial fragment.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(value)
+        os.replace(tmp, path)
+
+    def binary(self, key, render):
+        """Returns the fragment `key`, calling `render` for its bytes
+        when it isn't cached."""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = render()
+        self.put(key, value)
+        return value
+
+    def text(self, key, render):
+        """Same as `binary`, for str fragments."""
+        return self.binary(key, lambda: render().encode('utf-8')).decode('utf-8')
+
+    def _path(self, key):
+        """File of a fragment, in subdirectories by the first 2
+        characters of the key."""
+        return os.path.join(self.directory, key[:2], key[2:])
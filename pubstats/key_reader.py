@@ -17,6 +17,8 @@
 # You should have received a copy of the GNU General Public License
 # along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
 
+from .compression import base_name, compression, open_data
+from .sqlite_store import is_sqlite, read_key
 import pandas
 import csv
 import io
@@ -32,6 +34,10 @@ def key_reader(filename, return_dict=False, encoding="utf-8"):
     rows to dict types. Specific encoding can be supplied using the encoding
     parameter.
 
+    An SQLite store written by `PubStats.store` can be read too; its key
+    table is used. A key compressed with gzip or Zstandard is
+    decompressed as it is read, see `compression`.
+
     Parameters
     ----------
     filename : str
@@ -53,11 +59,20 @@ def key_reader(filename, return_dict=False, encoding="utf-8"):
     # Data to be returned.
     data = []
 
-    if filename[-3:] == "csv":
-        f = io.open(filename, encoding=encoding)
+    if is_sqlite(filename):
+        data = read_key(filename)
+        # Nothing left to parse.
+        f = []
+    elif base_name(filename)[-3:] == "csv":
+        f = open_data(filename, encoding=encoding)
     else:
         f = io.StringIO()
-        df = pandas.read_excel(filename)
+        if compression(filename) is None:
+            df = pandas.read_excel(filename)
+        else:
+            # Excel files are read from memory, they need to be seekable.
+            with open_data(filename, 'rb') as excel:
+                df = pandas.read_excel(io.BytesIO(excel.read()))
         df.to_csv(path_or_buf=f, encoding=encoding)
         f.seek(0)
 
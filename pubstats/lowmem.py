@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Low-memory mode.
+
+With a memory budget, ``PubStats`` streams the publications from the
+data file instead of loading the whole export. Only publications with
+a key author are kept, reduced to the fields used by the report, and
+they are written to a temporary file; `SpilledData` reads them back one
+at a time for the statistics and the outputs. What stays in memory is
+the read buffer, a cache of recently read publications, both sized
+from the budget, and the per-author statistics.
+"""
+
+from .compression import open_data
+from .publication import report_fields
+from .pubdb import PubDB, is_pubdb
+from .sqlite_store import is_sqlite, iter_publications as _iter_sqlite
+from array import array
+import collections
+import json
+import os
+import tempfile
+import threading
+
+__all__ = ['iter_publications', 'SpilledData']
+
+# Rough in-memory size of a decoded record, per byte of JSON.
+_DECODED_SIZE = 8
+
+def iter_publications(filename, tags=None, chunk_size=1 << 20):
+    """Yields the publications of a data file one at a time.
+
+    JSON exports are parsed incrementally, reading `chunk_size`
+    characters at a time, and decompressed as they are read if they
+    are compressed. Pubstats and SQLite databases are read record
+    by record.
+
+    BibTeX, RIS and CSL-JSON files, and lists of files, are read by
+    `readers.read_publications`.
+
+    Parameters
+    ----------
+    filename : str or list of str
+        Name of the JSON file, pubstats database file or SQLite store,
+        or of any file of `readers.READERS`.
+    tags : list of str, optional
+        Only yield publications with any of these tags. (default is
+        None, which means all)
+    chunk_size : int, optional
+        Characters read from a JSON file at a time. (default is 1 MiB)
+
+    Yields
+    ------
+    dict
+        The next publication.
+    """
+
+    # Imported here, readers uses this module.
+    from .readers import is_bibliography, read_publications, csl_to_pub, _is_csl
+    if is_bibliography(filename):
+        for pub in read_publications(filename, tags=tags, chunk_size=chunk_size):
+            yield pub
+        return
+    if is_pubdb(filename):
+        with PubDB(filename) as db:
+            for i in (range(len(db)) if tags is None else db.tag_ids(tags)):
+                yield db[i]
+        return
+    if is_sqlite(filename):
+        for pub in _iter_sqlite(filename, tags=tags):
+            yield pub
+        return
+    with open_data(filename) as f:
+        for pub in _iter_json_array(f, chunk_size):
+            if _is_csl(pub):
+                pub = csl_to_pub(pub)
+            if tags is None or any(i in tags for i in pub.get('labelsNamed', [])):
+                yield pub
+
+def _iter_json_array(f, chunk_size):
+    """Yields the items of the JSON array in file `f`."""
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+    started = False
+    while True:
+        # Skip whitespace, the opening bracket and the separators.
+        while pos < len(buf) and buf[pos] in ' \t\r\n,[':
+            if buf[pos] == '[':
+                started = True
+            pos += 1
+        if pos < len(buf) and started and buf[pos] == ']':
+            return
+        if pos < len(buf) and started:
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+                yield item
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            raise ValueError('{} is not a JSON array.'.format(getattr(f, 'name', 'Data file')))
+        # The item is incomplete: read more, growing the chunk for items
+        # longer than a chunk.
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        elif pos >= len(buf) // 2:
+            buf = buf[pos:] + chunk
+            pos = 0
+        else:
+            buf += chunk
+            chunk_size *= 2
+
+def project(pub, fields=None):
+    """Returns `pub` reduced to `fields` (default is None, which means
+    `report_fields`), as a dict."""
+    minimal = {k: pub[k] for k in (fields or report_fields()) if k in pub}
+    minimal['author'] = [{k: a[k] for k in ('first', 'last') if k in a} for a in pub['author']]
+    return minimal
+
+class SpilledData():
+
+    def __init__(self, cache_size=1 << 20, directory=None):
+        """Publications stored in a temporary file.
+
+        Behaves as a read-only list of publication dicts once filled
+        with `append`. Records are read back from the file when
+        accessed; recently read records are kept decoded, up to an
+        estimated `cache_size` bytes.
+
+        Parameters
+        ----------
+        cache_size : int, optional
+            Size of the record cache in bytes. (default is 1 MiB)
+        directory : str, optional
+            Directory of the temporary file. (default is None, the
+            system's temporary directory)
+        """
+        fd, self.filename = tempfile.mkstemp(suffix='.jsonl', prefix='pubstats', dir=directory)
+        self._file = os.fdopen(fd, 'w+b')
+        self._offsets = array('Q', [0])
+        self._owner = True
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._cached = 0
+        # The file position and the cache are shared by the threads
+        # writing the report files.
+        self._lock = threading.Lock()
+
+    def append(self, pub):
+        """Adds publication `pub` to the end of the file."""
+        line = json.dumps(pub).encode('utf-8') + b'\n'
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(line)
+            self._offsets.append(self._file.tell())
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[n] for n in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('publication index out of range')
+        with self._lock:
+            if i in self._cache:
+                self._cache.move_to_end(i)
+                return self._cache[i]
+            size = self._offsets[i + 1] - self._offsets[i]
+            self._file.seek(self._offsets[i])
+            record = self._file.read(size)
+        pub = json.loads(record.decode('utf-8'))
+        if size * _DECODED_SIZE <= self.cache_size:
+            with self._lock:
+                if i not in self._cache:
+                    self._cache[i] = pub
+                    self._cached += size * _DECODED_SIZE
+                while self._cached > self.cache_size:
+                    n, _ = self._cache.popitem(last=False)
+                    self._cached -= (self._offsets[n + 1] - self._offsets[n]) * _DECODED_SIZE
+        return pub
+
+    def __iter__(self):
+        # Sequential read, bypassing the cache.
+        with self._lock:
+            self._file.flush()
+        with open(self.filename, 'rb') as f:
+            for _ in range(len(self)):
+                yield json.loads(f.readline().decode('utf-8'))
+
+    def select(self, positions, matched_authors=None):
+        """Returns a view of the publications at `positions`.
+
+        Parameters
+        ----------
+        positions : list of int
+            Positions of the publications in the view.
+        matched_authors : list of int, optional
+            Replaces the 'matched_authors' field of the publications.
+            (default is None, which keeps it)
+
+        Returns
+        -------
+        Selection
+            The publications, as a read-only list.
+        """
+        return Selection(self, positions, matched_authors)
+
+    def close(self):
+        """Closes and, in the creating process, deletes the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if self._owner and os.path.exists(self.filename):
+                os.remove(self.filename)
+
+    def __del__(self):
+        self.close()
+
+    def __getstate__(self):
+        # Copies in other processes read the same file but don't own it.
+        self._file.flush()
+        state = dict(self.__dict__)
+        state.update(_file=None, _owner=False, _cache=collections.OrderedDict(), _cached=0)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._file = open(self.filename, 'rb')
+        self._lock = threading.Lock()
+
+class Selection():
+
+    def __init__(self, data, positions, matched_authors=None):
+        """Read-only view of part of a `SpilledData`."""
+        self.data = data
+        self.positions = array('I', positions)
+        self.matched_authors = array('I', matched_authors) if matched_authors is not None else None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[n] for n in range(*i.indices(len(self)))]
+        pub = self.data[self.positions[i]]
+        if self.matched_authors is not None:
+            pub = dict(pub)
+            pub['matched_authors'] = self.matched_authors[i]
+        return pub
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
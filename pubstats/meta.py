@@ -19,6 +19,9 @@
 
 from .helpers import Helpers
 class Meta():
+
+    # Publication fields used by the statistics.
+    FIELDS = ('author',)
     def __init__(self):
         """Publication statistics methods.
         All methods beginning with 'pubs' will be called automatically
@@ -29,6 +32,8 @@ class Meta():
         argv[2]: Index number of publication with pubstats data
         attribute.
         argv[3]: Translator (used for author lookup).
+        Publication fields used by new methods must be added to
+        `FIELDS`, or the readers will leave them out.
         """
         pass
     @staticmethod
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Co-authorship networks of the key authors.
+
+Nodes are key authors, institutions or disciplines. Two nodes are joined
+when they appear together on a publication, and the weight of the edge
+is the number of publications they share; a publication counts once for
+each pair, however many of its authors belong to the 2 nodes. Every key
+author, institution and discipline is a node, with or without
+co-authors.
+
+The networks of every level are built in one pass over the matched
+author lists of the publications and stored as sparse adjacency, a dict
+of neighbours and weights per node.
+
+Files
+-----
+pubstats_network_<level>.csv
+    The edge list: 'source', 'target' and 'weight'.
+pubstats_network_<level>_nodes.csv
+    One row per node with its publication count, degree, weighted
+    degree, connected component and betweenness.
+pubstats_network_<level>.graphml
+    The graph with the node and edge attributes, for Gephi, igraph,
+    networkx, etc.
+"""
+
+from .csv_write import _file_write
+from .helpers import Helpers
+from xml.sax.saxutils import escape, quoteattr
+import collections
+import os
+import random
+
+__all__ = ['Network', 'networks', 'network_write', 'LEVELS']
+
+# Author attribute naming the node of each level.
+LEVELS = {'author': None, 'institution': 'inst', 'discipline': 'disc'}
+
+class Network():
+
+    def __init__(self, level='author'):
+        """An undirected, weighted co-authorship network.
+
+        Parameters
+        ----------
+        level : str, optional
+            What the nodes are: 'author', 'institution' or
+            'discipline'. (default is author)
+
+        Attributes
+        ----------
+        nodes : dict of str: dict
+            Attributes of every node, with its number of publications.
+        adjacency : dict of str: dict of str: int
+            The neighbours of every node and the weights of the edges.
+        """
+        self.level = level
+        self.nodes = {}
+        self.adjacency = {}
+
+    def add_publication(self, nodes):
+        """Adds a publication shared by the distinct `nodes`."""
+        for a in nodes:
+            self.nodes[a]['publications'] += 1
+            row = self.adjacency[a]
+            for b in nodes:
+                if b != a:
+                    row[b] = row.get(b, 0) + 1
+
+    def add_node(self, node, **attributes):
+        """Adds a node without edges, if it isn't in the network."""
+        if node not in self.nodes:
+            attributes['publications'] = 0
+            self.nodes[node] = attributes
+            self.adjacency[node] = {}
+
+    def edges(self):
+        """Yields every edge once, as (source, target, weight)."""
+        order = {n: i for i, n in enumerate(self.nodes)}
+        for a, row in self.adjacency.items():
+            for b, weight in row.items():
+                if order[a] < order[b]:
+                    yield a, b, weight
+
+    def degree(self):
+        """Returns the number of neighbours of every node."""
+        return {n: len(row) for n, row in self.adjacency.items()}
+
+    def weighted_degree(self):
+        """Returns the sum of the edge weights of every node."""
+        return {n: sum(row.values()) for n, row in self.adjacency.items()}
+
+    def components(self):
+        """Returns the connected components.
+
+        Returns
+        -------
+        list of list of str
+            The nodes of every component, largest component first.
+        """
+        parent = {n: n for n in self.nodes}
+
+        def _find(n):
+            while parent[n] != n:
+                parent[n] = parent[parent[n]]
+                n = parent[n]
+            return n
+
+        for a, b, _ in self.edges():
+            a = _find(a)
+            b = _find(b)
+            if a != b:
+                parent[b] = a
+        groups = {}
+        for n in self.nodes:
+            groups.setdefault(_find(n), []).append(n)
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def betweenness(self, samples=256, seed=0):
+        """Returns the betweenness centrality of every node.
+
+        Shortest paths are counted by hops (edge weights are ignored)
+        with Brandes' algorithm, from `samples` randomly chosen source
+        nodes; the sums are scaled up to estimate the betweenness over
+        all sources. Values are not normalized: a node's betweenness is
+        about the number of shortest paths between other nodes that
+        pass through it.
+
+        Parameters
+        ----------
+        samples : int or None, optional
+            Number of source nodes. (default is 256; None, or more than
+            the number of nodes, gives the exact value)
+        seed : int, optional
+            Seed for choosing the sources. (default is 0)
+
+        Returns
+        -------
+        dict of str: float
+            Betweenness of every node.
+        """
+        names = list(self.nodes)
+        index = {n: i for i, n in enumerate(names)}
+        neighbours = [[index[m] for m in self.adjacency[n]] for n in names]
+        n = len(names)
+        sources = range(n)
+        if samples is not None and samples < n:
+            sources = random.Random(seed).sample(sources, samples)
+        total = [0.0] * n
+        for s in sources:
+            # Breadth-first search from s, counting shortest paths.
+            order = []
+            preds = {s: []}
+            sigma = {s: 1}
+            dist = {s: 0}
+            queue = collections.deque([s])
+            while queue:
+                v = queue.popleft()
+                order.append(v)
+                for w in neighbours[v]:
+                    if w not in dist:
+                        dist[w] = dist[v] + 1
+                        sigma[w] = 0
+                        preds[w] = []
+                        queue.append(w)
+                    if dist[w] == dist[v] + 1:
+                        sigma[w] += sigma[v]
+                        preds[w].append(v)
+            # Dependencies, from the farthest nodes back to s.
+            delta = dict.fromkeys(order, 0.0)
+            for w in reversed(order):
+                for v in preds[w]:
+                    delta[v] += sigma[v] / sigma[w] * (1 + delta[w])
+                if w != s:
+                    total[w] += delta[w]
+        # Each path is found from both ends.
+        scale = n / (2 * len(sources)) if len(sources) else 0
+        return {names[i]: total[i] * scale for i in range(n)}
+
+    def write_csv(self, filename):
+        """Saves the edge list as CSV."""
+        output_data = [['source', 'target', 'weight']]
+        output_data.extend(list(e) for e in self.edges())
+        _file_write(filename, output_data)
+
+    def write_nodes(self, filename, samples=256, seed=0):
+        """Saves the node attributes and metrics as CSV, see
+        `betweenness` for `samples` and `seed`."""
+        degree = self.degree()
+        weighted = self.weighted_degree()
+        component = {}
+        for i, members in enumerate(self.components()):
+            for node in members:
+                component[node] = i + 1
+        between = self.betweenness(samples, seed)
+        attributes = [k for k in next(iter(self.nodes.values()), {}) if k != 'publications']
+        output_data = [['node'] + attributes + ['publications', 'degree', 'weighted_degree', 'component', 'betweenness']]
+        for node, values in self.nodes.items():
+            output_data.append([node] + [values[k] for k in attributes] +
+                               [values['publications'], degree[node], weighted[node], component[node],
+                                round(between[node], 3)])
+        _file_write(filename, output_data)
+
+    def write_graphml(self, filename):
+        """Saves the network as GraphML."""
+        attributes = [k for k in next(iter(self.nodes.values()), {})]
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+            for k in attributes:
+                kind = 'int' if k == 'publications' else 'string'
+                f.write('  <key id={0} for="node" attr.name={0} attr.type="{1}"/>\n'.format(quoteattr(k), kind))
+            f.write('  <key id="weight" for="edge" attr.name="weight" attr.type="int"/>\n')
+            f.write('  <graph id={} edgedefault="undirected">\n'.format(quoteattr(self.level)))
+            for node, values in self.nodes.items():
+                f.write('    <node id={}>\n'.format(quoteattr(str(node))))
+                for k in attributes:
+                    if values[k] is not None:
+                        f.write('      <data key={}>{}</data>\n'.format(quoteattr(k), escape(str(values[k]))))
+                f.write('    </node>\n')
+            for a, b, weight in self.edges():
+                f.write('    <edge source={} target={}><data key="weight">{}</data></edge>\n'.format(
+                    quoteattr(str(a)), quoteattr(str(b)), weight))
+            f.write('  </graph>\n</graphml>\n')
+
+def networks(authors, data, translator, levels=('author', 'institution')):
+    """Builds the co-authorship networks of the key authors.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    levels : tuple of str, optional
+        The networks to build, see `LEVELS`. (default is author and
+        institution)
+
+    Returns
+    -------
+    dict of str: Network
+        The network of every level.
+    """
+
+    for level in levels:
+        if level not in LEVELS:
+            raise ValueError('Unknown network level: {}'.format(level))
+    graphs = {level: Network(level) for level in levels}
+    # Nodes in key order, so the files don't depend on the data.
+    for key, author in authors.items():
+        for level, graph in graphs.items():
+            if LEVELS[level] is None:
+                graph.add_node(key, first=author.fi, last=author.last, institution=author.inst,
+                               discipline=author.disc)
+            else:
+                graph.add_node(getattr(author, LEVELS[level]))
+    for d in data:
+        keys = []
+        for a in d['author']:
+            key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), translator)
+            if key in authors and key not in keys:
+                keys.append(key)
+        if not keys:
+            continue
+        for level, graph in graphs.items():
+            attr = LEVELS[level]
+            if attr is None:
+                graph.add_publication(keys)
+            else:
+                graph.add_publication(list(dict.fromkeys(getattr(authors[k], attr) for k in keys)))
+    return graphs
+
+def network_write(authors, data, translator, output_dir='.', levels=('author', 'institution'), samples=256):
+    """Saves the co-authorship networks as CSV and GraphML.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    output_dir : str, optional
+        Directory the files are written to. (default is the current
+        directory)
+    levels : tuple of str, optional
+        The networks to write, see `LEVELS`. (default is author and
+        institution)
+    samples : int or None, optional
+        Number of source nodes for the betweenness estimate. (default is
+        256; None computes it exactly)
+
+    Returns
+    -------
+    list of str
+        Names of the files written.
+    """
+
+    written = []
+    for level, graph in networks(authors, data, translator, levels).items():
+        base = os.path.join(output_dir, 'pubstats_network_{}'.format(level))
+        graph.write_csv(base + '.csv')
+        graph.write_nodes(base + '_nodes.csv', samples=samples)
+        graph.write_graphml(base + '.graphml')
+        written += [base + '.csv', base + '_nodes.csv', base + '.graphml']
+    return written
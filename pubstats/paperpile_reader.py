@@ -17,47 +17,82 @@
 # You should have received a copy of the GNU General Public License
 # along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
 
+from .compression import open_data
+from .pubdb import PubDB, is_pubdb
+from .publication import record_type, report_fields
+from .readers import is_bibliography, read_publications, csl_to_pub, _is_csl
+from .sqlite_store import is_sqlite, iter_publications
 import json
 import io
 import sys
 
 __all__ = ['paperpile_reader']
 
-def paperpile_reader(filename, tags=None):
+def paperpile_reader(filename, tags=None, fields=None, authors=None):
     """Reads and encodes JSON file.
 
     Opens and reads a JSON file. Data will be encoded as UTF-8 by default.
     Data will be returned as an iterable list. Setting tags will ignore items
     that do not contain any of the tags.
 
+    Only the fields used by pubstats are kept, in slotted ``Publication``
+    records; any other field in the export is dropped while reading.
+
+    Files created with `pubdb.convert` are detected by their header and
+    read through `PubDB` instead. Only the records listed in the tag index
+    are decoded when `tags` is provided, and in the author index when
+    `authors` is. SQLite stores written by
+    `PubStats.store` are read the same way, using their tag index.
+
+    BibTeX ('.bib'), RIS ('.ris') and CSL-JSON ('.csl.json') files are
+    read by `readers.read_publications`, as are lists of files, which
+    are merged skipping repeated DOIs. CSL-JSON is also recognized in a
+    '.json' file.
+
+    Files compressed with gzip or Zstandard are decompressed while they
+    are parsed, see `compression`.
+
     Parameters
     ----------
-    filename : str
-        Name of the JSON file
+    filename : str or list of str
+        Name of the JSON file, pubstats database file or SQLite store,
+        or of any file of `readers.READERS`, or a list of them.
     tags : list of str
         A list of tags to be included (default is None which means all)
         tags are included).
+    fields : tuple of str
+        The fields to keep (default is None, which means the fields
+        declared by the statistics and outputs, see `report_fields`).
+    authors : list of str, optional
+        With a pubstats database, only read the publications of these
+        authors, as keys returned by `Helpers.key_from_name`. Other files
+        are read whole. (default is None, which means all publications)
     """
 
-    # Extraneous fields in data file (will be removed)
-    delete_keys = ['dup_sha1', 'sha1', 'test', 'pdf_restricted', 'incomplete', 'updated', 'autocompleted', 'id_list', 'pages', 'folders', 'collection_timestamps', 'trashed', 'original_id', 'labels', 'crawl_urls', 'citekey', 'original_citekey', 'imported', 'owner', 'attachments', 'journal_checked', 'created', 'subfolders', 'autoCleaned', 'dup_group_last', 'dup_group_first', 'owner_email', 'source_id', 'view_context_open', 'gs_bibtex', 'gs_cluster_id', 'duplicates', 'note', 'view_expanded', 'editing_note']
+    record = record_type(tuple(fields) if fields is not None else report_fields())
+
+    if is_bibliography(filename):
+        return [record(d) for d in read_publications(filename, tags=tags)]
+    if is_pubdb(filename):
+        with PubDB(filename) as db:
+            if authors is not None:
+                ids = set()
+                for key in authors:
+                    ids.update(db.author_ids(key))
+                if tags is not None:
+                    ids.intersection_update(db.tag_ids(tags))
+                return [record(db[i]) for i in sorted(ids)]
+            if tags is None:
+                return [record(db[i]) for i in range(len(db))]
+            return [record(db[i]) for i in db.tag_ids(tags)]
+    if is_sqlite(filename):
+        return [record(d) for d in iter_publications(filename, tags=tags)]
 
-    with open(filename, encoding='utf-8') as f:
-        data = json.load(f)
+    with open_data(filename) as f:
+        data = [record(csl_to_pub(d) if _is_csl(d) else d) for d in json.load(f)]
 
-    # Delete extraneous
-    for key in delete_keys:
-        for item in data:
-            item.pop(key, None)
     # If tags are supplied, then pubs without the tags are removed
     if tags is not None:
-        remove_list = []
-        for item in data:
-            if 'labelsNamed' in item and not any(i in tags for i in item.get('labelsNamed')):
-                remove_list.append(data.index(item))
-            elif 'labelsNamed' not in item:
-                remove_list.append(data.index(item))
-        for i in reversed(remove_list):
-            del data[i]
+        data = [item for item in data if any(i in tags for i in item.get('labelsNamed', []))]
 
     return data
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Writes the output files of a report.
+
+Once the statistics are computed the PDF and the CSV files don't
+depend on each other. With `parallel` set, the PDF is rendered in a
+separate process while the CSV files are written on a thread pool, so
+saving takes about as long as the PDF alone.
+
+The report is created by one of the `BACKENDS`: 'xhtml2pdf' lays out an
+HTML version of the report as PDF, 'reportlab' draws the PDF directly
+and is considerably faster for large reports, and 'html' writes a
+static HTML report to the 'pubstats_html' directory instead of a PDF.
+"""
+
+from .csv_write import csv1, csv2
+from .rollup import rollup_write
+from .cube import cube_write
+from .duplicates import dedup_report
+from .save import Save
+from .save_reportlab import SaveReportlab
+from .save_html import SaveHTML
+import concurrent.futures
+import os
+
+__all__ = ['save_report', 'BACKENDS']
+
+BACKENDS = {'xhtml2pdf': Save, 'reportlab': SaveReportlab, 'html': SaveHTML}
+_REPORT_FILES = {'xhtml2pdf': 'pubstats.pdf', 'reportlab': 'pubstats.pdf', 'html': 'pubstats_html'}
+
+def save_report(authors, data, translator, output_dir='.', parallel=False, backend='xhtml2pdf', cache_dir=None,
+                groups=False, cube=False, roster=None, roster_translator=None, duplicates=None):
+    """Saves report as PDF (or HTML) and 2 CSV files.
+
+    With `groups`, a third file, pubstats_groups.csv, has the statistics
+    of the groups of key authors, see `rollup`. With `cube`, the
+    publication counts by year and pair of institutions or disciplines
+    are saved to pubstats_cube.npz, see `cube`. With `duplicates`, the
+    merged publications are listed in pubstats_dedup.csv, see
+    `duplicates`.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    output_dir : str, optional
+        Directory the files are written to. (default is the current
+        directory)
+    parallel : bool, optional
+        True -> the files are written at the same time.
+        False -> the files are written one after another.
+        Default is False
+    backend : str, optional
+        Name of the report backend, see `BACKENDS`. (default is
+        xhtml2pdf)
+    cache_dir : str, optional
+        Directory of the cache of rendered sections, see ``Save``. Only
+        used by the xhtml2pdf backend. (default is None, which renders
+        the whole report)
+    groups : bool, optional
+        Also save pubstats_groups.csv. (default is False)
+    cube : bool, optional
+        Also save pubstats_cube.npz. (default is False)
+    roster, roster_translator : optional
+        All the key authors the statistics were computed over and their
+        translator, when `authors` is a part of them, see `rollups`.
+        (default is None, which means `authors` and `translator`)
+    duplicates : (dict of int: dict, list), optional
+        The publications merged as duplicates by their positions before
+        merging, and the groups of duplicates, see `dedup_report`.
+        (default is None, which doesn't save pubstats_dedup.csv)
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError('Unknown PDF backend: {}'.format(backend))
+    if cache_dir is not None and backend != 'xhtml2pdf':
+        raise ValueError('The fragment cache is only used by the xhtml2pdf backend')
+
+    pdf_file = os.path.join(output_dir, _REPORT_FILES[backend])
+    csv1_file = os.path.join(output_dir, 'pubstats1.csv')
+    csv2_file = os.path.join(output_dir, 'pubstats2.csv')
+    groups_file = os.path.join(output_dir, 'pubstats_groups.csv')
+    cube_file = os.path.join(output_dir, 'pubstats_cube.npz')
+    dedup_file = os.path.join(output_dir, 'pubstats_dedup.csv')
+    if not parallel:
+        csv1(authors, data, csv1_file)
+        csv2(authors, data, translator, csv2_file)
+        if groups:
+            rollup_write(authors, data, translator, groups_file, roster, roster_translator)
+        if cube:
+            cube_write(authors, data, translator, cube_file)
+        if duplicates is not None:
+            dedup_report(*duplicates, filename=dedup_file)
+        _save_pdf(authors, data, translator, pdf_file, backend, cache_dir)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pdf_pool:
+        pdf = pdf_pool.submit(_save_pdf, authors, data, translator, pdf_file, backend, cache_dir)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as csv_pool:
+            futures = [csv_pool.submit(csv1, authors, data, csv1_file),
+                       csv_pool.submit(csv2, authors, data, translator, csv2_file)]
+            if groups:
+                futures.append(csv_pool.submit(rollup_write, authors, data, translator, groups_file, roster,
+                                               roster_translator))
+            if cube:
+                futures.append(csv_pool.submit(cube_write, authors, data, translator, cube_file))
+            if duplicates is not None:
+                futures.append(csv_pool.submit(dedup_report, *duplicates, filename=dedup_file))
+        for future in futures + [pdf]:
+            # Re-raises any exception from the workers.
+            future.result()
+
+def _save_pdf(authors, data, translator, filename, backend, cache_dir=None):
+    """Creates the report without returning the ``Save`` object."""
+    if cache_dir is not None:
+        BACKENDS[backend](authors, data, translator, filename, cache_dir=cache_dir)
+    else:
+        BACKENDS[backend](authors, data, translator, filename)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Indexed, memory-mapped publication database.
+
+A pubstats database is a single file created from a PaperPile export.
+It is read through ``mmap`` so that only the records that are actually
+needed get decoded.
+
+File layout (all integers are little-endian):
+
+header
+    Fixed size, see `_HEADER`. Holds the magic bytes, the format
+    version, the record/author/tag counts and the offsets of every
+    section below.
+record table
+    ``n_records + 1`` unsigned 64-bit offsets into the record data.
+    Record ``i`` spans ``table[i]:table[i + 1]``.
+record data
+    One compact UTF-8 JSON object per publication.
+author table, tag table
+    Entries of `_ENTRY`, sorted by key: offset and length of the key in
+    the string pool, offset and length of its posting list.
+postings
+    Unsigned 32-bit record indices, ascending within each list.
+string pool
+    UTF-8 encoded author keys and tag names.
+
+Author keys are the values returned by `Helpers.key_from_name`.
+"""
+
+from .helpers import Helpers
+import json
+import mmap
+import struct
+
+__all__ = ['PubDB', 'convert', 'is_pubdb']
+
+_MAGIC = b'PSDB'
+_VERSION = 1
+# magic, version, flags, n_records, n_authors, n_tags, reserved, then the
+# offsets of the record table, record data, author table, tag table,
+# postings and string pool.
+_HEADER = struct.Struct('<4sHHIIII6Q')
+_ENTRY = struct.Struct('<IIQI')
+_OFFSET = struct.Struct('<Q')
+
+def is_pubdb(filename):
+    """Returns True if `filename` is a pubstats database.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file to test.
+
+    Returns
+    -------
+    bool
+        True if the file starts with the database magic bytes.
+    """
+
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(_MAGIC)) == _MAGIC
+    except (IOError, OSError):
+        return False
+
+def convert(data_file, db_file):
+    """Converts a PaperPile export to a pubstats database.
+
+    Parameters
+    ----------
+    data_file : str
+        Name of the PaperPile JSON file.
+    db_file : str
+        Name of the database file to create.
+    """
+
+    from .paperpile_reader import paperpile_reader
+
+    data = paperpile_reader(data_file)
+    authors = {}
+    tags = {}
+    records = []
+    for i, item in enumerate(data):
+        records.append(json.dumps(dict(item), separators=(',', ':')).encode('utf-8'))
+        keys = set()
+        for a in item.get('author', []):
+            key = Helpers.key_from_name(a.get('first'), a.get('last'))
+            if key is not None:
+                keys.add(key)
+        for key in keys:
+            authors.setdefault(key, []).append(i)
+        for tag in set(item.get('labelsNamed', [])):
+            tags.setdefault(tag, []).append(i)
+
+    strings = bytearray()
+    postings = bytearray()
+
+    def _table(index):
+        # Keys are sorted by their encoded bytes so lookups can bisect
+        # without decoding.
+        table = bytearray()
+        for key in sorted(k.encode('utf-8') for k in index):
+            ids = index[key.decode('utf-8')]
+            table += _ENTRY.pack(len(strings), len(key), len(postings), len(ids))
+            strings.extend(key)
+            postings.extend(struct.pack('<{}I'.format(len(ids)), *ids))
+        return table
+
+    author_table = _table(authors)
+    tag_table = _table(tags)
+
+    record_table = bytearray()
+    pos = 0
+    for r in records:
+        record_table += _OFFSET.pack(pos)
+        pos += len(r)
+    record_table += _OFFSET.pack(pos)
+
+    offsets = []
+    pos = _HEADER.size
+    for size in (len(record_table), sum(len(r) for r in records), len(author_table), len(tag_table), len(postings)):
+        offsets.append(pos)
+        pos += size
+    offsets.append(pos)
+
+    with open(db_file, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(records), len(authors), len(tags), 0, *offsets))
+        f.write(record_table)
+        for r in records:
+            f.write(r)
+        f.write(author_table)
+        f.write(tag_table)
+        f.write(postings)
+        f.write(strings)
+
+class PubDB():
+    """Read-only access to a pubstats database.
+
+    Records are decoded on access; the indices are searched in place
+    within the memory map.
+
+    Attributes
+    ----------
+    filename : str
+        Name of the database file.
+
+    Methods
+    -------
+    tag_ids(tags)
+        Record indices of publications with any of `tags`.
+    author_ids(key)
+        Record indices of publications with author `key`.
+    by_author(key)
+        Publications with author `key`.
+    close()
+        Closes the database.
+    """
+
+    def __init__(self, filename):
+        """
+        Parameters
+        ----------
+        filename : str
+            Name of the database file.
+        """
+
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._map, 0)
+        if header[0] != _MAGIC:
+            self.close()
+            raise ValueError('{} is not a pubstats database.'.format(filename))
+        if header[1] != _VERSION:
+            self.close()
+            raise ValueError('Unsupported pubstats database version: {}'.format(header[1]))
+        self._n_records, self._n_authors, self._n_tags = header[3:6]
+        (self._record_table, self._record_data, self._author_table,
+         self._tag_table, self._postings, self._strings) = header[7:]
+
+    def __len__(self):
+        return self._n_records
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._n_records
+        if not 0 <= i < self._n_records:
+            raise IndexError('record index out of range')
+        start, = _OFFSET.unpack_from(self._map, self._record_table + i * _OFFSET.size)
+        stop, = _OFFSET.unpack_from(self._map, self._record_table + (i + 1) * _OFFSET.size)
+        return json.loads(self._map[self._record_data + start:self._record_data + stop].decode('utf-8'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the database."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def tag_ids(self, tags):
+        """Returns indices of the records with any of the tags.
+
+        Parameters
+        ----------
+        tags : list of str
+            Tags from the 'labelsNamed' field.
+
+        Returns
+        -------
+        list of int
+            Ascending record indices.
+        """
+
+        ids = set()
+        for tag in tags:
+            ids.update(self._lookup(self._tag_table, self._n_tags, tag))
+        return sorted(ids)
+
+    def author_ids(self, key):
+        """Returns indices of the records with the author.
+
+        Parameters
+        ----------
+        key : str
+            Author key, as returned by `Helpers.key_from_name`.
+
+        Returns
+        -------
+        list of int
+            Ascending record indices.
+        """
+
+        return self._lookup(self._author_table, self._n_authors, key)
+
+    def by_author(self, key):
+        """Returns the publications with the author.
+
+        Parameters
+        ----------
+        key : str
+            Author key, as returned by `Helpers.key_from_name`.
+
+        Returns
+        -------
+        list of dict
+            The publications, in database order.
+        """
+
+        return [self[i] for i in self.author_ids(key)]
+
+    def _lookup(self, table, n, key):
+        """Binary searches an index table for `key`."""
+        key = key.encode('utf-8')
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            s_off, s_len, p_off, p_len = _ENTRY.unpack_from(self._map, table + mid * _ENTRY.size)
+            found = self._map[self._strings + s_off:self._strings + s_off + s_len]
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                start = self._postings + p_off
+                return list(struct.unpack_from('<{}I'.format(p_len), self._map, start))
+        return []
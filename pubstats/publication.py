@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Publication records.
+
+The statistics and the outputs declare the publication fields they use
+in a `FIELDS` attribute. The data readers keep only those fields (see
+`report_fields`), in `Publication` records with a slot per field
+instead of the dict of every field in the export.
+"""
+
+import functools
+
+__all__ = ['Publication', 'record_type', 'report_fields']
+
+# Set by format_data on every matched publication.
+_MATCHED = 'matched_authors'
+
+class Publication():
+    """A publication with a fixed set of fields.
+
+    Records support the parts of the ``dict`` interface used on
+    publications: ``pub['title']``, ``'title' in pub``, ``pub.get``,
+    assignment to one of the fields and ``dict(pub)``. A missing field
+    raises KeyError, as it would for a dict. Use `record_type` for the
+    class of a given set of fields.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, values=()):
+        for k, v in dict(values).items():
+            if k in self.FIELDS:
+                setattr(self, k, v)
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS and hasattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [k for k in self.FIELDS if hasattr(self, k)]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        try:
+            return dict(self) == dict(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __repr__(self):
+        return 'Publication({!r})'.format(dict(self))
+
+    def __reduce__(self):
+        # The record classes are created at run time.
+        return (_record, (self.FIELDS, dict(self)))
+
+@functools.lru_cache(maxsize=None)
+def record_type(fields):
+    """Returns the ``Publication`` class with slots for `fields`.
+
+    Parameters
+    ----------
+    fields : tuple of str
+        The publication fields. 'matched_authors' is always added.
+
+    Returns
+    -------
+    type
+        Subclass of ``Publication``.
+    """
+
+    fields = tuple(fields) + ((_MATCHED,) if _MATCHED not in fields else ())
+    return type('Publication', (Publication,), {'__slots__': fields, 'FIELDS': fields})
+
+def _record(fields, values):
+    """Unpickles a record."""
+    return record_type(fields)(values)
+
+def report_fields():
+    """Returns the fields declared by the statistics and the outputs.
+
+    Returns
+    -------
+    tuple of str
+        The union of the `FIELDS` of ``PubStats``, ``Meta``, ``Display``,
+        ``Save`` and `duplicates`, in declaration order.
+    """
+
+    from . import PubStats, duplicates
+    from .display import Display
+    from .meta import Meta
+    from .save import Save
+    fields = []
+    for user in (PubStats, Meta, Display, Save, duplicates):
+        fields.extend(f for f in user.FIELDS if f not in fields)
+    return tuple(fields)
@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Readers for BibTeX, RIS and CSL-JSON files.
+
+Each reader parses its file incrementally (one entry at a time) and
+yields publications in the shape of PaperPile's export: 'author' as a
+list of 'first' and 'last' names, 'title', 'journal', 'volume',
+'issue', 'pages', 'doi', 'published' with the 'year', 'labelsNamed'
+from the keywords and 'citekey' from the entry's key. The key is only
+unique within its file, so it is not used as PaperPile's '_id', which
+duplicates are matched on. Names are split so that
+`Helpers.key_from_name` gives the same key as for PaperPile's export:
+particles such as 'van' are part of the last name.
+
+The reader of a file is chosen by its extension, see `READERS`; any
+other file is read as a PaperPile export, pubstats database or SQLite
+store. A '.json' file can also be CSL-JSON, which is recognized by its
+entries. Several files can be read as one, in which case a publication
+whose DOI was already read is skipped.
+"""
+
+from .compression import base_name, open_data
+from .duplicates import normalize_doi
+from .lowmem import iter_publications as _iter_export, _iter_json_array
+import os
+import re
+import unicodedata
+
+__all__ = ['read_publications', 'iter_bibtex', 'iter_ris', 'iter_csl_json', 'split_name', 'READERS']
+
+_MONTHS = {m: m for m in ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')}
+# Combining characters of the LaTeX accent commands.
+_ACCENTS = {"'": '\u0301', '`': '\u0300', '^': '\u0302', '"': '\u0308', '~': '\u0303', '=': '\u0304',
+            '.': '\u0307', 'u': '\u0306', 'v': '\u030c', 'H': '\u030b', 'c': '\u0327', 'k': '\u0328'}
+_ACCENT = re.compile(r'\\([\'`^"~=.uvHck])\s*\{?\\?([A-Za-z])\}?')
+_SYMBOLS = [('\\&', '&'), ('\\%', '%'), ('\\$', '$'), ('\\_', '_'), ('\\ss', 'ß'), ('\\o', 'ø'),
+            ('\\O', 'Ø'), ('\\aa', 'å'), ('\\AA', 'Å'), ('\\ae', 'æ'), ('\\l', 'ł'), ('---', '—'), ('--', '–')]
+_FIELD = re.compile(r'[\s,]*([^\s=,{}()"#]+)\s*=\s*')
+_WORD = re.compile(r'[^\s,#})]+')
+_RIS_LINE = re.compile(r'^([A-Z][A-Z0-9])  -(?: (.*))?$')
+
+def read_publications(filenames, tags=None, chunk_size=1 << 20):
+    """Yields the publications of one or more data files.
+
+    Parameters
+    ----------
+    filenames : str or list of str
+        The data files, in any format of `READERS` or readable by
+        `paperpile_reader`.
+    tags : list of str, optional
+        Only yield publications with any of these tags. (default is
+        None, which means all)
+    chunk_size : int, optional
+        Characters read from a JSON file at a time. (default is 1 MiB)
+
+    Yields
+    ------
+    dict
+        The next publication. With several files, publications with the
+        DOI of a publication already yielded are skipped.
+    """
+
+    if isinstance(filenames, str):
+        filenames = [filenames]
+    seen = set()
+    for filename in filenames:
+        for pub in _read(filename, tags, chunk_size):
+            if len(filenames) > 1:
+                doi = normalize_doi(pub.get('doi'))
+                if doi in seen:
+                    continue
+                if doi:
+                    seen.add(doi)
+            yield pub
+
+def is_bibliography(filename):
+    """Returns True if `filename` is read by this module instead of as
+    a PaperPile export."""
+    return not isinstance(filename, str) or _extension(filename) in READERS
+
+def _read(filename, tags, chunk_size):
+    """Yields the publications of one file."""
+    ext = _extension(filename)
+    if ext not in READERS:
+        for pub in _iter_export(filename, tags=tags, chunk_size=chunk_size):
+            yield pub
+        return
+    with open_data(filename, encoding='utf-8-sig') as f:
+        for pub in READERS[ext](f):
+            if tags is None or any(i in tags for i in pub.get('labelsNamed', [])):
+                yield pub
+
+def _extension(filename):
+    """Extension of a file name, including '.csl.json', without a
+    compression extension."""
+    name = base_name(filename).lower()
+    if name.endswith('.csl.json'):
+        return '.csl.json'
+    return os.path.splitext(name)[1]
+
+def split_name(name):
+    """Splits a personal name into first and last names.
+
+    'Last, First', 'Last, Jr, First' and 'First von Last' are
+    recognized, as in BibTeX; lowercase particles ('van', 'de la')
+    start the last name.
+
+    Parameters
+    ----------
+    name : str
+        The name.
+
+    Returns
+    -------
+    dict
+        'last', and 'first' when the name has one.
+    """
+
+    name = ' '.join(name.split())
+    if ',' in name:
+        parts = [p.strip() for p in name.split(',')]
+        author = {'last': parts[0]}
+        if parts[-1]:
+            author['first'] = parts[-1]
+        return author
+    words = name.split(' ')
+    if len(words) == 1:
+        return {'last': name}
+    last = len(words) - 1
+    for i in range(1, len(words) - 1):
+        if words[i][:1].islower():
+            last = i
+            break
+    return {'first': ' '.join(words[:last]), 'last': ' '.join(words[last:])}
+
+def iter_bibtex(f):
+    """Yields the publications of a BibTeX file.
+
+    Entries are read one at a time, and must start at the beginning of
+    a line. @string macros are expanded; @comment and @preamble are
+    ignored.
+
+    Parameters
+    ----------
+    f : file
+        The open file.
+
+    Yields
+    ------
+    dict
+        The next publication.
+    """
+
+    macros = dict(_MONTHS)
+    lines = []
+    depth = 0
+    for line in f:
+        if not lines:
+            if not line.lstrip().startswith('@'):
+                continue
+            delimiter = re.match(r'\s*@\s*\w+\s*([{(])', line)
+            opening, closing = ('{', '}') if delimiter is None or delimiter.group(1) == '{' else ('(', ')')
+        lines.append(line)
+        depth += line.count(opening) - line.count(closing)
+        if depth > 0 or opening not in ''.join(lines):
+            continue
+        entry = _parse_bibtex(''.join(lines), macros)
+        lines = []
+        depth = 0
+        if entry is not None:
+            yield entry
+
+def _parse_bibtex(text, macros):
+    """Returns the publication of a BibTeX entry, or None for other
+    entries (@string macros are added to `macros`)."""
+    m = re.match(r'\s*@\s*(\w+)\s*[{(]', text)
+    if m is None:
+        return None
+    kind = m.group(1).lower()
+    if kind in ('comment', 'preamble'):
+        return None
+    pos = m.end()
+    key = None
+    if kind != 'string':
+        comma = text.find(',', pos)
+        if comma < 0:
+            return None
+        key = text[pos:comma].strip()
+        pos = comma + 1
+    fields = {}
+    while True:
+        m = _FIELD.match(text, pos)
+        if m is None:
+            break
+        name = m.group(1).lower()
+        pos = m.end()
+        parts = []
+        while pos < len(text):
+            if text[pos] == '{':
+                end = _closing(text, pos)
+                parts.append(text[pos + 1:end])
+                pos = end + 1
+            elif text[pos] == '"':
+                end = _closing(text, pos)
+                parts.append(text[pos + 1:end])
+                pos = end + 1
+            else:
+                word = _WORD.match(text, pos)
+                if word is None:
+                    break
+                parts.append(macros.get(word.group(0).lower(), word.group(0)))
+                pos = word.end()
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            if pos < len(text) and text[pos] == '#':
+                pos += 1
+                while pos < len(text) and text[pos].isspace():
+                    pos += 1
+                continue
+            break
+        fields[name] = ''.join(parts)
+    if kind == 'string':
+        macros.update(fields)
+        return None
+    pub = {'citekey': key, 'author': [_bibtex_name(n) for n in _split_authors(fields.get('author', ''))]}
+    for field, names in [('title', ('title',)), ('journal', ('journal', 'journaltitle', 'booktitle')),
+                         ('volume', ('volume',)), ('issue', ('number', 'issue')), ('pages', ('pages',)),
+                         ('doi', ('doi',))]:
+        for n in names:
+            if fields.get(n):
+                pub[field] = _latex(fields[n])
+                break
+    if 'pages' in pub:
+        pub['pages'] = pub['pages'].replace('–', '-')
+    year = re.search(r'\d{4}', fields.get('year') or fields.get('date') or '')
+    pub['published'] = {'year': year.group(0)} if year else {}
+    pub['labelsNamed'] = _keywords(_latex(fields.get('keywords', '')))
+    return pub
+
+def _closing(text, pos):
+    """Position of the brace or quote closing the one at `pos`."""
+    depth = 0
+    quote = text[pos] == '"'
+    for i in range(pos + 1 if quote else pos, len(text)):
+        c = text[i]
+        if c == '\\':
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0 and not quote:
+                return i
+        elif c == '"' and quote and depth == 0 and text[i - 1] != '\\':
+            return i
+    return len(text)
+
+def _split_authors(value):
+    """Splits a BibTeX name list on the 'and' outside braces."""
+    names = []
+    depth = 0
+    start = 0
+    for m in re.finditer(r'[{}]|\s+and\s+', value):
+        if m.group(0) == '{':
+            depth += 1
+        elif m.group(0) == '}':
+            depth -= 1
+        elif depth == 0:
+            names.append(value[start:m.start()])
+            start = m.end()
+    names.append(value[start:])
+    return [n.strip() for n in names if n.strip()]
+
+def _bibtex_name(name):
+    """Splits a BibTeX name; a name in braces is an organization."""
+    if name.startswith('{') and _closing(name, 0) == len(name) - 1:
+        return {'last': _latex(name)}
+    return split_name(_latex(name))
+
+def _latex(value):
+    """Converts the common LaTeX markup of a field to text."""
+    value = _ACCENT.sub(lambda m: unicodedata.normalize('NFC', m.group(2) + _ACCENTS[m.group(1)]), value)
+    for markup, text in _SYMBOLS:
+        value = value.replace(markup, text)
+    value = re.sub(r'\\[A-Za-z]+\s*', '', value)
+    value = value.replace('{', '').replace('}', '').replace('~', ' ')
+    return ' '.join(value.split())
+
+def _keywords(value):
+    """Splits a keyword list on commas or semicolons."""
+    return [k.strip() for k in re.split(r'[,;]', value) if k.strip()]
+
+def iter_ris(f):
+    """Yields the publications of a RIS file.
+
+    Parameters
+    ----------
+    f : file
+        The open file.
+
+    Yields
+    ------
+    dict
+        The next publication.
+    """
+
+    fields = None
+    tag = None
+    for line in f:
+        line = line.rstrip('\r\n')
+        m = _RIS_LINE.match(line)
+        if m is None:
+            # Continuation of the previous field.
+            if fields is not None and tag is not None and line.strip():
+                fields[tag][-1] += ' ' + line.strip()
+            continue
+        tag, value = m.group(1), (m.group(2) or '').strip()
+        if tag == 'TY':
+            fields = {}
+        if fields is None:
+            continue
+        if tag == 'ER':
+            yield _ris_pub(fields)
+            fields = None
+            tag = None
+            continue
+        fields.setdefault(tag, []).append(value)
+
+def _ris_pub(fields):
+    """Returns the publication of the fields of a RIS record."""
+
+    def _first(*tags):
+        for t in tags:
+            if fields.get(t) and fields[t][0]:
+                return fields[t][0]
+        return None
+
+    pub = {'author': [split_name(a) for a in fields.get('AU', []) + fields.get('A1', []) if a]}
+    for field, tags in [('citekey', ('ID',)), ('title', ('TI', 'T1')), ('journal', ('JO', 'JF', 'T2', 'JA', 'J2')),
+                        ('volume', ('VL',)), ('issue', ('IS',)), ('doi', ('DO',))]:
+        value = _first(*tags)
+        if value:
+            pub[field] = value
+    start, end = _first('SP'), _first('EP')
+    if start:
+        pub['pages'] = '{}-{}'.format(start, end) if end else start
+    year = re.search(r'\d{4}', _first('PY', 'Y1', 'DA') or '')
+    pub['published'] = {'year': year.group(0)} if year else {}
+    pub['labelsNamed'] = [k for kw in fields.get('KW', []) for k in _keywords(kw)]
+    return pub
+
+def iter_csl_json(f, chunk_size=1 << 20):
+    """Yields the publications of a CSL-JSON file.
+
+    Parameters
+    ----------
+    f : file
+        The open file.
+    chunk_size : int, optional
+        Characters read at a time. (default is 1 MiB)
+
+    Yields
+    ------
+    dict
+        The next publication.
+    """
+
+    for item in _iter_json_array(f, chunk_size):
+        yield csl_to_pub(item)
+
+def csl_to_pub(item):
+    """Returns the publication of a CSL-JSON item."""
+    pub = {'author': []}
+    for a in item.get('author', []):
+        if 'literal' in a:
+            pub['author'].append({'last': a['literal']})
+            continue
+        last = ' '.join(a[p] for p in ('dropping-particle', 'non-dropping-particle', 'family') if a.get(p))
+        author = {'last': last}
+        if a.get('given'):
+            author['first'] = a['given']
+        pub['author'].append(author)
+    for field, names in [('citekey', ('id',)), ('title', ('title',)), ('journal', ('container-title', 'container-title-short')),
+                         ('volume', ('volume',)), ('issue', ('issue', 'number')), ('pages', ('page',)),
+                         ('doi', ('DOI', 'doi'))]:
+        for n in names:
+            value = item.get(n)
+            if isinstance(value, list):
+                value = value[0] if value else None
+            if value:
+                pub[field] = str(value)
+                break
+    issued = item.get('issued') or {}
+    year = None
+    if issued.get('date-parts') and issued['date-parts'][0]:
+        year = str(issued['date-parts'][0][0])
+    else:
+        m = re.search(r'\d{4}', str(issued.get('raw') or issued.get('literal') or ''))
+        year = m.group(0) if m else None
+    pub['published'] = {'year': year} if year else {}
+    pub['labelsNamed'] = _keywords(item.get('keyword', ''))
+    return pub
+
+def _is_csl(item):
+    """Returns True if a JSON item is CSL-JSON rather than PaperPile."""
+    if 'published' in item:
+        return False
+    if 'issued' in item or 'container-title' in item:
+        return True
+    return any('family' in a or 'literal' in a for a in item.get('author', []))
+
+READERS = {'.bib': iter_bibtex, '.bibtex': iter_bibtex, '.ris': iter_ris, '.csl.json': iter_csl_json}
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Statistics of groups of key authors.
+
+The key authors are grouped by role, institution, department and
+discipline. A publication with 2 authors of a group counts once for the
+group, so 'publications' is usually less than 'member_publications',
+the sum of the members' totals.
+
+The author × publication membership is read once from the author lists,
+as arrays of (publication, author) pairs; every grouping maps the
+authors to groups and counts the distinct (publication, group) pairs
+with numpy.
+
+Columns
+-------
+grouping
+    'role', 'institution', 'department' or 'discipline'.
+group
+    The role, institution, etc. of the group.
+members
+    Number of key authors in the group.
+active_members
+    Number of them with publications in the report.
+publications
+    Distinct publications with an author of the group.
+member_publications
+    Sum of the members' total publications.
+multi_institute, multi_discipline
+    Distinct publications of the group that are from multiple
+    institutes or disciplines, as in the author statistics. These are
+    told from all the authors of the roster, which for a report limited
+    to some authors still has the other key authors of its
+    institutions.
+fractional
+    Sum of the members' fractional credit, see `credit`.
+"""
+
+from .csv_write import _file_write
+from .helpers import Helpers
+import numpy
+
+__all__ = ['rollups', 'membership', 'rollup_write', 'GROUPINGS']
+
+# Author attribute of every grouping.
+GROUPINGS = {'role': 'role', 'institution': 'inst', 'department': 'dept', 'discipline': 'disc'}
+_COLUMNS = ['members', 'active_members', 'publications', 'member_publications',
+            'multi_institute', 'multi_discipline', 'fractional']
+
+def membership(authors, data, translator):
+    """Returns the key authors of every publication.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        The position in `data` and the position in `authors` of every
+        (publication, key author) pair, each pair once.
+    """
+
+    codes = {k: i for i, k in enumerate(authors)}
+    pubs = []
+    members = []
+    for p, d in enumerate(data):
+        seen = set()
+        for a in d['author']:
+            key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), translator)
+            if key in codes and key not in seen:
+                seen.add(key)
+                pubs.append(p)
+                members.append(codes[key])
+    return numpy.array(pubs, dtype=numpy.intp), numpy.array(members, dtype=numpy.intp)
+
+def rollups(authors, data, translator, groupings=tuple(GROUPINGS), members=None, roster=None,
+            roster_translator=None):
+    """Computes the statistics of the groups of key authors.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    groupings : tuple of str, optional
+        The groupings, see `GROUPINGS`. (default is all of them)
+    members : (numpy.ndarray, numpy.ndarray), optional
+        The result of `membership`, if already computed. (default is
+        None)
+    roster : dict of str: Author, optional
+        The key authors whose institutions and disciplines make a
+        publication multi-institute or multi-discipline, as in the
+        author statistics. (default is None, which means `authors`)
+    roster_translator : dict of str: str, optional
+        The translator of `roster`. (default is None, which means
+        `translator`)
+
+    Returns
+    -------
+    dict of str: dict of str: dict
+        For every grouping, the columns of every group.
+    """
+
+    for grouping in groupings:
+        if grouping not in GROUPINGS:
+            raise ValueError('Unknown grouping: {}'.format(grouping))
+    keys = list(authors)
+    if not keys:
+        return {grouping: {} for grouping in groupings}
+    pubs, codes = members if members is not None else membership(authors, data, translator)
+    n_pubs = len(data)
+    totals = numpy.array([authors[k].get_len('pubs_author') for k in keys], dtype=numpy.int64)
+    fractional = numpy.array([authors[k].fractional for k in keys], dtype=numpy.float64)
+    # Publications from multiple institutes or disciplines, compared
+    # without case like Meta.
+    if roster is None:
+        roster, roster_keys, roster_pubs, roster_codes = authors, keys, pubs, codes
+    else:
+        roster_keys = list(roster)
+        roster_pubs, roster_codes = membership(roster, data, roster_translator or translator)
+    multi = {}
+    for attr in ('inst', 'disc'):
+        values, author_group = _codes(roster_keys, roster, attr, lower=True)
+        distinct = _distinct(roster_pubs, author_group[roster_codes], len(values))
+        multi[attr] = numpy.bincount(distinct // len(values), minlength=n_pubs) > 1
+    tables = {}
+    for grouping in groupings:
+        values, author_group = _codes(keys, authors, GROUPINGS[grouping])
+        n = len(values)
+        distinct = _distinct(pubs, author_group[codes], n)
+        group_pub = distinct // n
+        group = distinct % n
+        columns = {
+            'members': numpy.bincount(author_group, minlength=n),
+            'active_members': numpy.bincount(author_group, weights=totals > 0, minlength=n),
+            'publications': numpy.bincount(group, minlength=n),
+            'member_publications': numpy.bincount(author_group, weights=totals, minlength=n),
+            'multi_institute': numpy.bincount(group, weights=multi['inst'][group_pub], minlength=n),
+            'multi_discipline': numpy.bincount(group, weights=multi['disc'][group_pub], minlength=n),
+            'fractional': numpy.bincount(author_group, weights=fractional, minlength=n)}
+        tables[grouping] = {}
+        for i, value in enumerate(values):
+            row = {c: columns[c][i].item() for c in _COLUMNS}
+            for c in _COLUMNS[:-1]:
+                row[c] = int(row[c])
+            tables[grouping][value] = row
+    return tables
+
+def rollup_write(authors, data, translator, filename='pubstats_groups.csv', roster=None, roster_translator=None):
+    """Saves the statistics of the groups of key authors as CSV.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    filename : str, optional
+        The name of the file to write (default is pubstats_groups.csv).
+    roster, roster_translator : optional
+        See `rollups`. (default is None, which means `authors` and
+        `translator`)
+    """
+
+    output_data = [['grouping', 'group'] + _COLUMNS]
+    tables = rollups(authors, data, translator, roster=roster, roster_translator=roster_translator)
+    for grouping, table in tables.items():
+        for value, row in table.items():
+            output_data.append([grouping, value] + [row[c] if c != 'fractional' else round(row[c], 4)
+                                                     for c in _COLUMNS])
+    _file_write(filename, output_data)
+
+def _codes(keys, authors, attr, lower=False):
+    """Returns the distinct values of an author attribute, in key order,
+    and the code of every author's value."""
+    values = {}
+    author_group = []
+    for k in keys:
+        value = getattr(authors[k], attr)
+        if value is None:
+            value = ''
+        elif lower:
+            value = str(value).lower()
+        author_group.append(values.setdefault(value, len(values)))
+    return list(values), numpy.array(author_group, dtype=numpy.intp)
+
+def _distinct(pubs, groups, n):
+    """Returns the distinct (publication, group) pairs, coded as
+    publication * n + group."""
+    return numpy.unique(pubs * n + groups)
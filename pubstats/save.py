@@ -17,23 +17,52 @@
 # You should have received a copy of the GNU General Public License
 # along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
 
+from .credit import CREDITS
+from .fragments import FragmentCache
 from .helpers import Helpers
 import inspect
-import cgi
+import html
 import codecs
+import io
+import xhtml2pdf
 from xhtml2pdf import pisa
 
 class Save():
 
-    def __init__(self, authors, data, key):
+    # Publication fields used by the report.
+    FIELDS = ('author', 'title', 'journal', 'journalfull', 'volume', 'issue', 'pages', 'doi', 'published')
+    # Bibliography entries per cached PDF section.
+    CHUNK = 100
+    # Version of the cached fragments. Raise it with any change to how
+    # the sections are rendered, so older fragments aren't used.
+    CACHE_VERSION = 1
+    cache = None
+
+    def __init__(self, authors, data, key, filename='pubstats.pdf', cache_dir=None):
         """Creates PDF file.
 
         This class creates the PDF file for the statistics report. It starts
         by creating an HTML document then converting it to PDF with xhtml2pdf.
+        The report is written to `filename` (default is pubstats.pdf).
+
+        With `cache_dir`, the HTML of every author section and reference
+        and the PDF pages of every author section and of every `CHUNK`
+        references are kept in a `FragmentCache` there. Only the
+        sections whose inputs changed since a previous run are rendered
+        again, and the PDF is assembled from the cached pages, so every
+        author section starts on a new page.
         """
         self.authors = authors
         self.data = data
         self.key = key
+        self.filename = filename
+        if cache_dir is not None:
+            # Fragments of other versions of the report aren't used.
+            salt = 'Save {} xhtml2pdf {}'.format(self.CACHE_VERSION, xhtml2pdf.__version__)
+            self.cache = FragmentCache(cache_dir, salt)
+            self._bib_keys = {}
+            self._save_cached()
+            return
         # Add CSS
         self.print_string = Save._css()
         # First Section---Authors and Statistics
@@ -56,12 +85,12 @@ class Save():
         self.print_string = "<html>\n{}</html>".format(self.print_string)
         # Fix problem characters
         self._problem_characters()
-        with open('pubstats.pdf', 'w+b') as f:
+        with open(self.filename, 'w+b') as f:
             pisa.CreatePDF(codecs.encode(self.print_string, encoding='ascii', errors='xmlcharrefreplace'), dest=f)
 
     def _block_head(self, k):
         """Header---Author Name"""
-        self.print_string += "<h3>{} {}</h3>\n".format(self.authors[k].fi, cgi.escape(self.authors[k].last))
+        self.print_string += "<h3>{} {}</h3>\n".format(self.authors[k].fi, html.escape(self.authors[k].last))
 
     def _block_meta(self, k):
         """Author Statistcs Part"""
@@ -84,6 +113,8 @@ class Save():
                 self.print_string += "<tr>\n<td class='stats left'>multiple disciplines; single institute:</td><td class='stats right'>%d</td>\n</tr>\n" % (self.authors[k].get_len('pubs_multi_discipline_single_institute'))
             if self.authors[k].has_attr('cuca'):
                 self.print_string += "<tr>\n<td class='stats left'>cross-unit co-authorship:</td><td class='stats right'>%d</td>\n</tr>\n" % (getattr(self.authors[k], 'cuca'))
+            for name, label in CREDITS:
+                self.print_string += "<tr>\n<td class='stats left'>%s</td><td class='stats right'>%.2f</td>\n</tr>\n" % (label, getattr(self.authors[k], name))
             self.print_string += "</table>\n"
         # Else---they did not author any of the publications
         else:
@@ -116,7 +147,7 @@ class Save():
                 if self.authors[k].pub_is_in('pubs_multi_discipline_single_institute', p):
                     row[4] = '&#x25CF;'
                 # This is the actual formatted reference.
-                row[5] = "[{}] {}".format(p+1, self._formatted_bib(self.data[p]))
+                row[5] = "[{}] {}".format(p+1, self._bib(p))
                 # Total number of authors.
                 row[6] = len(self.data[p]['author'])
                 # Number of matched authors from key.
@@ -143,6 +174,74 @@ class Save():
         """Footer"""
         self.print_string += '\n'
 
+    def _save_cached(self):
+        """Assembles the PDF from cached sections."""
+        # The PDF library installed with xhtml2pdf: pypdf by recent
+        # versions, PyPDF2 by the version of requirements.txt.
+        try:
+            from pypdf import PdfWriter as PdfMerger
+        except ImportError:
+            from PyPDF2 import PdfFileMerger as PdfMerger
+        head = '<h1>Publication Statistics</h1>\n<h2>Authors</h2>\n'
+        sections = []
+        for i in self.authors.keys():
+            sections.append(head + self._section(i))
+            head = ''
+        if head:
+            sections.append(head)
+        for start in range(0, len(self.data), self.CHUNK):
+            body = '<h2>Bibliography</h2>\n' if start == 0 else ''
+            body += "<ol start='{}'>\n".format(start + 1)
+            for p in range(start, min(start + self.CHUNK, len(self.data))):
+                body += "<li>{}</li>\n".format(self._bib(p))
+            sections.append(body + "</ol>\n")
+        writer = PdfMerger()
+        for body in sections:
+            pdf = self.cache.binary(self.cache.key('pdf', body), lambda: self._render(body))
+            writer.append(io.BytesIO(pdf))
+        with open(self.filename, 'wb') as f:
+            writer.write(f)
+
+    def _section(self, k):
+        """Returns the HTML of the '_block' methods for author `k`."""
+
+        def _render():
+            self.print_string = ''
+            for item in inspect.getmembers(Save):
+                if item[0][0:6] == '_block':
+                    getattr(self, item[0])(k)
+            return self.print_string
+
+        author = vars(self.authors[k])
+        pubs = [(p, self._bib_key(p), len(self.data[p]['author']), self.data[p]['matched_authors'])
+                for p in getattr(self.authors[k], 'pubs_author', [])]
+        return self.cache.text(self.cache.key('section', author, pubs), _render)
+
+    def _bib(self, p):
+        """Returns the reference of publication `p`."""
+        if self.cache is None:
+            return self._formatted_bib(self.data[p])
+        return self.cache.text(self._bib_key(p), lambda: self._formatted_bib(self.data[p]))
+
+    def _bib_key(self, p):
+        """Returns the cache key of the reference of publication `p`:
+        its fields and which of its authors are key authors."""
+        if p not in self._bib_keys:
+            pub = self.data[p]
+            fields = {f: pub[f] for f in Save.FIELDS if f in pub}
+            highlight = [bool(Helpers.translated_key_from_name(a.get('first'), a.get('last'), self.key))
+                         for a in pub['author']]
+            self._bib_keys[p] = self.cache.key('bib', fields, highlight)
+        return self._bib_keys[p]
+
+    @staticmethod
+    def _render(body):
+        """Returns the PDF of an HTML section."""
+        document = "<html>\n{}<body>\n{}</body>\n</html>".format(Save._css(), Save._fix_characters(body))
+        out = io.BytesIO()
+        pisa.CreatePDF(codecs.encode(document, encoding='ascii', errors='xmlcharrefreplace'), dest=out)
+        return out.getvalue()
+
     def _formatted_bib(self, pub):
         """Format References.
 
@@ -191,6 +290,11 @@ class Save():
 
     def _problem_characters(self):
         """Fixes some problem characters"""
+        self.print_string = Save._fix_characters(self.print_string)
+
+    @staticmethod
+    def _fix_characters(string):
+        """Replaces sub- and superscript characters with markup."""
         issues = [['₁', '<sub>1</sub>'],
                   ['₂', '<sub>2</sub>'],
                   ['₃', '<sub>3</sub>'],
@@ -218,7 +322,8 @@ class Save():
                   ['⁻', '<sup>-</sup>']
                   ]
         for i in issues:
-            self.print_string = self.print_string.replace(i[0], i[1])
+            string = string.replace(i[0], i[1])
+        return string
 
     @staticmethod
     def _css():
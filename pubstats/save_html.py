@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+from .save import Save
+import html
+import inspect
+import os
+
+class SaveHTML(Save):
+
+    def __init__(self, authors, data, key, filename='pubstats_html', chunk=100):
+        """Creates a static HTML report.
+
+        The report is written to the directory `filename`: an index
+        page, one page per author built from the same blocks as the PDF,
+        and the bibliography split into pages of `chunk` publications.
+        Pages are written as soon as they are built.
+        """
+        self.authors = authors
+        self.data = data
+        self.key = key
+        self.filename = filename
+        if not os.path.isdir(self.filename):
+            os.makedirs(self.filename)
+        blocks = [item[0] for item in inspect.getmembers(Save) if item[0][0:6] == '_block']
+        with open(os.path.join(self.filename, 'index.html'), 'w', encoding='utf-8') as index:
+            index.write(self._page_head('Publication Statistics'))
+            index.write('<h1>Publication Statistics</h1>\n<h2>Authors</h2>\n<ul>\n')
+            # Each author page is written before its link.
+            for n, i in enumerate(self.authors.keys()):
+                self.print_string = ''
+                for block in blocks:
+                    getattr(self, block)(i)
+                page = 'author_{}.html'.format(n + 1)
+                name = html.escape('{} {}'.format(self.authors[i].fi, self.authors[i].last))
+                self._write_page(page, name, self.print_string)
+                index.write("<li><a href='{}'>{}</a> ({})</li>\n".format(page, name, self.authors[i].get_len('pubs_author')))
+            index.write('</ul>\n<h2>Bibliography</h2>\n<ul>\n')
+            for start in range(0, len(self.data), chunk):
+                stop = min(start + chunk, len(self.data))
+                page = 'bibliography_{}.html'.format(start // chunk + 1)
+                title = 'Bibliography {}&ndash;{}'.format(start + 1, stop)
+                self.print_string = "<h2>{}</h2>\n<ol start='{}'>\n".format(title, start + 1)
+                for d in self.data[start:stop]:
+                    self.print_string += "<li>{}</li>\n".format(self._formatted_bib(d))
+                self.print_string += "</ol>\n"
+                self._write_page(page, title, self.print_string)
+                index.write("<li><a href='{}'>{}</a></li>\n".format(page, title))
+            index.write('</ul>\n</body>\n</html>\n')
+
+    def _write_page(self, page, title, body):
+        """Writes one page of the report."""
+        self.print_string = "{}<p><a href='index.html'>index</a></p>\n{}</body>\n</html>\n".format(self._page_head(title), body)
+        self._problem_characters()
+        with open(os.path.join(self.filename, page), 'w', encoding='utf-8') as f:
+            f.write(self.print_string)
+
+    @staticmethod
+    def _page_head(title):
+        """Start of a page, up to the opening body tag."""
+        return "<!DOCTYPE html>\n<html>\n<head>\n<meta charset='utf-8'>\n<title>{}</title>\n{}\n</head>\n<body>\n".format(title, Save._css())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+from .credit import CREDITS
+from .helpers import Helpers
+from .publication import Publication
+from .save import Save
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
+from xml.sax.saxutils import escape
+
+# Helvetica has no filled circle, ZapfDingbats does.
+_MARK = "<font name='ZapfDingbats'>\u25cf</font>"
+
+class SaveReportlab(Save):
+
+    def __init__(self, authors, data, key, filename='pubstats.pdf'):
+        """Creates PDF file.
+
+        Draws the same report as ``Save`` directly with reportlab's
+        platypus flowables, without going through HTML. The report is
+        written to `filename` (default is pubstats.pdf).
+        """
+        self.authors = authors
+        self.data = data
+        self.key = key
+        self.filename = filename
+        self._init_styles()
+        self.story = [Paragraph('Publication Statistics', self.styles['h1']),
+                      Paragraph('Authors', self.styles['h2'])]
+        for i in self.authors.keys():
+            self._block_head(i)
+            self._block_meta(i)
+            self._block_pub(i)
+        self.story.append(Paragraph('Bibliography', self.styles['h2']))
+        for i, d in enumerate(self.data):
+            self.story.append(Paragraph(self._formatted_bib(d), self.styles['bib'], bulletText='{}.'.format(i + 1)))
+        doc = SimpleDocTemplate(self.filename, pagesize=A4, leftMargin=1.5 * cm, rightMargin=1.5 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm)
+        doc.build(self.story)
+
+    def _init_styles(self):
+        """Paragraph and table styles of the report."""
+        self.styles = getSampleStyleSheet()
+        self.styles.add(ParagraphStyle('cell', parent=self.styles['BodyText'], fontSize=8, leading=10))
+        self.styles.add(ParagraphStyle('bib', parent=self.styles['BodyText'], fontSize=9, leading=11, leftIndent=24, bulletIndent=0))
+        self.styles.add(ParagraphStyle('caption', parent=self.styles['BodyText'], fontName='Helvetica-Oblique', fontSize=8, leading=10, leftIndent=12))
+        self.stats_style = TableStyle([('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+                                       ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+                                       ('FONTSIZE', (0, 0), (-1, -1), 9),
+                                       ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+                                       ('TOPPADDING', (0, 0), (-1, -1), 1)])
+        self.pub_style = TableStyle([('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+                                     ('FONTSIZE', (0, 0), (-1, -1), 8),
+                                     ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                                     ('ALIGN', (0, 0), (4, -1), 'CENTER'),
+                                     ('ALIGN', (6, 0), (-1, -1), 'CENTER'),
+                                     ('ALIGN', (5, 0), (5, 0), 'CENTER'),
+                                     ('LEFTPADDING', (0, 0), (-1, -1), 2),
+                                     ('RIGHTPADDING', (0, 0), (-1, -1), 2)])
+
+    def _block_head(self, k):
+        """Header---Author Name"""
+        self.story.append(Paragraph(escape("{} {}".format(self.authors[k].fi, self.authors[k].last)), self.styles['h3']))
+
+    def _block_meta(self, k):
+        """Author Statistcs Part"""
+        # First check is to see if they authored any of the publications
+        if not self.authors[k].has_attr('pubs_author'):
+            self.story.append(Paragraph('no publications', self.styles['BodyText']))
+            return
+        rows = [['total publications:', self.authors[k].get_len('pubs_author')]]
+        for name, label in [('pubs_lead', 'lead author:'),
+                            ('pubs_multi_author', 'multiple SCRiM authors:'),
+                            ('pubs_multi_institute', 'from multiple institutes:'),
+                            ('pubs_multidisciplinary', 'from multiple disciplines:'),
+                            ('pubs_multi_institute_single_discipline', 'multiple institutes; single discipline:'),
+                            ('pubs_multi_discipline_single_institute', 'multiple disciplines; single institute:')]:
+            if self.authors[k].has_attr(name):
+                rows.append([label, self.authors[k].get_len(name)])
+        rows.append(['cross-unit co-authorship:', getattr(self.authors[k], 'cuca')])
+        for name, label in CREDITS:
+            rows.append([label, '%.2f' % getattr(self.authors[k], name)])
+        self.story.append(Table(rows, colWidths=[6 * cm, 1.5 * cm], style=self.stats_style, hAlign='LEFT'))
+
+    def _block_pub(self, k):
+        """Author Publications Part"""
+        # First check is to see if they authored any of the publications
+        if not self.authors[k].has_attr('pubs_author'):
+            return
+        self.story.append(Paragraph('Publications', self.styles['h4']))
+        rows = [['a', 'b', 'c', 'd', 'e', 'publication', 'n auth', 'scrim', 'non-scrim']]
+        # 'p' In this case is the list index of the publication.
+        for p in self.authors[k].pubs_author:
+            row = [''] * 9
+            for i, name in enumerate(['pubs_multi_author', 'pubs_multi_institute',
+                                      'pubs_multidisciplinary',
+                                      'pubs_multi_institute_single_discipline',
+                                      'pubs_multi_discipline_single_institute']):
+                if self.authors[k].pub_is_in(name, p):
+                    row[i] = Paragraph(_MARK, self.styles['cell'])
+            row[5] = Paragraph("[{}] {}".format(p + 1, self._formatted_bib(self.data[p])), self.styles['cell'])
+            row[6] = len(self.data[p]['author'])
+            row[7] = self.data[p]['matched_authors']
+            row[8] = row[6] - row[7]
+            rows.append(row)
+        self.story.append(Table(rows, colWidths=[0.6 * cm] * 5 + [10.5 * cm, 1.3 * cm, 1.2 * cm, 1.6 * cm], style=self.pub_style, repeatRows=1, hAlign='LEFT'))
+        # Add a caption below the table.
+        self.story.append(Spacer(1, 4))
+        for caption in ['a. multiple SCRiM authors', 'b. multiple institutes',
+                        'c. multiple disciplines',
+                        'd. multiple institutes; single discipline',
+                        'e. multiple disciplines; single institute']:
+            self.story.append(Paragraph(caption, self.styles['caption']))
+
+    def _formatted_bib(self, pub):
+        """Format References as paragraph markup."""
+        return Save._fix_characters(Save._formatted_bib(self, _escaped(pub)))
+
+    def _formatted_author(self, author):
+        """Format author name in references."""
+        auth_list = []
+        for a in author:
+            if 'first' in a and 'last' in a:
+                formatted_name = "{} {}".format(a['first'], a['last'])
+            elif 'last' in a:
+                formatted_name = "{}".format(a['last'])
+            else:
+                formatted_name = "{}".format('n/a')
+            if Helpers.translated_key_from_name(a.get('first'), a.get('last'), self.key):
+                formatted_name = "<span backColor='#FFFF00'>{}</span>".format(formatted_name)
+            auth_list.append(formatted_name)
+        return ', '.join(auth_list)
+
+def _escaped(value):
+    """Returns `value` with every string escaped for paragraph markup."""
+    if isinstance(value, str):
+        return escape(value)
+    if isinstance(value, (dict, Publication)):
+        return {k: _escaped(value[k]) for k in value.keys()}
+    if isinstance(value, list):
+        return [_escaped(v) for v in value]
+    return value
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Local report service.
+
+Keeps a ``PubStats`` report in memory and answers JSON queries over
+HTTP, on a TCP port or a Unix socket. Before each query the modification
+times of the key and data files are checked; a changed key is re-read
+and matched against the already parsed publications, and a changed data
+file is parsed again. A file that can't be read, e.g. one still being
+written, leaves the last report in place; /status shows the error, and
+the files are tried again at the next query.
+
+Queries
+-------
+GET /status
+    Input files, load time and size of the report, and the error of the
+    last reload if it failed.
+GET /authors
+    Statistics of every key author.
+GET /authors/<key>
+    Statistics and publication numbers of one author.
+GET /summary
+    Number of publications and author statistics.
+GET /bibliography?start=1&stop=100
+    Formatted references `start` to `stop` (inclusive, numbered as in
+    the report).
+
+/summary and /bibliography take the filters 'tags' and 'institutions'
+(comma separated) and 'year_from' and 'year_to'. Every response has an
+'elapsed_ms' field with the time taken to answer the query.
+
+Examples
+--------
+>>> server = serve('key.csv', 'paperpile.json', port=8000)
+>>> query('/authors/jdoe', port=8000)
+"""
+
+from .bibliography import TextBibliography
+import copy
+import http.client
+import http.server
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import urllib.parse
+
+__all__ = ['serve', 'query', 'Service']
+
+class Service():
+
+    def __init__(self, key_file, data_file, tags=None):
+        """Loads the report served by `serve`.
+
+        Parameters
+        ----------
+        key_file : str
+            Filename for the author key file.
+        data_file : str or list of str
+            Filename for the publication database, or a list of them.
+        tags : list of str, optional
+            Tags of the report. (default is None, which means all
+            publications)
+        """
+        from . import PubStats
+        self.key_file = key_file
+        self.data_file = data_file
+        self.lock = threading.Lock()
+        self.mtimes = self._mtimes()
+        self.rep = PubStats(key_file, data_file, tags=tags)
+        self.loaded = time.time()
+        self.error = None
+        self._bib = TextBibliography()
+        # Subsets of the report by filter values, dropped on reload.
+        self._subsets = {}
+
+    def handle(self, path):
+        """Answers a query.
+
+        Parameters
+        ----------
+        path : str
+            Request path, with query string.
+
+        Returns
+        -------
+        (int, dict)
+            HTTP status and response.
+        """
+        start = time.perf_counter()
+        url = urllib.parse.urlsplit(path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        parts = [p for p in url.path.split('/') if p]
+        with self.lock:
+            self._check()
+            try:
+                status, response = self._answer(parts, params)
+            except ValueError as err:
+                status, response = 400, {'error': str(err)}
+        response['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return status, response
+
+    def _answer(self, parts, params):
+        """Returns the status and response for the path `parts`."""
+        if parts == ['status']:
+            return 200, {'key_file': self.key_file, 'data_file': self.data_file,
+                         'loaded': self.loaded, 'publications': len(self.rep.formatted),
+                         'authors': len(self.rep.authors), 'error': self.error}
+        if parts == ['authors']:
+            return 200, {'authors': self._authors(self.rep)}
+        if len(parts) == 2 and parts[0] == 'authors':
+            key = urllib.parse.unquote(parts[1])
+            if key not in self.rep.authors:
+                return 404, {'error': 'Unknown author: {}'.format(key)}
+            return 200, self.rep.author_stats(key)
+        if parts == ['summary']:
+            rep = self._subset(params)
+            return 200, {'publications': len(rep.formatted),
+                         'authors': self._authors(rep)}
+        if parts == ['bibliography']:
+            rep = self._subset(params)
+            first = int(params.get('start', 1))
+            last = int(params.get('stop', len(rep.formatted)))
+            entries = [{'n': p + 1, 'reference': self._bib.format(rep.formatted[p])}
+                       for p in range(max(first, 1) - 1, min(last, len(rep.formatted)))]
+            return 200, {'total': len(rep.formatted), 'entries': entries}
+        return 404, {'error': 'Unknown query: /{}'.format('/'.join(parts))}
+
+    def _subset(self, params):
+        """Returns the report for the filters in `params`."""
+        tags = params.get('tags')
+        institutions = params.get('institutions')
+        year_from = params.get('year_from')
+        year_to = params.get('year_to')
+        filters = (tags, institutions, year_from, year_to)
+        if not any(filters):
+            return self.rep
+        if filters not in self._subsets:
+            self._subsets[filters] = self.rep.subset(
+                tags=tags.split(',') if tags else None,
+                institutions=institutions.split(',') if institutions else None,
+                year_from=int(year_from) if year_from else None,
+                year_to=int(year_to) if year_to else None)
+        return self._subsets[filters]
+
+    @staticmethod
+    def _authors(rep):
+        """Statistics of every author of `rep`, without their
+        publications."""
+        authors = []
+        for key in rep.authors:
+            stats = rep.author_stats(key)
+            del stats['publications']
+            authors.append(stats)
+        return authors
+
+    def _mtimes(self):
+        """Modification times of the key file and the data files."""
+        data_files = self.data_file if isinstance(self.data_file, (list, tuple)) else [self.data_file]
+        return (os.stat(self.key_file).st_mtime_ns, tuple(os.stat(f).st_mtime_ns for f in data_files))
+
+    def _check(self):
+        """Reloads the changed input files.
+
+        A copy of the report, with its own copies of the publications
+        when only the key changed, is reloaded, so the served report is
+        only replaced once the files are read. Otherwise the error is kept for
+        /status, and the modification times aren't updated so the files
+        are read again at the next query.
+        """
+        try:
+            mtimes = self._mtimes()
+            if mtimes == self.mtimes:
+                return
+            data = mtimes[1] != self.mtimes[1]
+            rep = copy.copy(self.rep)
+            if not data and rep.data is not None:
+                # Matching the new key sets 'matched_authors' on the
+                # publications, which the served report shares.
+                rep.data = [dict(d) for d in rep.data]
+            rep.reload(key=mtimes[0] != self.mtimes[0], data=data)
+        except Exception as err:
+            # Any error of the readers, e.g. of a file being written.
+            self.error = '{}: {}'.format(type(err).__name__, err)
+            return
+        self.rep = rep
+        self.mtimes = mtimes
+        self.loaded = time.time()
+        self.error = None
+        self._subsets = {}
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        status, response = self.server.service.handle(self.path)
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address.
+        return self.client_address[0] if self.client_address else 'local'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            http.server.BaseHTTPRequestHandler.log_message(self, format, *args)
+
+class _TCPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = self.socket.accept()
+        return request, ('local', 0)
+
+def serve(key_file, data_file, tags=None, host='127.0.0.1', port=8000, socket_path=None, verbose=False, background=False):
+    """Serves the report.
+
+    Parameters
+    ----------
+    key_file : str
+        Filename for the author key file.
+    data_file : str or list of str
+        Filename for the publication database, or a list of them.
+    tags : list of str, optional
+        Tags of the report. (default is None)
+    host : str, optional
+        Address to listen on. (default is 127.0.0.1)
+    port : int, optional
+        Port to listen on. (default is 8000)
+    socket_path : str, optional
+        Listen on this Unix socket instead of a TCP port. (default is
+        None)
+    verbose : bool, optional
+        Log every request to standard error. (default is False)
+    background : bool, optional
+        Serve from a daemon thread and return the server. (default is
+        False, which serves until interrupted)
+
+    Returns
+    -------
+    socketserver.BaseServer
+        The server, when `background` is set. Stop it with
+        ``shutdown()``.
+    """
+
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixServer(socket_path, _Handler)
+    else:
+        server = _TCPServer((host, port), _Handler)
+    server.service = Service(key_file, data_file, tags=tags)
+    server.verbose = verbose
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path is not None:
+            os.remove(socket_path)
+
+class _UnixConnection(http.client.HTTPConnection):
+
+    def __init__(self, socket_path):
+        http.client.HTTPConnection.__init__(self, 'localhost')
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+def query(path, host='127.0.0.1', port=8000, socket_path=None, **params):
+    """Queries a running service.
+
+    Parameters
+    ----------
+    path : str
+        Query path, e.g. '/authors'.
+    host : str, optional
+        Address of the service. (default is 127.0.0.1)
+    port : int, optional
+        Port of the service. (default is 8000)
+    socket_path : str, optional
+        Unix socket of the service, instead of `host` and `port`.
+        (default is None)
+    **params
+        Query parameters, e.g. ``tags='label1,label2'``.
+
+    Returns
+    -------
+    dict
+        The response. Errors are returned as {'error': message}.
+    """
+
+    if params:
+        path = '{}?{}'.format(path, urllib.parse.urlencode(params))
+    if socket_path is not None:
+        conn = _UnixConnection(socket_path)
+    else:
+        conn = http.client.HTTPConnection(host, port)
+    try:
+        conn.request('GET', path)
+        return json.loads(conn.getresponse().read().decode('utf-8'))
+    finally:
+        conn.close()
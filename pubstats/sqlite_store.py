@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""SQLite store of a report.
+
+Tables
+------
+key (first, last, role, institution, field, department, alias)
+    The author key, as read from the key file.
+authors (key, first, last, role, inst, disc, dept, alias, cuca)
+    The key authors of the report.
+publications (id, year, title, journal, doi, record)
+    The publications of the report. `id` is the index used in the
+    statistics (the reports show id + 1), `record` the JSON record.
+authorship (pub_id, position, first, last, author_key)
+    Every author of every publication; `author_key` is set for key
+    authors.
+tags (pub_id, tag)
+    The 'labelsNamed' tags of the publications.
+stats (author_key, pub_id, stat)
+    One row per entry of the authors' 'pubs_<str>' statistics lists.
+
+The `pub_summary` view holds the number of matched authors, institutions
+and disciplines of each publication. `STAT_QUERIES` expresses the
+``Meta`` statistics as queries over `authorship` and `pub_summary`, and
+`sqlite_verify` checks them against the stored statistics.
+
+A store can be used as both the key file and the data file of
+``PubStats``.
+"""
+
+from .helpers import Helpers
+import json
+import sqlite3
+
+__all__ = ['sqlite_write', 'sqlite_verify', 'is_sqlite', 'STAT_QUERIES']
+
+_MAGIC = b'SQLite format 3\x00'
+
+_SCHEMA = """
+CREATE TABLE key (first TEXT, last TEXT, role TEXT, institution TEXT,
+                  field TEXT, department TEXT, alias TEXT);
+CREATE TABLE authors (key TEXT PRIMARY KEY, first TEXT, last TEXT,
+                      role INTEGER, inst TEXT, disc TEXT, dept TEXT,
+                      alias TEXT, cuca INTEGER);
+CREATE TABLE publications (id INTEGER PRIMARY KEY, year INTEGER,
+                           title TEXT, journal TEXT, doi TEXT,
+                           record TEXT);
+CREATE TABLE authorship (pub_id INTEGER, position INTEGER, first TEXT,
+                         last TEXT, author_key TEXT);
+CREATE TABLE tags (pub_id INTEGER, tag TEXT);
+CREATE TABLE stats (author_key TEXT, pub_id INTEGER, stat TEXT);
+CREATE INDEX publications_year ON publications (year);
+CREATE INDEX authorship_pub ON authorship (pub_id);
+CREATE INDEX authorship_author ON authorship (author_key, pub_id);
+CREATE INDEX tags_tag ON tags (tag, pub_id);
+CREATE INDEX stats_author ON stats (author_key, stat);
+CREATE VIEW pub_summary AS
+    SELECT a.pub_id AS pub_id,
+           COUNT(*) AS n_matched,
+           COUNT(DISTINCT LOWER(au.inst)) AS n_inst,
+           COUNT(DISTINCT LOWER(au.disc)) AS n_disc
+    FROM authorship a JOIN authors au ON au.key = a.author_key
+    GROUP BY a.pub_id;
+"""
+
+# Each query returns (author_key, count) rows. Like ``Meta``, an author
+# listed twice on a publication is counted twice.
+_COUNT = """
+    SELECT a.author_key, {}
+    FROM authorship a JOIN pub_summary s ON s.pub_id = a.pub_id
+    WHERE a.author_key IS NOT NULL AND {}
+    GROUP BY a.author_key
+"""
+STAT_QUERIES = {
+    'pubs_author': _COUNT.format('COUNT(*)', '1'),
+    'pubs_lead': _COUNT.format('COUNT(*)', 'a.position = 0'),
+    'pubs_coauthor': _COUNT.format('COUNT(*)', 'a.position > 0'),
+    'pubs_multi_author': _COUNT.format('COUNT(*)', 's.n_matched > 1'),
+    'pubs_multi_institute': _COUNT.format('COUNT(*)', 's.n_inst > 1'),
+    'pubs_multidisciplinary': _COUNT.format('COUNT(*)', 's.n_disc > 1'),
+    'pubs_multi_institute_single_discipline': _COUNT.format('COUNT(*)', 's.n_inst > 1 AND s.n_disc = 1'),
+    'pubs_multi_discipline_single_institute': _COUNT.format('COUNT(*)', 's.n_disc > 1 AND s.n_inst = 1'),
+    'cuca': _COUNT.format('SUM(s.n_disc - 1)', '1'),
+}
+
+def is_sqlite(filename):
+    """Returns True if `filename` is an SQLite database.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file to test.
+
+    Returns
+    -------
+    bool
+        True if the file starts with the SQLite header.
+    """
+
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(_MAGIC)) == _MAGIC
+    except (IOError, OSError):
+        return False
+
+def sqlite_write(authors, data, translator, filename, key_data=None):
+    """Saves the report to an SQLite store.
+
+    All rows are inserted with ``executemany`` in a single transaction.
+    An existing store is replaced.
+
+    Parameters
+    ----------
+    authors : dict of str: Author
+        The dictionary of Author objects created in PubStats.
+    data : list of dict
+        The publication data created in PubStats
+    translator : dict of str: str
+        Dictionay of formatted names to unique keys for authors.
+    filename : str
+        Name of the database file.
+    key_data : list of dict, optional
+        The rows of the key file, so the store can be read back as a key
+        file. (default is None)
+    """
+
+    conn = sqlite3.connect(filename)
+    try:
+        with conn:
+            for table in ('key', 'authors', 'publications', 'authorship', 'tags', 'stats'):
+                conn.execute('DROP TABLE IF EXISTS {}'.format(table))
+            conn.execute('DROP VIEW IF EXISTS pub_summary')
+            conn.executescript('BEGIN;' + _SCHEMA)
+            conn.executemany('INSERT INTO key VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             ([row.get(c) for c in ('first', 'last', 'role', 'institution', 'field', 'department', 'alias')]
+                              for row in key_data or []))
+            conn.executemany('INSERT INTO authors VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                             ((k, a.fi, a.last, a.role, a.inst, a.disc, a.dept, a.alias, a.cuca)
+                              for k, a in authors.items()))
+            conn.executemany('INSERT INTO publications VALUES (?, ?, ?, ?, ?, ?)',
+                             ((i, _year(d), d.get('title'), d.get('journal', d.get('journalfull')), d.get('doi'), json.dumps(dict(d)))
+                              for i, d in enumerate(data)))
+            conn.executemany('INSERT INTO authorship VALUES (?, ?, ?, ?, ?)',
+                             ((i, n, a.get('first'), a.get('last'),
+                               Helpers.translated_key_from_name(a.get('first'), a.get('last'), translator))
+                              for i, d in enumerate(data) for n, a in enumerate(d['author'])))
+            conn.executemany('INSERT INTO tags VALUES (?, ?)',
+                             ((i, tag) for i, d in enumerate(data) for tag in d.get('labelsNamed', [])))
+            conn.executemany('INSERT INTO stats VALUES (?, ?, ?)',
+                             ((k, p, stat) for k, a in authors.items()
+                              for stat, pubs in vars(a).items() if stat[0:4] == 'pubs'
+                              for p in pubs))
+    finally:
+        conn.close()
+
+def sqlite_verify(filename):
+    """Checks the stored statistics against `STAT_QUERIES`.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the database file.
+
+    Returns
+    -------
+    dict of str: list
+        For every statistic with differences, a list of (author key,
+        stored count, query count). Empty if everything matches.
+    """
+
+    conn = sqlite3.connect(filename)
+    try:
+        differences = {}
+        keys = [row[0] for row in conn.execute('SELECT key FROM authors')]
+        for stat, query in STAT_QUERIES.items():
+            computed = dict(conn.execute(query).fetchall())
+            if stat == 'cuca':
+                stored = dict(conn.execute('SELECT key, cuca FROM authors').fetchall())
+            else:
+                stored = dict(conn.execute('SELECT author_key, COUNT(*) FROM stats WHERE stat = ? GROUP BY author_key', (stat,)).fetchall())
+            rows = [(k, stored.get(k, 0), computed.get(k, 0)) for k in keys
+                    if stored.get(k, 0) != computed.get(k, 0)]
+            if rows:
+                differences[stat] = rows
+        return differences
+    finally:
+        conn.close()
+
+def read_key(filename):
+    """Returns the key table of a store as rows, header first, like
+    ``key_reader``."""
+    conn = sqlite3.connect(filename)
+    try:
+        cursor = conn.execute('SELECT first, last, role, institution, field, department, alias FROM key ORDER BY rowid')
+        data = [[c[0] for c in cursor.description]]
+        data.extend([v if v is not None else '' for v in row] for row in cursor)
+        return data
+    finally:
+        conn.close()
+
+def read_publications(filename, tags=None):
+    """Returns the publications of a store, like ``paperpile_reader``.
+
+    With `tags`, only the publications with any of the tags are read,
+    using the tag index.
+    """
+    return list(iter_publications(filename, tags=tags))
+
+def iter_publications(filename, tags=None):
+    """Yields the publications of a store one at a time. See
+    `read_publications`."""
+    conn = sqlite3.connect(filename)
+    try:
+        if tags is None:
+            cursor = conn.execute('SELECT record FROM publications ORDER BY id')
+        else:
+            cursor = conn.execute('SELECT record FROM publications WHERE id IN (SELECT pub_id FROM tags WHERE tag IN ({})) ORDER BY id'.format(', '.join('?' * len(tags))), list(tags))
+        for row in cursor:
+            d = json.loads(row[0])
+            # Recomputed by format_data.
+            d.pop('matched_authors', None)
+            yield d
+    finally:
+        conn.close()
+
+def _year(pub):
+    """Publication year as an int, or None."""
+    try:
+        return int(pub['published']['year'])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Plain-text tables for the terminal report.
+
+These produce the same layout as the PrettyTable tables the report
+used to be built with, but only for pubstats' 2 table layouts. Cells
+are passed in already wrapped, together with their width, so the only
+measuring left is a ``max`` over the rows.
+"""
+
+__all__ = ['pub_table', 'bib_table', 'PUB_HEAD']
+
+PUB_HEAD = [' 1 ', ' 2 ', ' 3 ', ' 4 ', ' 5 ', 'bib', 'n auth', 'scrim', 'non-scrim']
+
+def pub_table(rows):
+    """Returns the publications table of an author.
+
+    Parameters
+    ----------
+    rows : list of tuple
+        One tuple per publication: a list of the 5 flag cells, the
+        wrapped bibliography lines, the width of the widest of those
+        lines, and the number of authors, key authors and non-key
+        authors.
+
+    Returns
+    -------
+    str
+        The table, with a rule between rows.
+    """
+
+    widths = [len(h) for h in PUB_HEAD]
+    cells = []
+    for flags, lines, width, n_auth, scrim, non_scrim in rows:
+        nums = [str(n_auth), str(scrim), str(non_scrim)]
+        if width > widths[5]:
+            widths[5] = width
+        for i, n in enumerate(nums):
+            if len(n) > widths[6 + i]:
+                widths[6 + i] = len(n)
+        cells.append((flags, lines or [''], nums))
+    rule = '+{}+'.format('+'.join('-' * (w + 2) for w in widths))
+    blank = [''] * 5
+    output = [rule, _bordered(PUB_HEAD, widths), rule]
+    for flags, lines, nums in cells:
+        output.append(_bordered(flags + [lines[0]] + nums, widths))
+        for line in lines[1:]:
+            output.append(_bordered(blank + [line] + blank[:3], widths))
+        output.append(rule)
+    return '\n'.join(output)
+
+def bib_table(rows):
+    """Returns the bibliography table.
+
+    Parameters
+    ----------
+    rows : list of tuple
+        One tuple per publication: its number, the wrapped bibliography
+        lines and the width of the widest of those lines.
+
+    Returns
+    -------
+    str
+        The left-aligned table, without header or border.
+    """
+
+    n_width = 1
+    bib_width = 3
+    for n, lines, width in rows:
+        n_width = max(n_width, len(str(n)))
+        bib_width = max(bib_width, width)
+    blank = ' ' * (n_width + 2)
+    output = []
+    for n, lines, width in rows:
+        lines = lines or ['']
+        output.append(' {} '.format(str(n).ljust(n_width)) + ' {} '.format(lines[0].ljust(bib_width)))
+        for line in lines[1:]:
+            output.append(blank + ' {} '.format(line.ljust(bib_width)))
+    return '\n'.join(output)
+
+def _bordered(cells, widths):
+    """Returns one centered line of a bordered table."""
+    return '|{}|'.format('|'.join(' {} '.format(c.center(w)) for c, w in zip(cells, widths)))
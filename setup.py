@@ -42,7 +42,7 @@ setup(
     ],
     author='Randy Miller',
     entry_points={
-        'console_scripts': ['pubstats-display=pubstats.command_line:display', 'pubstats-save=pubstats.command_line:save'],
+        'console_scripts': ['pubstats-display=pubstats.command_line:display', 'pubstats-save=pubstats.command_line:save', 'pubstats-convert=pubstats.command_line:convert', 'pubstats-batch=pubstats.command_line:batch', 'pubstats-serve=pubstats.command_line:serve', 'pubstats-annotations=pubstats.command_line:annotations', 'pubstats-cube=pubstats.command_line:cube', 'pubstats-diff=pubstats.command_line:diff'],
     },
     author_email='rsm5139@psu.edu',
     include_package_data=True
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Input files for the tests and benchmark.py.
+
+fake_corpus()
+    A key and data file made of copies of the fake data.
+write_corpus()
+    A key and data file of given authors and publications.
+peak_rss()
+    Peak memory use of a report built in a new interpreter.
+"""
+
+import csv
+import json
+import os
+import pubstats
+import subprocess
+import sys
+
+__all__ = ['fake_corpus', 'write_corpus', 'peak_rss']
+
+def fake_corpus(directory, scale):
+    """Writes a key and data file `scale` times the size of the fake
+    data, and returns their names."""
+    with open(pubstats._key_file, encoding='utf-8') as f:
+        key = list(csv.reader(f))
+    with open(pubstats._data_file, encoding='utf-8') as f:
+        data = json.load(f)
+    # Aliases are renamed too, since they identify the author.
+    columns = [key[0].index(c) for c in ('last', 'alias') if c in key[0]]
+    new_key = [key[0]]
+    new_data = []
+    for n in range(scale):
+        for row in key[1:]:
+            row = list(row)
+            for c in columns:
+                if row[c]:
+                    row[c] = '{}{}'.format(row[c], n)
+            new_key.append(row)
+        for pub in data:
+            pub = dict(pub)
+            pub['author'] = [dict(a, last='{}{}'.format(a.get('last'), n)) for a in pub['author']]
+            new_data.append(pub)
+    return write_corpus(directory, new_key, new_data)
+
+def write_corpus(directory, key, data):
+    """Writes the rows of a key file (header included) and the
+    publications of a data file, and returns their names."""
+    key_file = os.path.join(directory, 'key.csv')
+    data_file = os.path.join(directory, 'data.json')
+    with open(key_file, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(key)
+    with open(data_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return key_file, data_file
+
+# Peak RSS of a fresh interpreter building and displaying the report.
+_PEAK_RSS = """
+import os, resource, sys
+import pubstats
+budget = float(sys.argv[3]) if len(sys.argv) > 3 else None
+if sys.argv[1] != '-':
+    rep = pubstats.PubStats(sys.argv[1], sys.argv[2], memory_budget=budget)
+    with open(os.devnull, 'w') as out:
+        pubstats.Display(rep.authors, rep.formatted, rep.translate, out=out)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def peak_rss(key_file, data_file, memory_budget=None):
+    """Returns the peak RSS in MiB of the report run in a new process,
+    or of the imports only when `key_file` and `data_file` are '-'."""
+    args = [key_file, data_file] + ([str(memory_budget)] if memory_budget else [])
+    # The same pubstats as this process's, installed or not.
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(pubstats.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    output = subprocess.check_output([sys.executable, '-c', _PEAK_RSS] + args, env=env)
+    return int(output) / 1024
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Authorship credit."""
+
+import unittest
+
+from pubstats.author import Author
+from pubstats.credit import credit, CREDITS
+from pubstats.helpers import Helpers
+
+NAMES = [('Ann', 'Lee'), ('Bob', 'Kim'), ('Cat', 'Ng'), ('Dan', 'Roe'), ('Eve', 'Diaz')]
+
+def _credits(author_lists):
+    """Credits of every name, with every name a key author."""
+    authors = {}
+    translator = {}
+    for first, last in NAMES:
+        key = Helpers.key_from_name(first, last)
+        authors[key] = Author(first, last, 1, 'A', 'X')
+        translator[key] = key
+    data = [{'author': [{'first': NAMES[i][0], 'last': NAMES[i][1]} for i in positions]}
+            for positions in author_lists]
+    credit(authors, data, translator)
+    return [authors[Helpers.key_from_name(first, last)] for first, last in NAMES]
+
+class TestCredit(unittest.TestCase):
+
+    def test_paper_credit_sums_to_1(self):
+        for n in range(1, len(NAMES) + 1):
+            authors = _credits([list(range(n))])
+            for name, _ in CREDITS:
+                self.assertAlmostEqual(sum(getattr(a, name) for a in authors), 1.0, msg='{} of {} authors'.format(name, n))
+
+    def test_shares(self):
+        authors = _credits([[0, 1, 2, 3]])
+        harmonic_sum = 1 + 1 / 2 + 1 / 3 + 1 / 4
+        for k, a in enumerate(authors[:4]):
+            self.assertAlmostEqual(a.fractional, 1 / 4)
+            self.assertAlmostEqual(a.harmonic, (1 / (k + 1)) / harmonic_sum)
+            # First and last count double: 2 / (n + 2), others 1 / (n + 2).
+            self.assertAlmostEqual(a.first_last, (2 if k in (0, 3) else 1) / 6)
+        self.assertEqual(authors[4].fractional, 0.0)
+
+    def test_single_and_two_authors(self):
+        single = _credits([[0]])[0]
+        self.assertEqual((single.fractional, single.harmonic, single.first_last), (1.0, 1.0, 1.0))
+        first, last = _credits([[0, 1]])[:2]
+        self.assertAlmostEqual(first.first_last, 0.5)
+        self.assertAlmostEqual(last.first_last, 0.5)
+
+    def test_sum_over_papers(self):
+        # Ann is first of 2, last of 3 and listed twice on the third.
+        ann = _credits([[0, 1], [1, 2, 0], [0, 3, 0]])[0]
+        self.assertAlmostEqual(ann.fractional, 1 / 2 + 1 / 3 + 2 / 3)
+        self.assertAlmostEqual(ann.first_last, 2 / 4 + 2 / 5 + 4 / 5)
+
+if __name__ == '__main__':
+    unittest.main()
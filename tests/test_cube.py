@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Publication counts by year and pair of institutions."""
+
+import tempfile
+import unittest
+
+import numpy
+
+from corpus import write_corpus
+from pubstats import PubStats, _key_file, _data_file
+from pubstats.helpers import Helpers
+
+KEY = [['first', 'last', 'role', 'institution', 'field', 'department', 'alias'],
+       ['Ann', 'Lee', '1', 'A', 'X', 'd1', 'ann'],
+       ['Bob', 'Kim', '1', 'B', 'Y', 'd1', 'bob'],
+       ['Cat', 'Ng', '2', 'C', 'X', 'd2', 'cat']]
+ANN = {'first': 'Ann', 'last': 'Lee'}
+BOB = {'first': 'Bob', 'last': 'Kim'}
+CAT = {'first': 'Cat', 'last': 'Ng'}
+DATA = [{'title': 'A and B', 'author': [ANN, BOB], 'published': {'year': '2017'}},
+        {'title': 'A, B and C', 'author': [ANN, BOB, CAT], 'published': {'year': '2018'}},
+        {'title': 'B and C', 'author': [BOB, CAT], 'published': {'year': '2019'}},
+        {'title': 'Undated A and C', 'author': [ANN, CAT], 'published': {'year': ''}}]
+
+def _table(rep, names):
+    """Counts the publications of every pair of institutions of a
+    report, one publication at a time."""
+    index = {n: i for i, n in enumerate(names)}
+    table = numpy.zeros((len(names), len(names)), dtype=int)
+    for d in rep.formatted:
+        insts = set()
+        for a in d['author']:
+            key = Helpers.translated_key_from_name(a.get('first'), a.get('last'), rep.translate)
+            if key in rep.authors:
+                insts.add(index[rep.authors[key].inst or ''])
+        for i in insts:
+            for j in insts:
+                table[i, j] += 1
+    return table
+
+class TestCube(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as directory:
+            cls.files = write_corpus(directory, KEY, DATA)
+            cls.small = PubStats(*cls.files)
+            cls.small_2017 = PubStats(*cls.files, year_from=2017)
+        cls.fake = PubStats(_key_file, _data_file)
+
+    def test_slice_equals_window_report(self):
+        cube = self.fake.cube()
+        for year_from, year_to in [(2000, 2010), (2015, None), (None, 1999), (2012, 2012)]:
+            window = PubStats(_key_file, _data_file, year_from=year_from, year_to=year_to)
+            numpy.testing.assert_array_equal(cube.slice(year_from, year_to), _table(window, cube.names),
+                                             err_msg='{} to {}'.format(year_from, year_to))
+
+    def test_undated_only_without_bounds(self):
+        cube = self.small.cube()
+        a, c = cube.names.index('A'), cube.names.index('C')
+        self.assertEqual(cube.slice()[a, c], 2)
+        self.assertEqual(cube.slice(year_from=2017)[a, c], 1)
+        self.assertEqual(cube.slice(year_to=2019)[a, c], 1)
+        numpy.testing.assert_array_equal(cube.slice(), _table(self.small, cube.names))
+        numpy.testing.assert_array_equal(cube.slice(year_from=2017), _table(self.small_2017, cube.names))
+
+    def test_names(self):
+        cube = self.small.cube()
+        numpy.testing.assert_array_equal(cube.slice(2018, 2019, names=['C', 'B']), [[2, 2], [2, 2]])
+        self.assertEqual(cube.totals(), {'A': 3, 'B': 3, 'C': 3})
+        with self.assertRaises(ValueError):
+            cube.slice(names=['D'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Differences between 2 reports."""
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from corpus import write_corpus
+import pubstats
+from pubstats import PubStats
+
+KEY = [['first', 'last', 'role', 'institution', 'field', 'department', 'alias'],
+       ['Ann', 'Lee', '1', 'A', 'X', 'd1', 'ann'],
+       ['Bob', 'Kim', '1', 'B', 'Y', 'd1', 'bob'],
+       ['Cat', 'Ng', '2', 'C', 'X', 'd2', 'cat']]
+ANN = {'first': 'Ann', 'last': 'Lee'}
+BOB = {'first': 'Bob', 'last': 'Kim'}
+CAT = {'first': 'Cat', 'last': 'Ng'}
+OLD = [{'title': 'Shared', 'doi': '10.1000/shared', 'author': [ANN, BOB], 'published': {'year': '2018'}},
+       {'title': 'Old paper', 'author': [ANN], 'published': {'year': '2018'}},
+       {'title': 'Kept', 'author': [CAT], 'published': {'year': '2019'}}]
+# 'Shared' gets Cat as an author, and its DOI as a URL; 'Old paper' is
+# removed and 'New paper' added.
+NEW = [{'title': 'Shared', 'doi': 'https://doi.org/10.1000/SHARED', 'author': [ANN, BOB, CAT],
+        'published': {'year': '2018'}},
+       {'title': 'Kept', 'author': [CAT], 'published': {'year': '2019'}},
+       {'title': 'New paper', 'author': [BOB], 'published': {'year': '2020'}}]
+
+class TestDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.old = write_corpus(self._dir('old'), KEY, OLD)
+        self.new = write_corpus(self._dir('new'), KEY, NEW)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _dir(self, name):
+        path = os.path.join(self.directory.name, name)
+        os.mkdir(path)
+        return path
+
+    def test_publications(self):
+        changes = PubStats(*self.new).diff(PubStats(*self.old))
+        self.assertEqual([p['id'] for p in changes['added']], ['title:new paper|kim'])
+        self.assertEqual([p['id'] for p in changes['removed']], ['title:old paper|lee'])
+        self.assertEqual(changes['added'][0]['authors'], ['bob'])
+
+    def test_authors(self):
+        changes = PubStats(*self.new).diff(PubStats(*self.old))
+        self.assertEqual(sorted(changes['authors']), ['ann', 'bob', 'cat'])
+        ann = changes['authors']['ann']
+        self.assertEqual(ann['change'], 'changed')
+        self.assertEqual((ann['old']['total'], ann['new']['total'], ann['delta']['total']), (2, 1, -1))
+        self.assertEqual((ann['added'], ann['removed']), ([], ['title:old paper|lee']))
+        # The DOI matches 'Shared' across reports, so only Cat gains it.
+        cat = changes['authors']['cat']
+        self.assertEqual(cat['added'], ['doi:10.1000/shared'])
+        self.assertEqual(cat['delta']['multi_institute'], 1)
+        self.assertEqual(changes['authors']['bob']['added'], ['title:new paper|kim'])
+
+    def test_collaborations(self):
+        changes = PubStats(*self.new).diff(PubStats(*self.old))
+        self.assertEqual(sorted((c['institutions'], c['old'], c['new']) for c in changes['collaborations']),
+                         [(['A', 'C'], 0, 1), (['B', 'C'], 0, 1)])
+
+    def test_unchanged(self):
+        changes = PubStats(*self.old).diff(PubStats(*self.old))
+        self.assertEqual(changes, {'authors': {}, 'added': [], 'removed': [], 'collaborations': []})
+
+    def test_write(self):
+        filename = os.path.join(self.directory.name, 'changes.json')
+        pubstats.diff(self.old, self.new, filename, fmt='json')
+        with open(filename, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), PubStats(*self.new).diff(PubStats(*self.old)))
+        filename = os.path.join(self.directory.name, 'changes.csv')
+        pubstats.diff(self.old, self.new, filename, fmt='csv')
+        with open(filename, encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertIn({'kind': 'publication', 'change': 'removed', 'id': 'title:old paper|lee', 'name': 'Old paper',
+                       'field': 'authors', 'old': 'ann', 'new': '', 'delta': ''}, rows)
+        with self.assertRaises(ValueError):
+            pubstats.diff(self.old, self.new, fmt='xml')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Peak memory use of the streaming mode.
+
+Every report is built and displayed in a new interpreter, whose peak
+RSS (`resource.getrusage`) is compared to that of an interpreter that
+only imports pubstats.
+"""
+
+import sys
+import tempfile
+import unittest
+
+from corpus import fake_corpus, peak_rss
+
+# Copies of the fake data: an 8.6 MiB export, which takes about 60 MiB
+# to report on without a budget.
+SCALE = 40
+BUDGET = 4
+# Allowed above the budget, for the interpreter's own variation and the
+# report's other structures (key, authors, statistics).
+OVERHEAD = 24
+
+@unittest.skipIf(sys.platform == 'win32', 'resource is not available')
+class TestPeakMemory(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as directory:
+            key_file, data_file = fake_corpus(directory, SCALE)
+            cls.base = peak_rss('-', '-')
+            cls.streamed = peak_rss(key_file, data_file, BUDGET)
+            cls.eager = peak_rss(key_file, data_file)
+
+    def test_streamed_within_budget(self):
+        self.assertLess(self.streamed - self.base, BUDGET + OVERHEAD)
+
+    def test_eager_exceeds_budget(self):
+        # Shows the bound above is meaningful for this corpus.
+        self.assertGreater(self.eager - self.base, BUDGET + OVERHEAD)
+        self.assertLess(self.streamed, self.eager)
+
+if __name__ == '__main__':
+    unittest.main()
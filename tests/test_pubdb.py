@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Reports of some authors from a pubstats database."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pubstats import PubStats, convert, _key_file, _data_file
+from pubstats.pubdb import PubDB
+
+AUTHORS = ['president', 'central']
+
+class TestAuthorReport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.db_file = os.path.join(cls.directory.name, 'data.psdb')
+        convert(_data_file, cls.db_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_same_statistics(self):
+        expected = PubStats(_key_file, _data_file, authors=AUTHORS, tags=['label3'])
+        rep = PubStats(_key_file, self.db_file, authors=AUTHORS, tags=['label3'])
+        self.assertEqual(len(rep.formatted), len(expected.formatted))
+        for key in AUTHORS:
+            self.assertEqual(rep.author_stats(key), expected.author_stats(key))
+
+    def test_only_their_records_are_decoded(self):
+        with mock.patch.object(PubDB, '__getitem__', autospec=True, side_effect=PubDB.__getitem__) as getitem:
+            rep = PubStats(_key_file, self.db_file, authors=AUTHORS)
+        self.assertEqual(getitem.call_count, len(rep.formatted))
+        with self.assertRaises(ValueError):
+            rep.subset()
+
+if __name__ == '__main__':
+    unittest.main()
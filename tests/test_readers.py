@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Reading several bibliography files as one."""
+
+import os
+import tempfile
+import unittest
+
+from pubstats import PubStats, _key_file
+from pubstats.duplicates import find_duplicates
+
+_RIS = """TY  - JOUR
+ID  - 1
+AU  - Avila, Cynthia
+AU  - Roberts, Jeffrey
+TI  - {}
+PY  - 2018
+ER  -
+"""
+
+class TestSeveralFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.files = []
+        for name, title in [('a.ris', 'Coral reefs'), ('b.ris', 'Glacier retreat')]:
+            filename = os.path.join(self.directory.name, name)
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(_RIS.format(title))
+            self.files.append(filename)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_file_keys_are_not_duplicates(self):
+        # Both files have an entry 'ID  - 1', which is only unique
+        # within each file.
+        rep = PubStats(_key_file, self.files, dedup=True)
+        self.assertEqual(sorted(d['title'] for d in rep.formatted), ['Coral reefs', 'Glacier retreat'])
+        self.assertEqual(find_duplicates(rep.formatted), [])
+
+    def test_same_doi_is_read_once(self):
+        for filename in self.files:
+            with open(filename, 'a', encoding='utf-8') as f:
+                f.write(_RIS.format('Shared paper').replace('ER  - ', 'DO  - 10.1000/SHARED\nER  - '))
+        rep = PubStats(_key_file, self.files, dedup=True)
+        self.assertEqual(len(rep.formatted), 3)
+
+if __name__ == '__main__':
+    unittest.main()
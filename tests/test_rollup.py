@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Statistics of groups of key authors."""
+
+import tempfile
+import unittest
+
+from corpus import write_corpus
+from pubstats import PubStats
+
+KEY = [['first', 'last', 'role', 'institution', 'field', 'department', 'alias'],
+       ['Ann', 'Lee', '1', 'A', 'X', 'd1', 'ann'],
+       ['Bob', 'Kim', '1', 'A', 'Y', 'd1', 'bob'],
+       ['Cat', 'Ng', '2', 'B', 'X', 'd2', 'cat']]
+ANN = {'first': 'Ann', 'last': 'Lee'}
+BOB = {'first': 'Bob', 'last': 'Kim'}
+CAT = {'first': 'Cat', 'last': 'Ng'}
+OTHER = {'first': 'Zoe', 'last': 'Park'}
+DATA = [{'title': 'Both of A', 'author': [ANN, BOB, OTHER], 'published': {'year': '2018'}},
+        {'title': 'A and B', 'author': [ANN, CAT], 'published': {'year': '2019'}},
+        {'title': 'B only', 'author': [CAT], 'published': {'year': '2019'}}]
+
+class TestRollups(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as directory:
+            cls.files = write_corpus(directory, KEY, DATA)
+            cls.rep = PubStats(*cls.files)
+            cls.ann = PubStats(*cls.files, authors=['ann'])
+
+    def test_shared_publication_counts_once(self):
+        a = self.rep.rollups()['institution']['A']
+        self.assertEqual(a['members'], 2)
+        self.assertEqual(a['active_members'], 2)
+        # 'Both of A' has 2 members of A.
+        self.assertEqual(a['publications'], 2)
+        self.assertEqual(a['member_publications'], 3)
+        self.assertEqual(a['multi_institute'], 1)
+        self.assertEqual(a['multi_discipline'], 1)
+        self.assertAlmostEqual(a['fractional'], 1 / 3 + 1 / 2 + 1 / 3)
+
+    def test_groupings(self):
+        tables = self.rep.rollups()
+        self.assertEqual(sorted(tables), ['department', 'discipline', 'institution', 'role'])
+        self.assertEqual(tables['discipline']['X']['publications'], 3)
+        self.assertEqual(tables['role'][2]['member_publications'], 2)
+        with self.assertRaises(ValueError):
+            self.rep.rollups(groupings=('country',))
+
+    def test_selected_authors_as_author_statistics(self):
+        # The other key authors still make publications multi-institute
+        # and multi-discipline, as in the author statistics.
+        stats = self.ann.author_stats('ann')
+        a = self.ann.rollups()['institution']['A']
+        self.assertEqual(a['members'], 1)
+        self.assertEqual(a['publications'], stats['total'])
+        self.assertEqual(a['multi_institute'], stats['multi_institute'])
+        self.assertEqual(a['multi_discipline'], stats['multi_discipline'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file is part of pubstats.
+# Copyright (C) 2018 Penn State
+#
+# Pubstats is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pubstats is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pubstats.  If not, see <https://www.gnu.org/licenses/>.
+
+"""The local report service, queried over a TCP port."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pubstats import _key_file, _data_file
+from pubstats.service import serve, query
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.key_file = os.path.join(self.directory.name, 'key.csv')
+        self.data_file = os.path.join(self.directory.name, 'paperpile.json')
+        shutil.copy(_key_file, self.key_file)
+        shutil.copy(_data_file, self.data_file)
+        self.server = serve(self.key_file, self.data_file, port=0, background=True)
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def query(self, path, **params):
+        return query(path, port=self.port, **params)
+
+    def touch(self, filename, text):
+        """Rewrites a file, with a modification time that differs from
+        the last one however fine the clock is."""
+        mtime = os.stat(filename).st_mtime
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.utime(filename, (mtime + 10, mtime + 10))
+
+    def test_queries(self):
+        status = self.query('/status')
+        self.assertIsNone(status['error'])
+        self.assertGreater(status['publications'], 0)
+        author = self.query('/authors/president')
+        self.assertEqual((author['first'], author['last']), ('Cynthia', 'Avila'))
+        self.assertEqual(author['total'], len(author['publications']))
+        summary = self.query('/summary')
+        self.assertEqual(summary['publications'], status['publications'])
+        self.assertEqual(len(summary['authors']), status['authors'])
+        bibliography = self.query('/bibliography', start=2, stop=4)
+        self.assertEqual(bibliography['total'], status['publications'])
+        self.assertEqual([e['n'] for e in bibliography['entries']], [2, 3, 4])
+        self.assertIn('error', self.query('/authors/nobody'))
+
+    def test_key_reload(self):
+        before = self.query('/status')
+        served = self.server.service.rep
+        matched = [d['matched_authors'] for d in served.formatted]
+        with open(self.key_file, encoding='utf-8') as f:
+            lines = f.readlines()
+        # Without Cynthia Avila.
+        self.touch(self.key_file, ''.join(line for line in lines if ',president' not in line))
+        after = self.query('/status')
+        self.assertIsNone(after['error'])
+        self.assertEqual(after['authors'], before['authors'] - 1)
+        self.assertGreater(after['loaded'], before['loaded'])
+        self.assertIn('error', self.query('/authors/president'))
+        # The replaced report's publications are left as they were.
+        self.assertEqual([d['matched_authors'] for d in served.formatted], matched)
+
+    def test_broken_data_keeps_report(self):
+        before = self.query('/status')
+        author = self.query('/authors/president')
+        with open(self.data_file, encoding='utf-8') as f:
+            text = f.read()
+        self.touch(self.data_file, text[:len(text) // 2])
+        status = self.query('/status')
+        self.assertIsNotNone(status['error'])
+        self.assertEqual(status['publications'], before['publications'])
+        self.assertEqual(status['loaded'], before['loaded'])
+        self.assertEqual(self.query('/authors/president')['publications'], author['publications'])
+        # The complete file is read again at the next query.
+        self.touch(self.data_file, text)
+        status = self.query('/status')
+        self.assertIsNone(status['error'])
+        self.assertEqual(status['publications'], before['publications'])
+
+if __name__ == '__main__':
+    unittest.main()